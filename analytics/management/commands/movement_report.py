@@ -0,0 +1,59 @@
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from analytics import stats
+
+
+class Command(BaseCommand):
+    help = "Report hourly arrivals, departures and estimated seats of one day from the movement aggregates"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            type=str,
+            default="today",
+            help="Day to report (YYYY-MM-DD or 'today')",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute every movement from DailyFlight first (after editing gate terminals or aircraft capacities)",
+        )
+
+    def handle(self, *args, **options):
+        if options["date"] == "today":
+            day = timezone.localdate()
+        else:
+            try:
+                day = datetime.strptime(options["date"], "%Y-%m-%d").date()
+            except ValueError:
+                self.stdout.write(self.style.ERROR("✗ Invalid date format. Use YYYY-MM-DD or 'today'"))
+                return
+
+        if options["rebuild"]:
+            count = stats.rebuild_movements()
+            self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt {count} movements from daily flights"))
+
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        end = start + timedelta(days=1)
+
+        self.stdout.write(self.style.WARNING(f"\n📊 Movements on {day}"))
+        totals = stats.totals(start, end)
+        self.stdout.write(
+            f"   {totals['arrivals']} arrivals ({totals['arrival_seats']} seats), "
+            f"{totals['departures']} departures ({totals['departure_seats']} seats)\n"
+        )
+
+        self.stdout.write("   Hour    ARR   DEP    Seats")
+        for row in stats.hourly(start, end):
+            self.stdout.write(f"   {timezone.localtime(row['hour']):%H:%M}  {row['arrivals']:>4}  {row['departures']:>4}  {row['seats']:>7}")
+
+        self.stdout.write("\n   Terminal    ARR   DEP    Seats")
+        for row in stats.by_terminal(start, end):
+            self.stdout.write(f"   {row['terminal__code'] or '(no gate)':<10}  {row['arrivals']:>4}  {row['departures']:>4}  {row['seats']:>7}")
+
+        self.stdout.write("\n   Airline     ARR   DEP    Seats")
+        for row in stats.by_airline(start, end):
+            self.stdout.write(f"   {row['airline__iata_code']:<10}  {row['arrivals']:>4}  {row['departures']:>4}  {row['seats']:>7}")
@@ -0,0 +1,181 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Columns of a DailyFlight a movement is derived from
+SOURCE_COLUMNS = ["direction", "status", "stoa", "etoa", "atoa", "stod", "etod", "atod", "gate_id", "airline_id", "aircraft_type_id"]
+
+
+def _movements(rows, changed=""):
+    """Insert the movements of the operating home airport flights in `rows`"""
+    return f"""
+        {changed}
+        INSERT INTO analytics_movement (flight_id, movement_time, direction, terminal_id, airline_id, seats)
+        SELECT
+            f.id,
+            CASE WHEN f.direction = 'ARR' THEN COALESCE(f.atoa, f.etoa, f.stoa) ELSE COALESCE(f.atod, f.etod, f.stod) END,
+            f.direction, g.terminal_id, f.airline_id, a.typical_capacity
+        FROM {rows} f
+        JOIN masterdata_aircrafttype a ON a.id = f.aircraft_type_id
+        LEFT JOIN masterdata_gate g ON g.id = f.gate_id
+        WHERE f.direction IN ('ARR', 'DEP') AND f.status NOT IN ('CXX', 'DIV');
+    """
+
+
+_CHANGED = f"""
+        WITH changed AS (
+            SELECT n.* FROM new_rows n JOIN old_rows o USING (id)
+            WHERE ({", ".join(f"n.{column}" for column in SOURCE_COLUMNS)}) IS DISTINCT FROM ({", ".join(f"o.{column}" for column in SOURCE_COLUMNS)})
+        ), removed AS (
+            DELETE FROM analytics_movement m USING changed c WHERE m.flight_id = c.id
+        )"""
+
+CREATE_MOVEMENTS = f"""
+CREATE TABLE analytics_movement (
+    flight_id bigint NOT NULL,
+    movement_time timestamptz NOT NULL,
+    direction varchar(3) NOT NULL,
+    terminal_id bigint NULL,
+    airline_id bigint NOT NULL,
+    seats integer NOT NULL
+);
+CREATE INDEX analytics_movement_time_idx ON analytics_movement (movement_time);
+CREATE INDEX analytics_movement_flight_idx ON analytics_movement (flight_id);
+
+CREATE FUNCTION analytics_movement_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM analytics_movement;
+    ELSIF TG_OP = 'INSERT' THEN
+        {_movements("new_rows")}
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Only flights whose movement changed: most updates touch other columns
+        {_movements("changed", _CHANGED)}
+    ELSE
+        DELETE FROM analytics_movement m USING old_rows o WHERE m.flight_id = o.id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER dailyflight_movement_insert AFTER INSERT ON flight_ops_dailyflight
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION analytics_movement_sync();
+CREATE TRIGGER dailyflight_movement_update AFTER UPDATE ON flight_ops_dailyflight
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION analytics_movement_sync();
+CREATE TRIGGER dailyflight_movement_delete AFTER DELETE ON flight_ops_dailyflight
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION analytics_movement_sync();
+CREATE TRIGGER dailyflight_movement_truncate AFTER TRUNCATE ON flight_ops_dailyflight
+    FOR EACH STATEMENT EXECUTE FUNCTION analytics_movement_sync();
+"""
+
+DROP_MOVEMENTS = """
+DROP TRIGGER dailyflight_movement_truncate ON flight_ops_dailyflight;
+DROP TRIGGER dailyflight_movement_delete ON flight_ops_dailyflight;
+DROP TRIGGER dailyflight_movement_update ON flight_ops_dailyflight;
+DROP TRIGGER dailyflight_movement_insert ON flight_ops_dailyflight;
+DROP FUNCTION analytics_movement_sync();
+DROP TABLE analytics_movement;
+"""
+
+HOURLY_COLUMNS = """
+    direction, terminal_id, airline_id, COUNT(*)::integer AS movement_count, SUM(seats)::integer AS seat_count
+FROM analytics_movement
+GROUP BY 1, 2, 3, 4
+"""
+
+# Continuous aggregate: materialized by the refresh policy, real-time for the
+# buckets not materialized yet (future schedule, recent changes)
+CREATE_CONTINUOUS_AGGREGATE = f"""
+SELECT create_hypertable('analytics_movement', 'movement_time', chunk_time_interval => INTERVAL '7 days', migrate_data => true);
+CREATE MATERIALIZED VIEW analytics_hourly_movements
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT time_bucket(INTERVAL '1 hour', movement_time) AS hour, {HOURLY_COLUMNS}
+WITH NO DATA;
+SELECT add_continuous_aggregate_policy(
+    'analytics_hourly_movements',
+    start_offset => INTERVAL '30 days',
+    end_offset => NULL,
+    schedule_interval => INTERVAL '15 minutes'
+);
+"""
+
+# Plain Postgres: the same columns computed at read time
+CREATE_VIEW = f"""
+CREATE VIEW analytics_hourly_movements AS
+SELECT date_trunc('hour', movement_time) AS hour, {HOURLY_COLUMNS};
+"""
+
+
+def has_timescaledb(schema_editor):
+    """TimescaleDB can be enabled: installed and preloaded by the server"""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb') "
+            "AND current_setting('shared_preload_libraries') LIKE '%timescaledb%'"
+        )
+        return cursor.fetchone()[0]
+
+
+def create_hourly_movements(apps, schema_editor):
+    if has_timescaledb(schema_editor):
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+        schema_editor.execute(CREATE_CONTINUOUS_AGGREGATE)
+    else:
+        schema_editor.execute(CREATE_VIEW)
+
+
+def drop_hourly_movements(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = 'analytics_hourly_movements'")
+        row = cursor.fetchone()
+    if row is None:
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('timescaledb_information.continuous_aggregates') IS NOT NULL")
+        timescale = cursor.fetchone()[0]
+    schema_editor.execute("DROP MATERIALIZED VIEW analytics_hourly_movements" if timescale else "DROP VIEW analytics_hourly_movements")
+
+
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('flight_ops', '0014_entityusage'),
+        ('masterdata', '0007_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HourlyMovement',
+            fields=[
+                ('hour', models.DateTimeField(primary_key=True, serialize=False)),
+                ('direction', models.CharField(choices=[('ARR', 'Arrival'), ('DEP', 'Departure')], max_length=3)),
+                ('movement_count', models.IntegerField()),
+                ('seat_count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'analytics_hourly_movements',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Movement',
+            fields=[
+                ('flight', models.OneToOneField(on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='+', serialize=False, to='flight_ops.dailyflight')),
+                ('movement_time', models.DateTimeField(help_text='Actual, else estimated, else scheduled arrival/departure time')),
+                ('direction', models.CharField(choices=[('ARR', 'Arrival'), ('DEP', 'Departure')], max_length=3)),
+                ('seats', models.IntegerField(help_text='Typical capacity of the aircraft type')),
+            ],
+            options={
+                'db_table': 'analytics_movement',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(CREATE_MOVEMENTS, DROP_MOVEMENTS),
+        migrations.RunSQL(_movements("flight_ops_dailyflight"), migrations.RunSQL.noop),
+        migrations.RunPython(create_hourly_movements, drop_hourly_movements),
+    ]
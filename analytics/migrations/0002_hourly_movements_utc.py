@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:33
+
+from importlib import import_module
+
+from django.db import migrations
+
+initial = import_module("analytics.migrations.0001_initial")
+
+# Plain Postgres view: UTC hours like time_bucket() on TimescaleDB (not the session
+# time zone), and an index on the bucket so hour ranges don't scan every movement
+CREATE_UTC_VIEW = f"""
+CREATE OR REPLACE VIEW analytics_hourly_movements AS
+SELECT date_trunc('hour', movement_time, 'UTC') AS hour, {initial.HOURLY_COLUMNS};
+CREATE INDEX analytics_movement_hour_idx ON analytics_movement (date_trunc('hour', movement_time, 'UTC'));
+"""
+
+DROP_UTC_VIEW = f"""
+DROP INDEX analytics_movement_hour_idx;
+{initial.CREATE_VIEW.replace("CREATE VIEW", "CREATE OR REPLACE VIEW")}
+"""
+
+
+def is_plain_view(schema_editor):
+    """The hourly movements are the plain Postgres view (no continuous aggregate)"""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('timescaledb_information.continuous_aggregates') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            cursor.execute("SELECT NOT EXISTS (SELECT 1 FROM timescaledb_information.continuous_aggregates WHERE view_name = 'analytics_hourly_movements')")
+            return cursor.fetchone()[0]
+    return True
+
+
+def bucket_in_utc(apps, schema_editor):
+    if is_plain_view(schema_editor):
+        schema_editor.execute(CREATE_UTC_VIEW)
+
+
+def bucket_in_session_zone(apps, schema_editor):
+    if is_plain_view(schema_editor):
+        schema_editor.execute(DROP_UTC_VIEW)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(bucket_in_utc, bucket_in_session_zone),
+    ]
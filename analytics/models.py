@@ -0,0 +1,44 @@
+from django.db import models
+
+MOVEMENT_DIRECTIONS = [
+    ("ARR", "Arrival"),
+    ("DEP", "Departure"),
+]
+
+
+class Movement(models.Model):
+    """
+    One arrival or departure at the home airport per operating DailyFlight.
+    Written by triggers on flight_ops_dailyflight (migration 0001); a TimescaleDB
+    hypertable on movement_time when the extension is available.
+    """
+
+    flight = models.OneToOneField("flight_ops.DailyFlight", primary_key=True, on_delete=models.DO_NOTHING, related_name="+")
+    movement_time = models.DateTimeField(help_text="Actual, else estimated, else scheduled arrival/departure time")
+    direction = models.CharField(max_length=3, choices=MOVEMENT_DIRECTIONS)
+    terminal = models.ForeignKey("masterdata.Terminal", null=True, on_delete=models.DO_NOTHING, related_name="+", help_text="Terminal of the gate")
+    airline = models.ForeignKey("masterdata.Airline", on_delete=models.DO_NOTHING, related_name="+")
+    seats = models.IntegerField(help_text="Typical capacity of the aircraft type")
+
+    class Meta:
+        managed = False
+        db_table = "analytics_movement"
+
+
+class HourlyMovement(models.Model):
+    """
+    Movements and seats per hour, direction, terminal and airline.
+    A TimescaleDB continuous aggregate over Movement, or a plain view without the extension.
+    """
+
+    # Not unique: the view has no key, rows are only read through aggregations
+    hour = models.DateTimeField(primary_key=True)
+    direction = models.CharField(max_length=3, choices=MOVEMENT_DIRECTIONS)
+    terminal = models.ForeignKey("masterdata.Terminal", null=True, on_delete=models.DO_NOTHING, related_name="+")
+    airline = models.ForeignKey("masterdata.Airline", on_delete=models.DO_NOTHING, related_name="+")
+    movement_count = models.IntegerField()
+    seat_count = models.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = "analytics_hourly_movements"
@@ -0,0 +1,72 @@
+"""
+Hourly movement statistics for dashboards and reports.
+
+Reads the `analytics_hourly_movements` aggregate (see ANALYTICS.md) instead of
+scanning DailyFlight: every function sums its pre-grouped rows of [start, end).
+"""
+
+from django.db import connection, transaction
+from django.db.models import Q, Sum
+
+from .models import HourlyMovement, Movement
+
+REBUILD_SQL = """
+    INSERT INTO analytics_movement (flight_id, movement_time, direction, terminal_id, airline_id, seats)
+    SELECT
+        f.id,
+        CASE WHEN f.direction = 'ARR' THEN COALESCE(f.atoa, f.etoa, f.stoa) ELSE COALESCE(f.atod, f.etod, f.stod) END,
+        f.direction, g.terminal_id, f.airline_id, a.typical_capacity
+    FROM flight_ops_dailyflight f
+    JOIN masterdata_aircrafttype a ON a.id = f.aircraft_type_id
+    LEFT JOIN masterdata_gate g ON g.id = f.gate_id
+    WHERE f.direction IN ('ARR', 'DEP') AND f.status NOT IN ('CXX', 'DIV')
+"""
+
+
+def _totals():
+    return {
+        "movements": Sum("movement_count", default=0),
+        "arrivals": Sum("movement_count", filter=Q(direction="ARR"), default=0),
+        "departures": Sum("movement_count", filter=Q(direction="DEP"), default=0),
+        "seats": Sum("seat_count", default=0),
+        "arrival_seats": Sum("seat_count", filter=Q(direction="ARR"), default=0),
+        "departure_seats": Sum("seat_count", filter=Q(direction="DEP"), default=0),
+    }
+
+
+def _window(start, end):
+    return HourlyMovement.objects.filter(hour__gte=start, hour__lt=end)
+
+
+def totals(start, end):
+    """Movements and seats of [start, end), by direction"""
+    return _window(start, end).aggregate(**_totals())
+
+
+def hourly(start, end):
+    """Totals per hour of [start, end), hours without movements omitted"""
+    return list(_window(start, end).values("hour").annotate(**_totals()).order_by("hour"))
+
+
+def by_terminal(start, end):
+    """Totals per terminal of [start, end), terminal__code None for flights without a gate"""
+    return list(_window(start, end).values("terminal_id", "terminal__code").annotate(**_totals()).order_by("terminal__code"))
+
+
+def by_airline(start, end):
+    """Totals per airline of [start, end), busiest first"""
+    return list(
+        _window(start, end).values("airline_id", "airline__iata_code", "airline__name").annotate(**_totals()).order_by("-movements", "airline__iata_code")
+    )
+
+
+def rebuild_movements():
+    """
+    Recompute every movement from DailyFlight. The triggers keep movements current
+    with flight changes; gate terminals and aircraft capacities are copied when a
+    flight changes, so rebuild after editing those.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {Movement._meta.db_table}")
+        cursor.execute(REBUILD_SQL)
+        return cursor.rowcount
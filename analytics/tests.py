@@ -0,0 +1,59 @@
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.test import TestCase
+
+from flight_ops.generation import DailyFlightGenerator
+from flight_ops.models import DailyFlight
+from flight_ops.tests import create_masterdata, create_schedule, schedules
+
+from . import stats
+from .models import Movement
+
+UTC = ZoneInfo("UTC")
+
+
+class MovementTriggerTests(TestCase):
+    """Movements follow DailyFlight inserts, updates and deletes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        data = create_masterdata()
+        create_schedule(data, "640")
+        create_schedule(data, "641", origin=data["nrt"], destination=data["bkk"], stod=time(9, 0), stoa=time(13, 30))
+        DailyFlightGenerator(date(2026, 6, 1), date(2026, 6, 1)).run(schedules())
+        cls.departure = DailyFlight.objects.get(direction="DEP")
+        cls.arrival = DailyFlight.objects.get(direction="ARR")
+
+    def movement(self, flight):
+        return Movement.objects.filter(flight=flight).values_list("movement_time", "direction", "seats").first()
+
+    def test_inserted_flights_get_movements(self):
+        self.assertEqual(self.movement(self.departure), (datetime(2026, 6, 1, 23, 0, tzinfo=UTC), "DEP", 321))
+        self.assertEqual(self.movement(self.arrival), (datetime(2026, 6, 1, 13, 30, tzinfo=UTC), "ARR", 321))
+
+    def test_latest_time_is_used(self):
+        actual = datetime(2026, 6, 1, 13, 5, tzinfo=UTC)
+        DailyFlight.objects.filter(pk=self.arrival.pk).update(etoa=actual + timedelta(minutes=10), atoa=actual)
+        self.assertEqual(self.movement(self.arrival)[0], actual)
+
+    def test_cancelled_and_deleted_flights_have_no_movement(self):
+        DailyFlight.objects.filter(pk=self.departure.pk).update(status="CXX")
+        self.assertIsNone(self.movement(self.departure))
+        DailyFlight.objects.filter(pk=self.departure.pk).update(status="SCH")
+        self.assertIsNotNone(self.movement(self.departure))
+
+        DailyFlight.objects.filter(pk=self.arrival.pk).delete()
+        self.assertIsNone(self.movement(self.arrival))
+
+    def test_hourly_statistics_bucket_in_utc(self):
+        start, end = datetime(2026, 6, 1, tzinfo=UTC), datetime(2026, 6, 2, tzinfo=UTC)
+        totals = stats.totals(start, end)
+        self.assertEqual((totals["movements"], totals["arrivals"], totals["departures"], totals["seats"]), (2, 1, 1, 642))
+        self.assertEqual([row["hour"] for row in stats.hourly(start, end)], [datetime(2026, 6, 1, 13, tzinfo=UTC), datetime(2026, 6, 1, 23, tzinfo=UTC)])
+        self.assertEqual(stats.by_airline(start, end)[0]["airline__iata_code"], "TG")
+
+    def test_rebuild_matches_the_triggers(self):
+        before = set(Movement.objects.values_list("flight_id", "movement_time", "direction", "seats"))
+        self.assertEqual(stats.rebuild_movements(), 2)
+        self.assertEqual(set(Movement.objects.values_list("flight_id", "movement_time", "direction", "seats")), before)
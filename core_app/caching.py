@@ -0,0 +1,108 @@
+"""
+Stampede-protected caching of shared computations.
+
+`get_or_compute(key, compute, timeout)` caches `compute()` under `key` with three
+protections against many requests recomputing the same value at once:
+
+- jittered TTLs: the fresh period is `timeout` +/- JITTER, so values cached together
+  do not all expire together;
+- stale-while-revalidate: a value stays in the cache for `stale_timeout` after it
+  goes stale; the first request past the fresh period recomputes it while the
+  others keep getting the stale value;
+- single-flight locking: only the request holding the key's lock (cache.add, which
+  is atomic on Redis and per process on the local memory cache) computes a missing
+  value; the others wait up to WAIT_TIMEOUT for it, then compute it themselves
+  rather than fail.
+
+    from core_app.caching import get_or_compute
+    totals = get_or_compute("dashboard:totals", compute_totals, timeout=30)
+
+`expire(key)` marks a value stale (the next request refreshes it, the others keep
+the old one meanwhile); `delete(key)` drops it so the next request waits for a
+fresh one.
+"""
+
+import math
+import random
+import time
+
+from django.core.cache import cache
+
+JITTER = 0.1
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 5
+WAIT_INTERVAL = 0.05
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+def jittered(timeout, jitter=JITTER):
+    """`timeout` seconds spread by +/- `jitter` (a fraction of it)"""
+    return timeout * random.uniform(1 - jitter, 1 + jitter)
+
+
+def _store(key, compute, timeout, stale_timeout):
+    value = compute()
+    fresh = jittered(timeout)
+    now = time.time()
+    # (value, fresh until, kept until)
+    cache.set(key, (value, now + fresh, now + fresh + stale_timeout), math.ceil(fresh + stale_timeout))
+    return value
+
+
+def _compute_locked(key, compute, timeout, stale_timeout):
+    """(value, True) computed and stored under the key's lock, (None, False) if another request holds it"""
+    lock_key = _lock_key(key)
+    if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        return None, False
+    try:
+        return _store(key, compute, timeout, stale_timeout), True
+    finally:
+        cache.delete(lock_key)
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=None):
+    """
+    Cached value of `compute()` under `key`, fresh for about `timeout` seconds and
+    served stale for up to `stale_timeout` more (default: `timeout`) while one
+    request recomputes it.
+    """
+    stale_timeout = timeout if stale_timeout is None else stale_timeout
+    cached = cache.get(key)
+
+    if cached is not None:
+        value, fresh_until, _ = cached
+        if time.time() < fresh_until:
+            return value
+        refreshed, computed = _compute_locked(key, compute, timeout, stale_timeout)
+        return refreshed if computed else value
+
+    value, computed = _compute_locked(key, compute, timeout, stale_timeout)
+    if computed:
+        return value
+
+    # Another request is computing it: wait for its result
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached[0]
+    return _store(key, compute, timeout, stale_timeout)
+
+
+def expire(key):
+    """Mark the value under `key` stale, keeping it for requests that arrive during the refresh"""
+    cached = cache.get(key)
+    if cached is not None:
+        value, _, kept_until = cached
+        remaining = math.ceil(kept_until - time.time())
+        if remaining > 0:
+            cache.set(key, (value, 0, kept_until), remaining)
+
+
+def delete(key):
+    """Drop the value under `key`"""
+    cache.delete(key)
@@ -0,0 +1,138 @@
+"""
+Dashboard figures: masterdata counts, today's flights and live resource occupancy.
+
+Everything comes from one SQL statement: scalar counts of the masterdata tables,
+and one aggregate pass over the DailyFlights of yesterday to tomorrow (date index)
+counting the distinct gates, stands and carousels in use right now:
+
+- departures hold their stand from STAND_BEFORE_DEPARTURE and their gate from
+  GATE_OPEN before the expected off-block (etod, else stod), until off-block (aobt
+  or a status past SCH), or for at most DEPARTURE_OVERRUN past it when no
+  off-block is recorded;
+- arrivals hold their gate for ARRIVAL_GATE_TIME and their stand for
+  ARRIVAL_STAND_TIME from on-block (aibt, else atoa/etoa/stoa once the status is
+  ONB or later), their carousel from on-block until last bag (status LSB), at
+  most CAROUSEL_MAX_TIME;
+- cancelled and diverted flights hold nothing.
+
+The movements and estimated seats of the current hour (UTC, the buckets of the
+analytics aggregates) come from the movements of the analytics app, in the same
+statement, through a movement_time range on its index.
+
+The result is cached through core_app.caching for DASHBOARD_TIMEOUT seconds;
+DailyFlight and masterdata writes mark it stale (see the signals), so the next
+request recomputes it once while the others keep the previous figures.
+"""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from analytics.models import Movement
+from flight_ops.models import DailyFlight
+from masterdata.models import AircraftType, Airline, BaggageCarousel, CheckInCounter, Gate, Stand, Terminal
+
+from .caching import expire, get_or_compute
+
+DASHBOARD_KEY = "dashboard:summary"
+DASHBOARD_TIMEOUT = 30
+
+GATE_OPEN = timedelta(minutes=45)
+STAND_BEFORE_DEPARTURE = timedelta(minutes=90)
+DEPARTURE_OVERRUN = timedelta(hours=1)
+ARRIVAL_GATE_TIME = timedelta(minutes=30)
+ARRIVAL_STAND_TIME = timedelta(minutes=90)
+CAROUSEL_MAX_TIME = timedelta(hours=1)
+
+# Context name -> masterdata model counted
+MASTERDATA_COUNTS = {
+    "terminal_count": Terminal,
+    "gate_count": Gate,
+    "stand_count": Stand,
+    "checkin_count": CheckInCounter,
+    "carousel_count": BaggageCarousel,
+    "airline_count": Airline,
+    "aircraft_count": AircraftType,
+}
+
+FLIGHT_FIGURES = ["flights_today", "flights_yesterday", "occupied_gates", "occupied_stands", "occupied_carousels"]
+HOUR_FIGURES = ["movements_this_hour", "seats_this_hour"]
+
+_FLIGHT_SQL = f"""
+    WITH flights AS (
+        SELECT
+            date_of_operation, direction, gate_id, stand_id, carousel_id, status, aobt,
+            COALESCE(etod, stod) AS departs,
+            COALESCE(aibt, CASE WHEN status IN ('ONB', 'FIB', 'LSB') THEN COALESCE(atoa, etoa, stoa) END) AS on_block
+        FROM {DailyFlight._meta.db_table}
+        WHERE date_of_operation BETWEEN %(yesterday)s AND %(tomorrow)s
+    ), waiting AS (
+        SELECT *,
+            direction = 'DEP' AND status = 'SCH' AND aobt IS NULL AND departs <= %(now)s + %(stand_before)s
+                AND departs > %(now)s - %(overrun)s AS before_departure,
+            direction = 'ARR' AND status NOT IN ('CXX', 'DIV') AND on_block <= %(now)s AS on_blocks
+        FROM flights
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE date_of_operation = %(today)s),
+        COUNT(*) FILTER (WHERE date_of_operation = %(yesterday)s),
+        COUNT(DISTINCT gate_id) FILTER (
+            WHERE (before_departure AND departs <= %(now)s + %(gate_open)s)
+               OR (on_blocks AND on_block > %(now)s - %(arrival_gate)s)
+        ),
+        COUNT(DISTINCT stand_id) FILTER (
+            WHERE before_departure OR (on_blocks AND on_block > %(now)s - %(arrival_stand)s)
+        ),
+        COUNT(DISTINCT carousel_id) FILTER (
+            WHERE on_blocks AND status <> 'LSB' AND on_block > %(now)s - %(carousel_max)s
+        )
+    FROM waiting
+"""
+
+# Movements and estimated seats of the current UTC hour (analytics app), a range scan of the time index
+_HOUR_SQL = f"""
+    SELECT COUNT(*), COALESCE(SUM(seats), 0)
+    FROM {Movement._meta.db_table}
+    WHERE movement_time >= date_trunc('hour', %(now)s::timestamptz, 'UTC')
+      AND movement_time < date_trunc('hour', %(now)s::timestamptz, 'UTC') + INTERVAL '1 hour'
+"""
+
+_SQL = f"""
+    SELECT
+        {", ".join(f"(SELECT COUNT(*) FROM {model._meta.db_table})" for model in MASTERDATA_COUNTS.values())},
+        figures.*, hour.*
+    FROM ({_FLIGHT_SQL}) figures, ({_HOUR_SQL}) hour
+"""
+
+
+def compute_summary(now=None):
+    """Dashboard figures at `now` (default: the current time), one query"""
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    params = {
+        "now": now,
+        "today": today,
+        "yesterday": today - timedelta(days=1),
+        "tomorrow": today + timedelta(days=1),
+        "gate_open": GATE_OPEN,
+        "stand_before": STAND_BEFORE_DEPARTURE,
+        "overrun": DEPARTURE_OVERRUN,
+        "arrival_gate": ARRIVAL_GATE_TIME,
+        "arrival_stand": ARRIVAL_STAND_TIME,
+        "carousel_max": CAROUSEL_MAX_TIME,
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(_SQL, params)
+        row = cursor.fetchone()
+    return dict(zip([*MASTERDATA_COUNTS, *FLIGHT_FIGURES, *HOUR_FIGURES], row))
+
+
+def summary():
+    """Cached dashboard figures (see module docstring)"""
+    return get_or_compute(DASHBOARD_KEY, compute_summary, DASHBOARD_TIMEOUT)
+
+
+def invalidate():
+    """Mark the cached figures stale: the next request recomputes them"""
+    expire(DASHBOARD_KEY)
@@ -0,0 +1,174 @@
+"""
+Paginated list pages with cheap counts.
+
+`paginated_list()` renders one page of lean rows (core_app.projection) of a list
+queryset. The row count the paginator needs is cached per table and query:
+
+- tables the planner estimates (pg_class.reltuples) below ESTIMATE_THRESHOLD rows,
+  and filtered lists estimated below it, get an exact COUNT(*);
+- larger results use the planner's row estimate for the query (EXPLAIN), shown as
+  approximate by the templates. An estimate is only displayed: pages are not capped
+  by it, and whether a next page exists is decided by reading one row past the page.
+
+Cached counts are keyed by a per-table version bumped by the post_save/post_delete
+signals of the list models (see core_app.signals); bulk writes without signals
+are picked up when COUNT_TIMEOUT expires. Counts are computed through
+core_app.caching, so concurrent requests for an expired count share one COUNT.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connection
+from django.shortcuts import render
+from django.utils.functional import cached_property
+
+from .caching import get_or_compute
+from .projection import lean_rows
+
+PAGE_SIZE = 50
+COUNT_TIMEOUT = 60 * 5
+ESTIMATE_THRESHOLD = 10000
+
+
+def _version_key(model):
+    return f"list_count:version:{model._meta.db_table}"
+
+
+def bump_counts(model):
+    """Invalidate the cached counts of every list over `model`"""
+    key = _version_key(model)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:  # evicted between add() and incr()
+            cache.set(key, 1, timeout=None)
+
+
+def table_estimate(model):
+    """Planner estimate of the table's row count (pg_class.reltuples), -1 if never analyzed"""
+    if connection.vendor != "postgresql":
+        return -1
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+    return int(row[0]) if row else -1
+
+
+def query_estimate(queryset):
+    """Planner estimate of the number of rows `queryset` returns"""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cached_count(queryset):
+    """(row count, is_estimate) of `queryset`, cached per table version and query"""
+    model = queryset.model
+    query = hashlib.md5(str(queryset.order_by().query).encode()).hexdigest()
+    key = f"list_count:{model._meta.db_table}:{cache.get(_version_key(model), 0)}:{query}"
+
+    def count():
+        if table_estimate(model) >= ESTIMATE_THRESHOLD:
+            estimate = query_estimate(queryset)
+            if estimate >= ESTIMATE_THRESHOLD:
+                return (estimate, True)
+        return (queryset.count(), False)
+
+    return get_or_compute(key, count, COUNT_TIMEOUT)
+
+
+class EstimatedPage(Page):
+    """Page of a list with an estimated count: it has a next page if a row was read past it"""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def start_index(self):
+        return self.paginator.per_page * (self.number - 1) + 1 if self.object_list else 0
+
+    def end_index(self):
+        return self.paginator.per_page * (self.number - 1) + len(self.object_list)
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator over lean rows taking its count from cached_count(queryset)"""
+
+    def __init__(self, queryset, fields, per_page=PAGE_SIZE):
+        super().__init__(lean_rows(queryset, fields), per_page)
+        self.queryset = queryset
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        count, self.count_is_estimate = cached_count(self.queryset)
+        return count
+
+    def validate_number(self, number):
+        if not (self.count and self.count_is_estimate):
+            return super().validate_number(number)
+        # No upper bound: the estimate may be below the real count
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimate:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows:
+            raise EmptyPage(self.error_messages["no_results"])
+        page = EstimatedPage(rows[: self.per_page], number, self, has_next=len(rows) > self.per_page)
+        if page.has_next():
+            # Pages past an underestimate still show up in the page range
+            self.num_pages = max(self.num_pages, number + 1)
+        else:
+            # The last page gives the exact count
+            self.count, self.count_is_estimate, self.num_pages = page.end_index(), False, number
+        return page
+
+    def get_page(self, number):
+        try:
+            return super().get_page(number)
+        except EmptyPage:
+            # Past the end of an overestimated list: fall back to the exact count
+            self.count, self.count_is_estimate = self.queryset.count(), False
+            self.__dict__.pop("num_pages", None)
+            return super().get_page(number)
+
+
+def paginated_list(request, template, queryset, fields, context_name, extra_context=None):
+    """
+    Render one page (`page` parameter) of `queryset` as lean rows with `fields`.
+
+    The page is available to the template as `context_name` and `page_obj`, the
+    (possibly estimated) row count as `total_count` and `count_is_estimate`.
+    """
+    paginator = CachedCountPaginator(queryset, fields)
+    page_obj = paginator.get_page(request.GET.get("page"))
+    context = {
+        context_name: page_obj,
+        "page_obj": page_obj,
+        "total_count": paginator.count,
+        "count_is_estimate": paginator.count_is_estimate,
+        "search_query": request.GET.get("search", ""),
+        **(extra_context or {}),
+    }
+    return render(request, template, context)
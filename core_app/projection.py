@@ -0,0 +1,146 @@
+"""
+Lean rows for list pages.
+
+List templates only show a few columns of each object. `lean_rows()` reads exactly
+those columns with values_list() and wraps each result in a small `__slots__` row,
+so no model instances are built and unused columns (notes, descriptions, audit
+fields...) are never fetched. Rows read like the instances the templates used before:
+
+- a related field "terminal__name" is available as `row.terminal.name`
+  (`row.terminal` is None when every column read through the relation is NULL);
+- a field with choices also gets `row.get_<field>_display`;
+- annotations of the queryset can be listed like fields.
+
+The result is lazy and supports count(), len(), iteration and slicing, so it can be
+handed to a template or a Paginator in place of the queryset.
+"""
+
+from operator import itemgetter
+
+from django.core.exceptions import FieldDoesNotExist
+
+_ROW_TYPES = {}
+
+
+def _row_type(names):
+    """Slotted row class holding `names`, one class per distinct name tuple"""
+    names = tuple(names)
+    row_type = _ROW_TYPES.get(names)
+    if row_type is None:
+
+        def __init__(self, *values):
+            for name, value in zip(names, values):
+                setattr(self, name, value)
+
+        def __repr__(self):
+            return f"Row({', '.join(f'{name}={getattr(self, name)!r}' for name in names)})"
+
+        row_type = _ROW_TYPES[names] = type("Row", (), {"__slots__": names, "__init__": __init__, "__repr__": __repr__})
+    return row_type
+
+
+def _model_field(model, name):
+    """Concrete field `name` of `model`, None for annotations"""
+    if name == "pk":
+        return model._meta.pk
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _display_getter(index, labels):
+    return lambda values: labels.get(values[index], values[index])
+
+
+def _compile(model, fields, columns, prefix=""):
+    """
+    Builder turning one values_list() tuple into a row with `fields`, appending the
+    column paths it reads to `columns`.
+    """
+    groups = {}
+    for field in fields:
+        head, _, rest = field.partition("__")
+        groups.setdefault(head, []).append(rest)
+
+    names, getters = [], []
+    for head, rests in groups.items():
+        if "" in rests:
+            index = len(columns)
+            columns.append(prefix + head)
+            names.append(head)
+            getters.append(itemgetter(index))
+
+            model_field = _model_field(model, head)
+            if model_field is not None and model_field.choices:
+                names.append(f"get_{head}_display")
+                getters.append(_display_getter(index, dict(model_field.flatchoices)))
+        else:
+            related_model = model._meta.get_field(head).related_model
+            first = len(columns)
+            nested = _compile(related_model, rests, columns, f"{prefix}{head}__")
+            names.append(head)
+            getters.append(_nullable(nested, range(first, len(columns))))
+
+    row_type = _row_type(names)
+
+    def build(values):
+        return row_type(*[getter(values) for getter in getters])
+
+    return build
+
+
+def _nullable(build, indexes):
+    """Related row builder returning None for a missing (NULL) relation"""
+
+    def build_related(values):
+        if all(values[index] is None for index in indexes):
+            return None
+        return build(values)
+
+    return build_related
+
+
+class LeanRows:
+    """Lazy sequence of slotted rows holding only the listed fields of a queryset"""
+
+    def __init__(self, queryset, fields):
+        columns = []
+        self._build = _compile(queryset.model, fields, columns)
+        self._values = queryset.values_list(*columns)
+        self._rows = None
+
+    @property
+    def ordered(self):
+        return self._values.ordered
+
+    def count(self):
+        if self._rows is not None:
+            return len(self._rows)
+        return self._values.count()
+
+    def _fetch(self):
+        if self._rows is None:
+            self._rows = [self._build(values) for values in self._values]
+        return self._rows
+
+    def __iter__(self):
+        return iter(self._fetch())
+
+    def __len__(self):
+        return len(self._fetch())
+
+    def __bool__(self):
+        return bool(self._fetch())
+
+    def __getitem__(self, key):
+        if self._rows is not None:
+            return self._rows[key]
+        if isinstance(key, slice):
+            return [self._build(values) for values in self._values[key]]
+        return self._build(self._values[key])
+
+
+def lean_rows(queryset, fields):
+    """Rows of `queryset` holding only `fields` (see module docstring)"""
+    return LeanRows(queryset, fields)
@@ -0,0 +1,93 @@
+"""
+Shared list search backed by pg_trgm.
+
+`search()` turns a search box query into one filter over a list of lookups:
+
+- fields of the model itself become `UPPER(col) LIKE UPPER('%q%')` predicates, which
+  the `UPPER(col) gin_trgm_ops` GIN indexes (see `trigram_index`) can answer;
+- fields behind a relation ("airline__name") are matched on the related table first and
+  applied as `airline_id IN (...)`, so no predicate needs a join and Postgres can
+  combine the indexes with a BitmapOr instead of scanning the list.
+
+With `rank=True` results are ordered by their best trigram similarity to the query. The
+similarity of related fields is computed on the related table by primary key (a correlated
+subquery), so ranking adds no join either.
+"""
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import OuterRef, Q, Subquery
+from django.db.models.functions import Greatest, Upper
+
+
+def trigram_index(field, name):
+    """GIN index serving case-insensitive substring search (icontains) on `field`"""
+    return GinIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+
+
+def _split_fields(fields):
+    """Own fields of the model, and the lookups on each relation ("airline__name")"""
+    own = []
+    related = {}
+    for field in fields:
+        relation, _, lookup = field.partition("__")
+        if lookup:
+            related.setdefault(relation, []).append(lookup)
+        else:
+            own.append(field)
+    return own, related
+
+
+def _greatest(expressions):
+    return Greatest(*expressions) if len(expressions) > 1 else expressions[0]
+
+
+def search_filter(model, query, fields):
+    """Q matching `query` in any of `fields` (own fields or one relation deep)"""
+    own, related = _split_fields(fields)
+
+    condition = Q()
+    for field in own:
+        condition |= Q(**{f"{field}__icontains": query})
+
+    for relation, lookups in related.items():
+        related_model = model._meta.get_field(relation).related_model
+        matches = Q()
+        for lookup in lookups:
+            matches |= Q(**{f"{lookup}__icontains": query})
+        condition |= Q(**{f"{relation}__in": related_model._default_manager.filter(matches).values("pk")})
+
+    return condition
+
+
+def search_rank(model, query, fields):
+    """Best trigram similarity of `query` to any of `fields`, without joining the relations"""
+    own, related = _split_fields(fields)
+
+    similarities = [TrigramSimilarity(field, query) for field in own]
+    for relation, lookups in related.items():
+        related_model = model._meta.get_field(relation).related_model
+        similarity = _greatest([TrigramSimilarity(lookup, query) for lookup in lookups])
+        similarities.append(
+            Subquery(related_model._default_manager.filter(pk=OuterRef(relation)).order_by().annotate(similarity=similarity).values("similarity"))
+        )
+    return _greatest(similarities)
+
+
+def search(queryset, query, fields, rank=False):
+    """
+    Filter `queryset` to rows matching `query` in any of `fields`.
+
+    With `rank`, rows are annotated with `search_rank` and ordered by it (best first);
+    the caller's ordering breaks ties.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    queryset = queryset.filter(search_filter(queryset.model, query, fields))
+    if not rank:
+        return queryset
+
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return queryset.annotate(search_rank=search_rank(queryset.model, query, fields)).order_by("-search_rank", *ordering)
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import dashboard
+from .pagination import bump_counts
+
+# Apps whose list pages use core_app.pagination
+PAGINATED_APPS = ("masterdata", "schedules")
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_list_counts(sender, **kwargs):
+    """Cached list counts of the model's table are outdated once the write commits"""
+    if sender._meta.app_label in PAGINATED_APPS:
+        transaction.on_commit(lambda: bump_counts(sender))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_dashboard_counts(sender, **kwargs):
+    """The dashboard counts the masterdata tables"""
+    if sender in dashboard.MASTERDATA_COUNTS.values():
+        transaction.on_commit(dashboard.invalidate)
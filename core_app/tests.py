@@ -1,3 +1,96 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from flight_ops.tests import create_masterdata, create_schedule
+from masterdata.models import Airline, Airport
+from schedules.models import SeasonalFlight
+
+from .pagination import CachedCountPaginator, cached_count
+from .search import search
+
+
+def create_airports(count):
+    Airport.objects.bulk_create(
+        [Airport(iata_code=f"Z{n:02d}", icao_code=f"ZZ{n:02d}", name=f"Zone {n}", city="Zed", country="Nowhere") for n in range(count)]
+    )
+
+
+class CachedCountPaginatorTests(TestCase):
+    """Exact counts for small lists, planner estimates corrected while paging large ones"""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_airports(25)
+
+    def setUp(self):
+        cache.clear()
+
+    def paginator(self):
+        return CachedCountPaginator(Airport.objects.order_by("iata_code"), ["pk", "iata_code"], per_page=10)
+
+    def estimated(self, estimate):
+        return mock.patch.multiple(
+            "core_app.pagination", ESTIMATE_THRESHOLD=10, table_estimate=lambda model: 10**6, query_estimate=lambda queryset: estimate
+        )
+
+    def test_small_tables_are_counted(self):
+        self.assertEqual(cached_count(Airport.objects.all()), (25, False))
+        page = self.paginator().get_page(3)
+        self.assertEqual([row.iata_code for row in page.object_list], ["Z20", "Z21", "Z22", "Z23", "Z24"])
+        self.assertFalse(page.has_next())
+
+    def test_underestimate_pages_past_the_estimate(self):
+        with self.estimated(12):
+            self.assertEqual(cached_count(Airport.objects.order_by("iata_code")), (12, True))
+
+            paginator = self.paginator()
+            page = paginator.get_page(2)
+            self.assertTrue(page.has_next())
+            self.assertEqual(paginator.num_pages, 3)
+
+            paginator = self.paginator()
+            page = paginator.get_page(3)
+            self.assertFalse(page.has_next())
+            self.assertEqual((paginator.count, paginator.count_is_estimate), (25, False))
+            self.assertEqual((page.start_index(), page.end_index()), (21, 25))
+
+    def test_overestimate_falls_back_to_the_exact_count(self):
+        with self.estimated(10**5):
+            paginator = self.paginator()
+            page = paginator.get_page(50)
+            self.assertEqual((paginator.count, paginator.count_is_estimate), (25, False))
+            self.assertEqual(page.number, 3)
+
+    def test_saves_invalidate_the_cached_count(self):
+        self.assertEqual(cached_count(Airport.objects.all())[0], 25)
+        with self.captureOnCommitCallbacks(execute=True):
+            Airport.objects.create(iata_code="HKG", icao_code="VHHH", name="Hong Kong", city="Hong Kong", country="China")
+        self.assertEqual(cached_count(Airport.objects.all())[0], 26)
+
+
+class SearchTests(TestCase):
+    """List search on own and related fields"""
+
+    @classmethod
+    def setUpTestData(cls):
+        data = create_masterdata()
+        cls.thai = create_schedule(data, "640")
+        other = Airline.objects.create(iata_code="PG", icao_code="BKP", name="Bangkok Airways", country="Thailand")
+        cls.bangkok = create_schedule(data, "641", airline=other)
+        cls.fields = ["airline__iata_code", "airline__name", "flight_number", "origin__iata_code", "destination__iata_code"]
+
+    def test_matches_own_and_related_fields(self):
+        self.assertEqual(list(search(SeasonalFlight.objects.order_by("flight_number"), "640", self.fields)), [self.thai])
+        self.assertEqual(list(search(SeasonalFlight.objects.order_by("flight_number"), "airways", self.fields)), [self.thai, self.bangkok])
+        self.assertEqual(list(search(SeasonalFlight.objects.order_by("flight_number"), "  ", self.fields)), [self.thai, self.bangkok])
+
+    def test_rank_orders_by_similarity(self):
+        # "Thai Airways" is the closer match; the ordering only breaks ties
+        ranked = search(SeasonalFlight.objects.order_by("-flight_number"), "airways", self.fields, rank=True)
+        self.assertEqual(list(ranked), [self.thai, self.bangkok])
+
+    def test_no_predicate_or_rank_joins_a_relation(self):
+        ranked = search(SeasonalFlight.objects.order_by("flight_number"), "bangkok", self.fields, rank=True)
+        self.assertNotIn("JOIN", str(ranked.query))
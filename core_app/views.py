@@ -1,9 +1,9 @@
-import random
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from masterdata.models import Terminal, Gate, Stand, CheckInCounter, BaggageCarousel, Airline, AircraftType
+
+from .dashboard import summary
 
 
 def user_login(request):
@@ -33,19 +33,10 @@ def user_logout(request):
 
 @login_required
 def dashboard(request):
-    total_gates = Gate.objects.count()
-    occupied_gates = random.randint(0, total_gates) if total_gates > 0 else 0
-    pax_throughput_hourly = occupied_gates * 100
-
+    figures = summary()
+    flights_yesterday = figures["flights_yesterday"]
     context = {
-        "terminal_count": Terminal.objects.count(),
-        "gate_count": total_gates,
-        "stand_count": Stand.objects.count(),
-        "checkin_count": CheckInCounter.objects.count(),
-        "carousel_count": BaggageCarousel.objects.count(),
-        "airline_count": Airline.objects.count(),
-        "aircraft_count": AircraftType.objects.count(),
-        "occupied_gates": occupied_gates,
-        "pax_throughput_hourly": pax_throughput_hourly,
+        **figures,
+        "flight_change": round((figures["flights_today"] - flights_yesterday) * 100 / flights_yesterday) if flights_yesterday else None,
     }
     return render(request, "index.html", context)
@@ -1,24 +1,36 @@
-from django.contrib import admin
-
-from .models import DailyFlight
+from django.contrib import admin, messages
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import (
+    CommandCheckpoint,
+    DailyFlight,
+    EntityUsage,
+    FlightEvent,
+    GenerationWatermark,
+    PendingFlightEvent,
+    PendingPropagation,
+    PropagationJob,
+)
+from .propagation import JOB_STALE_AFTER, JOB_THRESHOLD, propagate_flights
 
 
 @admin.register(DailyFlight)
 class DailyFlightAdmin(admin.ModelAdmin):
     list_display = [
         "flight_id",
-        "airline",
+        "airline_code",
         "flight_number",
         "date_of_operation",
-        "origin",
-        "destination",
+        "origin_code",
+        "destination_code",
         "status",
         "is_manually_modified",
         "registration",
-        "gate",
-        "stand",
+        "gate_code",
+        "stand_code",
     ]
-    list_filter = ["status", "is_manually_modified", "airline", "date_of_operation", "origin", "destination"]
+    list_filter = ["status", "direction", "is_manually_modified", "airline", "date_of_operation", "origin", "destination"]
     search_fields = [
         "flight_id",
         "flight_number",
@@ -73,39 +85,117 @@ class DailyFlightAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
     def propagate_from_schedule(self, request, queryset):
-        """Admin action to propagate schedule changes to selected flights"""
-        from django.utils import timezone
-        from datetime import datetime, timedelta
+        """Admin action to propagate schedule changes to selected flights (one UPDATE joined to the schedules)"""
+        flight_ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+
+        if len(flight_ids) > JOB_THRESHOLD:
+            job = PropagationJob.objects.create(flight_ids=flight_ids, total=len(flight_ids), created_by=request.user)
+            self.message_user(
+                request,
+                f"Queued propagation job #{job.pk} for {len(flight_ids)} flights. Follow its progress under Propagation Jobs.",
+                messages.INFO,
+            )
+            return
+
+        updated = propagate_flights(flight_ids)
+        skipped = len(flight_ids) - updated
+        self.message_user(request, f"Propagated {updated} flights. Skipped {skipped} (manually modified or no schedule).")
+
+    propagate_from_schedule.short_description = "Propagate schedule changes to selected flights"
 
-        updated = 0
-        skipped = 0
 
-        for daily_flight in queryset:
-            if daily_flight.is_manually_modified:
-                skipped += 1
-                continue
+@admin.register(GenerationWatermark)
+class GenerationWatermarkAdmin(admin.ModelAdmin):
+    list_display = ["schedule", "generated_through", "updated_at"]
+    ordering = ["generated_through"]
+    raw_id_fields = ["schedule"]
 
-            if not daily_flight.schedule:
-                skipped += 1
-                continue
 
-            schedule = daily_flight.schedule
+@admin.register(CommandCheckpoint)
+class CommandCheckpointAdmin(admin.ModelAdmin):
+    list_display = ["command", "run_key", "position", "is_complete", "updated_at"]
+    list_filter = ["command", "is_complete"]
+    ordering = ["-updated_at"]
 
-            # Update from schedule
-            new_stod = timezone.make_aware(datetime.combine(daily_flight.date_of_operation, schedule.stod))
-            new_stoa = timezone.make_aware(datetime.combine(daily_flight.date_of_operation, schedule.stoa))
 
-            if schedule.stoa < schedule.stod:
-                new_stoa = timezone.make_aware(datetime.combine(daily_flight.date_of_operation + timedelta(days=1), schedule.stoa))
+@admin.register(PendingPropagation)
+class PendingPropagationAdmin(admin.ModelAdmin):
+    list_display = ["schedule", "enqueued_at"]
+    ordering = ["enqueued_at"]
 
-            daily_flight.stod = new_stod
-            daily_flight.stoa = new_stoa
-            daily_flight.aircraft_type = schedule.aircraft_type
-            daily_flight.last_propagated_at = timezone.now()
-            daily_flight.schedule_version += 1
-            daily_flight.save()
-            updated += 1
 
-        self.message_user(request, f"Propagated {updated} flights. Skipped {skipped} (manually modified or no schedule).")
+@admin.register(PropagationJob)
+class PropagationJobAdmin(admin.ModelAdmin):
+    list_display = ["id", "status", "progress_display", "updated", "created_by", "created_at", "updated_at"]
+    list_filter = ["status"]
+    readonly_fields = ["total", "processed", "updated", "status", "error", "created_by", "created_at", "updated_at"]
+    exclude = ["flight_ids"]
+    actions = ["requeue"]
 
-    propagate_from_schedule.short_description = "Propagate schedule changes to selected flights"
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description="Progress")
+    def progress_display(self, obj):
+        return f"{obj.processed}/{obj.total} ({obj.progress}%)"
+
+    @admin.action(description="Requeue failed or interrupted jobs (continue where they stopped)")
+    def requeue(self, request, queryset):
+        # A RUNNING job is only requeued once its worker has stopped reporting progress
+        now = timezone.now()
+        interrupted = Q(status="RUNNING", updated_at__lt=now - JOB_STALE_AFTER)
+        count = queryset.filter(Q(status="FAILED") | interrupted).update(status="PENDING", error="", updated_at=now)
+        skipped = queryset.count() - count
+        self.message_user(request, f"Requeued {count} propagation jobs.")
+        if skipped:
+            self.message_user(request, f"Skipped {skipped} jobs that are pending, done or still running.", messages.WARNING)
+
+
+@admin.register(EntityUsage)
+class EntityUsageAdmin(admin.ModelAdmin):
+    list_display = ["entity_type", "entity_id", "ref_count"]
+    list_filter = ["entity_type"]
+    ordering = ["entity_type", "-ref_count"]
+
+    # Maintained by database triggers on DailyFlight
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(FlightEvent)
+class FlightEventAdmin(admin.ModelAdmin):
+    list_display = ["flight", "milestone", "time_value", "status_value", "source", "event_time"]
+    list_filter = ["milestone", "source"]
+    search_fields = ["flight__flight_id"]
+    raw_id_fields = ["flight"]
+    ordering = ["-event_time"]
+
+    # Append-only: events are recorded through flight_ops.events
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(PendingFlightEvent)
+class PendingFlightEventAdmin(admin.ModelAdmin):
+    list_display = ["event_id", "flight_id", "milestone"]
+    list_filter = ["milestone"]
+    ordering = ["event_id"]
+
+    # Filled by a database trigger on FlightEvent, drained by project_flight_events
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,84 @@
+"""
+Fragment cache for the daily flight board.
+
+- Row fragments are cached per flight, keyed by pk and updated_at: every write path
+  (save, generation, propagation, the admin action) moves updated_at, so a changed
+  flight simply gets a new key.
+- Board pages (rows of one date/filter/cursor) are keyed by the board version of
+  their date: the flight count and latest updated_at of the date, read with one
+  index-only query on (date_of_operation, updated_at), plus a counter bumped by the
+  DailyFlight signals. The database part also covers writes made by management
+  commands in other processes; the count covers deletes.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.template.loader import render_to_string
+
+from .models import DailyFlight
+
+ROW_TEMPLATE = "flight_ops/partials/daily_flight_row.html"
+ROW_TIMEOUT = 60 * 60 * 24
+PAGE_TIMEOUT = 60 * 10
+
+
+def _counter_key(date_of_operation):
+    return f"flight_board:counter:{date_of_operation.isoformat()}"
+
+
+def board_version(date_of_operation):
+    """Version of the board of one date; changes whenever one of its flights does"""
+    stamp = DailyFlight.objects.filter(date_of_operation=date_of_operation).aggregate(count=Count("pk"), latest=Max("updated_at"))
+    latest = stamp["latest"].timestamp() if stamp["latest"] else 0
+    return f"{stamp['count']}.{latest}.{cache.get(_counter_key(date_of_operation), 0)}"
+
+
+def bump_board(date_of_operation):
+    """Invalidate the cached pages of one date once the transaction commits"""
+
+    def bump():
+        key = _counter_key(date_of_operation)
+        if not cache.add(key, 1, timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:  # evicted between add() and incr()
+                cache.set(key, 1, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def row_key(flight):
+    return f"flight_row:{flight.pk}:{flight.updated_at.timestamp()}"
+
+
+def render_rows(flights):
+    """Rendered row fragments for `flights`, in order, rendering only the cache misses"""
+    keys = [row_key(flight) for flight in flights]
+    cached = cache.get_many(keys)
+    missing = {}
+    rows = []
+    for key, flight in zip(keys, flights):
+        row = cached.get(key)
+        if row is None:
+            row = missing[key] = render_to_string(ROW_TEMPLATE, {"flight": flight})
+        rows.append(row)
+    if missing:
+        cache.set_many(missing, ROW_TIMEOUT)
+    return rows
+
+
+def get_page(date_of_operation, version, params):
+    """Cached (rows, next_cursor) of a board page, None on a miss"""
+    return cache.get(_page_key(date_of_operation, version, params))
+
+
+def set_page(date_of_operation, version, params, rows, next_cursor):
+    cache.set(_page_key(date_of_operation, version, params), (rows, next_cursor), PAGE_TIMEOUT)
+
+
+def _page_key(date_of_operation, version, params):
+    digest = hashlib.md5("|".join(params).encode()).hexdigest()
+    return f"flight_board:page:{date_of_operation.isoformat()}:{version}:{digest}"
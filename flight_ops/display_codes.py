@@ -0,0 +1,90 @@
+"""
+Maintenance of the denormalized display codes on DailyFlight.
+
+DailyFlight.save() refreshes its own codes; the bulk writers (generation, COPY
+loader, propagation) copy them from the schedule's masterdata. When masterdata
+itself is edited, the signals in flight_ops.signals call these helpers to rewrite
+the codes of the affected flights with set-based UPDATEs, moving updated_at so
+cached board rows are refreshed.
+"""
+
+from django.db import connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import DISPLAY_CODES, DailyFlight, movement_direction_expression
+
+
+def _code_fields(model):
+    """Fields of a masterdata model copied onto DailyFlight: column -> (relation, code field)"""
+    return {
+        column: (relation, code_field)
+        for column, (relation, code_field) in DISPLAY_CODES.items()
+        if DailyFlight._meta.get_field(relation).related_model is model
+    }
+
+
+def stored_codes(instance):
+    """Code values of a masterdata object as stored in the database (None if it isn't stored yet)"""
+    fields = {code_field for _, code_field in _code_fields(type(instance)).values()}
+    if instance.pk is None or not fields:
+        return None
+    return type(instance)._default_manager.filter(pk=instance.pk).values(*fields).first()
+
+
+def sync_display_codes(instance, previous=None):
+    """
+    Rewrite the codes copied from a saved masterdata object; returns the number of
+    updated flights. `previous` are its stored_codes() before the save: when no code
+    changed, no flight is scanned.
+    """
+    code_fields = _code_fields(type(instance))
+    if previous is not None and all((previous[field] or "") == (getattr(instance, field) or "") for _, field in code_fields.values()):
+        return 0
+
+    now = timezone.now()
+    updated = 0
+    for column, (relation, code_field) in code_fields.items():
+        code = getattr(instance, code_field) or ""
+        updated += DailyFlight.objects.filter(**{relation: instance}).exclude(**{column: code}).update(**{column: code, "updated_at": now})
+
+    if isinstance(instance, DailyFlight.origin.field.related_model) and updated:
+        # A renamed airport may become (or stop being) the home airport
+        flights = DailyFlight.objects.filter(Q(origin=instance) | Q(destination=instance))
+        flights.annotate(new_direction=movement_direction_expression()).exclude(direction=F("new_direction")).update(
+            direction=movement_direction_expression(), updated_at=now
+        )
+    return updated
+
+
+def sync_checkin_codes(flight_ids=None, counter_id=None):
+    """
+    Rebuild the packed check-in counter codes of the given flights (or of the flights
+    assigned to a counter); returns the number of updated flights.
+    """
+    flights = DailyFlight._meta.db_table
+    through = DailyFlight.checkin_counters.through._meta.db_table
+    counters = DailyFlight.checkin_counters.field.related_model._meta.db_table
+
+    if flight_ids is not None:
+        scope = "df.id = ANY(%(flight_ids)s)"
+    else:
+        scope = f"df.id IN (SELECT dailyflight_id FROM {through} WHERE checkincounter_id = %(counter_id)s)"
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {flights} df SET checkin_codes = codes.packed, updated_at = %(now)s
+            FROM (
+                SELECT df.id, COALESCE(string_agg(c.code, ',' ORDER BY c.code), '') AS packed
+                FROM {flights} df
+                LEFT JOIN {through} t ON t.dailyflight_id = df.id
+                LEFT JOIN {counters} c ON c.id = t.checkincounter_id
+                WHERE {scope}
+                GROUP BY df.id
+            ) codes
+            WHERE df.id = codes.id AND df.checkin_codes IS DISTINCT FROM codes.packed
+            """,
+            {"flight_ids": list(flight_ids or []), "counter_id": counter_id, "now": timezone.now()},
+        )
+        return cursor.rowcount
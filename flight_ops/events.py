@@ -0,0 +1,133 @@
+"""
+Flight event log: milestones recorded as events, projected into DailyFlight.
+
+Estimated/actual times (etod, aobt, atod, etoa, atoa, aibt) and status changes are
+appended to FlightEvent with record_event()/record_events() - cheap inserts, the
+DailyFlight row is not touched, and every reported value stays in the flight's
+timeline().
+
+project_events() applies the log to DailyFlight in batches:
+
+- a trigger adds every inserted event to the PendingFlightEvent outbox, a small
+  uncompressed table; a batch locks the oldest outbox rows (SKIP LOCKED, so
+  several projectors can run side by side) and deletes them once projected. An
+  event of a long transaction shows up in the outbox when it commits, it is
+  never skipped;
+- for each (flight, milestone) in the batch the latest event by event_time wins
+  (one DISTINCT ON over the flight index), so late reports of older values do
+  not overwrite newer ones;
+- one UPDATE per batch writes the changed flights and moves their updated_at
+  (board caches, live updates). A projected status also clears the flight's
+  cancelled_by_schedule mark: reactivating its schedule never overrides it.
+
+Milestones without events keep the values written by other paths (the edit form,
+propagation); schedule generation never writes them.
+"""
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core_app import dashboard
+
+from .models import DailyFlight, FlightEvent, PendingFlightEvent
+
+PROJECTION_BATCH_SIZE = 1000
+
+TIME_MILESTONES = ["etod", "aobt", "atod", "etoa", "atoa", "aibt"]
+MILESTONES = [*TIME_MILESTONES, "status"]
+STATUSES = {code for code, _ in DailyFlight.STATUS_CHOICES}
+
+
+def _new_value(milestone):
+    value = "p.status_value" if milestone == "status" else f"p.{milestone}"
+    return f"CASE WHEN p.has_{milestone} THEN {value} ELSE df.{milestone} END"
+
+
+_PROJECT_SQL = f"""
+    WITH touched AS (
+        SELECT * FROM unnest(%s::bigint[], %s::text[]) AS t(flight_id, milestone)
+    ), latest AS (
+        SELECT DISTINCT ON (e.flight_id, e.milestone) e.flight_id, e.milestone, e.time_value, e.status_value
+        FROM flight_ops_flightevent e
+        JOIN touched t ON t.flight_id = e.flight_id AND t.milestone = e.milestone
+        ORDER BY e.flight_id, e.milestone, e.event_time DESC, e.id DESC
+    ), pivot AS (
+        SELECT flight_id,
+            {", ".join(f"bool_or(milestone = '{m}') AS has_{m}, max(time_value) FILTER (WHERE milestone = '{m}') AS {m}" for m in TIME_MILESTONES)},
+            bool_or(milestone = 'status') AS has_status, max(status_value) FILTER (WHERE milestone = 'status') AS status_value
+        FROM latest
+        GROUP BY flight_id
+    )
+    UPDATE flight_ops_dailyflight df SET
+        {", ".join(f"{m} = {_new_value(m)}" for m in MILESTONES)},
+        cancelled_by_schedule = df.cancelled_by_schedule AND NOT p.has_status,
+        updated_at = %s
+    FROM pivot p
+    WHERE df.id = p.flight_id
+      AND ({", ".join(_new_value(m) for m in MILESTONES)}, df.cancelled_by_schedule AND NOT p.has_status)
+          IS DISTINCT FROM ({", ".join(f"df.{m}" for m in MILESTONES)}, df.cancelled_by_schedule)
+"""
+
+
+def _event(flight, milestone, value, event_time=None, source=""):
+    """Unsaved FlightEvent setting `milestone` of `flight` (instance or pk) to `value`"""
+    flight_id = getattr(flight, "pk", flight)
+    if milestone == "status":
+        if value not in STATUSES:
+            raise ValueError(f"Unknown flight status: {value}")
+        return FlightEvent(flight_id=flight_id, milestone=milestone, status_value=value, event_time=event_time or timezone.now(), source=source)
+    if milestone not in TIME_MILESTONES:
+        raise ValueError(f"Unknown flight milestone: {milestone}")
+    return FlightEvent(flight_id=flight_id, milestone=milestone, time_value=value, event_time=event_time or timezone.now(), source=source)
+
+
+def record_event(flight, milestone, value, event_time=None, source=""):
+    """
+    Append one milestone event: `value` is a datetime (None clears the time) or a
+    status code for milestone "status". `event_time` defaults to now.
+    """
+    event = _event(flight, milestone, value, event_time, source)
+    event.save()
+    return event
+
+
+def record_events(events, source=""):
+    """Append many events in one insert: `events` are (flight, milestone, value[, event_time]) tuples"""
+    return FlightEvent.objects.bulk_create([_event(*event, source=source) for event in events])
+
+
+def timeline(flight):
+    """Events of `flight` (instance or pk) in the order they happened"""
+    return FlightEvent.objects.filter(flight_id=getattr(flight, "pk", flight)).order_by("event_time", "id")
+
+
+def project_batch(batch_size=PROJECTION_BATCH_SIZE):
+    """Project the next batch of pending events, returns (events read, flights updated)"""
+    with transaction.atomic():
+        # Rows locked by another projector are skipped
+        events = list(
+            PendingFlightEvent.objects.select_for_update(skip_locked=True).order_by("event_id").values_list("event_id", "flight_id", "milestone")[:batch_size]
+        )
+        if not events:
+            return 0, 0
+
+        touched = {(flight_id, milestone) for _, flight_id, milestone in events}
+        with connection.cursor() as cursor:
+            cursor.execute(_PROJECT_SQL, [[pair[0] for pair in touched], [pair[1] for pair in touched], timezone.now()])
+            updated = cursor.rowcount
+
+        PendingFlightEvent.objects.filter(event_id__in=[event_id for event_id, _, _ in events]).delete()
+        if updated:
+            transaction.on_commit(dashboard.invalidate)
+        return len(events), updated
+
+
+def project_events(batch_size=PROJECTION_BATCH_SIZE):
+    """Project every pending event, returns (events read, flights updated)"""
+    total_events = total_updated = 0
+    while True:
+        events, updated = project_batch(batch_size)
+        if not events:
+            return total_events, total_updated
+        total_events += events
+        total_updated += updated
@@ -1,8 +1,8 @@
 from django import forms
 from django.db import models
-from django.core.cache import cache
 from django_select2 import forms as s2forms
-from .models import DailyFlight
+from masterdata.autocomplete import AutocompleteWidget
+from .models import DailyFlight, EntityUsage
 
 
 class BootstrapFormMixin:
@@ -27,31 +27,6 @@ class BootstrapFormMixin:
                 field.widget.attrs["class"] = "form-control"
 
 
-def get_cached_used_ids():
-    """Get cached IDs of airlines/airports/aircraft actually used in DailyFlights"""
-    cache_key = "dailyflight_form_ids"
-    cached = cache.get(cache_key)
-
-    if cached:
-        return cached
-
-    # Query once and cache for 5 minutes
-    airline_ids = list(DailyFlight.objects.values_list("airline_id", flat=True).distinct())
-    aircraft_ids = list(DailyFlight.objects.values_list("aircraft_type_id", flat=True).distinct())
-    origin_ids = list(DailyFlight.objects.values_list("origin_id", flat=True).distinct())
-    dest_ids = list(DailyFlight.objects.values_list("destination_id", flat=True).distinct())
-    airport_ids = list(set(origin_ids) | set(dest_ids))
-
-    result = {
-        "airline_ids": airline_ids,
-        "aircraft_ids": aircraft_ids,
-        "airport_ids": airport_ids,
-    }
-
-    cache.set(cache_key, result, 300)  # Cache for 5 minutes
-    return result
-
-
 class DailyFlightForm(BootstrapFormMixin, forms.ModelForm):
     class Meta:
         model = DailyFlight
@@ -80,9 +55,10 @@ class DailyFlightForm(BootstrapFormMixin, forms.ModelForm):
             "public_remark",
         ]
         widgets = {
-            # Use AJAX autocomplete for large dropdowns (fast loading)
-            "airline": s2forms.ModelSelect2Widget(
-                search_fields=["iata_code__icontains", "name__icontains"],
+            # AJAX autocomplete from the in-memory prefix index, limited to masterdata used by flights
+            "airline": AutocompleteWidget(
+                "airlines",
+                scope="used",
                 attrs={
                     "data-minimum-input-length": 0,
                     "data-placeholder": "Select airline...",
@@ -91,8 +67,9 @@ class DailyFlightForm(BootstrapFormMixin, forms.ModelForm):
                     "class": "form-control",
                 },
             ),
-            "origin": s2forms.ModelSelect2Widget(
-                search_fields=["iata_code__icontains", "name__icontains", "city__icontains"],
+            "origin": AutocompleteWidget(
+                "airports",
+                scope="used",
                 attrs={
                     "data-minimum-input-length": 0,
                     "data-placeholder": "Select origin airport...",
@@ -101,8 +78,9 @@ class DailyFlightForm(BootstrapFormMixin, forms.ModelForm):
                     "class": "form-control",
                 },
             ),
-            "destination": s2forms.ModelSelect2Widget(
-                search_fields=["iata_code__icontains", "name__icontains", "city__icontains"],
+            "destination": AutocompleteWidget(
+                "airports",
+                scope="used",
                 attrs={
                     "data-minimum-input-length": 0,
                     "data-placeholder": "Select destination airport...",
@@ -111,8 +89,9 @@ class DailyFlightForm(BootstrapFormMixin, forms.ModelForm):
                     "class": "form-control",
                 },
             ),
-            "aircraft_type": s2forms.ModelSelect2Widget(
-                search_fields=["iata_code__icontains", "manufacturer__icontains", "model__icontains"],
+            "aircraft_type": AutocompleteWidget(
+                "aircraft",
+                scope="used",
                 attrs={
                     "data-minimum-input-length": 0,
                     "data-placeholder": "Select aircraft type...",
@@ -138,14 +117,11 @@ class DailyFlightForm(BootstrapFormMixin, forms.ModelForm):
         # Filter querysets to only used records for Select2 autocomplete
         from masterdata.models import Airline, Airport, AircraftType, Gate, Stand, CheckInCounter, BaggageCarousel
 
-        # Get cached IDs (avoids repeated slow queries)
-        ids = get_cached_used_ids()
-
-        # Set querysets for Select2 widgets - they'll load via AJAX but this filters what's available
-        self.fields["airline"].queryset = Airline.objects.filter(id__in=ids["airline_ids"])
-        self.fields["aircraft_type"].queryset = AircraftType.objects.filter(id__in=ids["aircraft_ids"])
-        self.fields["origin"].queryset = Airport.objects.filter(id__in=ids["airport_ids"])
-        self.fields["destination"].queryset = Airport.objects.filter(id__in=ids["airport_ids"])
+        # Semi-joins on the usage table (see EntityUsage) - they'll load via AJAX but this filters what's available
+        self.fields["airline"].queryset = Airline.objects.filter(id__in=EntityUsage.used_ids("airline"))
+        self.fields["aircraft_type"].queryset = AircraftType.objects.filter(id__in=EntityUsage.used_ids("aircraft_type"))
+        self.fields["origin"].queryset = Airport.objects.filter(id__in=EntityUsage.used_ids("airport"))
+        self.fields["destination"].queryset = Airport.objects.filter(id__in=EntityUsage.used_ids("airport"))
 
         # Resources - small sets, regular dropdowns are fine
         self.fields["gate"].queryset = Gate.objects.filter(is_active=True)
@@ -0,0 +1,634 @@
+"""
+Set-based daily flight generation engine (Rolling Window Strategy).
+
+Expands active SeasonalFlights over a date window and writes the resulting
+DailyFlights with batched bulk_create/bulk_update. Existing flight_ids for the
+window are preloaded once, so there is no per-flight round-trip.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+import django
+from django.db import IntegrityError, OperationalError, connection, connections, transaction
+from django.utils import timezone
+from psycopg2 import errorcodes
+
+from schedules.expansion import expand, scheduled_times
+from schedules.models import SeasonalFlight
+
+from .models import CommandCheckpoint, DailyFlight, GenerationWatermark, movement_direction
+
+DEFAULT_BATCH_SIZE = 2000
+
+# Attempts of a chunk that lost a deadlock on the EntityUsage counters to another writer
+CHUNK_ATTEMPTS = 3
+
+# bulk_update builds one CASE WHEN per field and row, so keep its statements smaller
+UPDATE_BATCH_SIZE = 500
+
+# Fields refreshed from the seasonal schedule on existing, auto-propagatable flights (FULL mode).
+# Operational fields (status, estimated/actual times) are never rewritten: new flights start as SCH.
+SCHEDULE_FIELDS = [
+    "schedule",
+    "airline",
+    "flight_number",
+    "origin",
+    "destination",
+    "aircraft_type",
+    "date_of_operation",
+    "stod",
+    "stoa",
+    "schedule_version",
+    "last_propagated_at",
+    "updated_at",
+    "airline_code",
+    "origin_code",
+    "destination_code",
+    "aircraft_type_code",
+    "direction",
+]
+
+# Columns compared to decide whether an existing flight actually differs from its schedule
+SIGNATURE_FIELDS = [
+    "schedule_id",
+    "airline_id",
+    "flight_number",
+    "origin_id",
+    "destination_id",
+    "aircraft_type_id",
+    "stod",
+    "stoa",
+    "schedule_version",
+    "airline_code",
+    "origin_code",
+    "destination_code",
+    "aircraft_type_code",
+    "direction",
+]
+
+
+def flight_signature(values):
+    """Compact fingerprint of the schedule-derived columns of a flight"""
+    return hash(tuple(values))
+
+
+def build_flight_id(date_of_operation, airline_code, flight_number):
+    """Unique flight identifier, e.g. 20260315-TG920"""
+    return f"{date_of_operation.strftime('%Y%m%d')}-{airline_code}{flight_number}"
+
+
+class GenerationResult:
+    """Counters for a generation run"""
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.skipped_existing = 0
+        self.skipped_manual = 0
+        self.errors = 0
+
+    @property
+    def skipped(self):
+        return self.skipped_existing + self.skipped_manual
+
+    @property
+    def written(self):
+        return self.created + self.updated
+
+    def merge(self, other):
+        """Add the counters of another (partition) result"""
+        for counter in ("created", "updated", "unchanged", "skipped_existing", "skipped_manual", "errors"):
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+        return self
+
+
+class DailyFlightGenerator:
+    """
+    Generates DailyFlights for [start_date, end_date] from active seasonal schedules.
+
+    - FULL mode: creates missing flights and refreshes existing ones from their schedule.
+    - INCREMENTAL mode: creates missing flights only, existing flights are left alone.
+    - Manually modified flights are never touched.
+    """
+
+    def __init__(self, start_date, end_date, incremental=False, dry_run=False, batch_size=DEFAULT_BATCH_SIZE, use_watermarks=False, log=None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.incremental = incremental
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.use_watermarks = use_watermarks
+        self.log = log or (lambda message: None)
+        self.result = GenerationResult()
+        self.first_dates = {}
+        self._existing = {}
+        # Pending writes keyed by flight_id: overlapping schedules producing the same
+        # flight_id leave one write, the last schedule wins (as with per-flight saves)
+        self._to_create = {}
+        self._to_update = {}
+
+    def get_schedules(self):
+        return SeasonalFlight.objects.filter(is_active=True, start_date__lte=self.end_date, end_date__gte=self.start_date).select_related(
+            "airline", "origin", "destination", "aircraft_type"
+        )
+
+    def prepare(self, schedules):
+        """
+        Apply generation watermarks: each schedule only expands dates after its watermark.
+
+        Returns the schedules that still have dates to generate in the window.
+        """
+        if not self.use_watermarks:
+            return schedules
+
+        watermarks = dict(GenerationWatermark.objects.filter(schedule__in=schedules).values_list("schedule_id", "generated_through"))
+        self.first_dates = {schedule_id: through + timedelta(days=1) for schedule_id, through in watermarks.items()}
+        return [schedule for schedule in schedules if self.first_dates.get(schedule.pk, self.start_date) <= min(self.end_date, schedule.end_date)]
+
+    def load_existing(self, schedules):
+        """Map flight_id -> (pk, is_manually_modified, signature) for every flight already in the part of the window being expanded"""
+        first_date = min((max(self.start_date, self.first_dates.get(schedule.pk, self.start_date)) for schedule in schedules), default=self.end_date)
+        rows = DailyFlight.objects.filter(date_of_operation__gte=first_date, date_of_operation__lte=self.end_date).values_list(
+            "flight_id", "pk", "is_manually_modified", *SIGNATURE_FIELDS
+        )
+        return {row[0]: (row[1], row[2], flight_signature(row[3:])) for row in rows.iterator(chunk_size=10000)}
+
+    def iter_occurrences(self, schedules):
+        """Yield (schedule, date) for every operating day of every schedule, in date order"""
+        for date_of_operation, schedule in expand(schedules, self.start_date, self.end_date, self.first_dates):
+            yield schedule, date_of_operation
+
+    def build_flight(self, schedule, date_of_operation, now, tz):
+        """Build an unsaved DailyFlight for one schedule occurrence"""
+        stod, stoa = scheduled_times(date_of_operation, schedule.stod, schedule.stoa, tz)
+
+        return DailyFlight(
+            flight_id=build_flight_id(date_of_operation, schedule.airline.iata_code, schedule.flight_number),
+            schedule_id=schedule.pk,
+            airline_id=schedule.airline_id,
+            flight_number=schedule.flight_number,
+            origin_id=schedule.origin_id,
+            destination_id=schedule.destination_id,
+            aircraft_type_id=schedule.aircraft_type_id,
+            date_of_operation=date_of_operation,
+            status="SCH",
+            stod=stod,
+            stoa=stoa,
+            is_manually_modified=False,
+            schedule_version=schedule.revision,
+            last_propagated_at=now,
+            updated_at=now,
+            airline_code=schedule.airline.iata_code,
+            origin_code=schedule.origin.iata_code,
+            destination_code=schedule.destination.iata_code,
+            aircraft_type_code=schedule.aircraft_type.icao_code,
+            direction=movement_direction(schedule.origin.iata_code, schedule.destination.iata_code),
+        )
+
+    def run(self, schedules=None):
+        """Generate the window and return a GenerationResult"""
+        if schedules is None:
+            schedules = list(self.get_schedules())
+        schedules = self.prepare(schedules)
+        if not schedules:
+            return self.result
+
+        existing = self._existing = self.load_existing(schedules)
+        now = timezone.now()
+        tz = timezone.get_current_timezone()
+
+        for schedule, date_of_operation in self.iter_occurrences(schedules):
+            flight = self.build_flight(schedule, date_of_operation, now, tz)
+            current = existing.get(flight.flight_id)
+
+            if current is not None:
+                pk, is_manual, signature = current
+                if is_manual:
+                    self.result.skipped_manual += 1
+                    continue
+                if self.incremental:
+                    self.result.skipped_existing += 1
+                    continue
+                # Don't rewrite flights that already match their schedule
+                if signature == flight_signature(getattr(flight, field) for field in SIGNATURE_FIELDS):
+                    self._to_update.pop(flight.flight_id, None)
+                    self.result.unchanged += 1
+                    continue
+                flight.pk = pk
+
+            if self.dry_run:
+                action = "create" if flight.pk is None else "update"
+                self.log(
+                    f"   [DRY RUN] Would {action}: {flight.flight_id} - "
+                    f"{schedule.origin.iata_code}->{schedule.destination.iata_code} "
+                    f"STD {flight.stod.strftime('%H:%M')}"
+                )
+                if flight.pk is None:
+                    self.result.created += 1
+                else:
+                    self.result.updated += 1
+                continue
+
+            if flight.pk is None:
+                self._to_create[flight.flight_id] = flight
+            else:
+                self._to_update[flight.flight_id] = flight
+
+            if len(self._to_create) + len(self._to_update) >= self.batch_size:
+                self.flush()
+
+        self.flush()
+        return self.result
+
+    def flush(self):
+        """Write the pending batch, each side in its own savepoint"""
+        if self._to_create:
+            self._write(list(self._to_create.values()), created=True)
+            self._to_create = {}
+        if self._to_update:
+            self._write(list(self._to_update.values()), created=False)
+            self._to_update = {}
+
+    def _save(self, flights, created):
+        with transaction.atomic():
+            if created:
+                DailyFlight.objects.bulk_create(flights, batch_size=self.batch_size)
+            else:
+                DailyFlight.objects.bulk_update(flights, SCHEDULE_FIELDS, batch_size=UPDATE_BATCH_SIZE)
+
+    def _write(self, flights, created):
+        try:
+            self._save(flights, created)
+        except IntegrityError as e:
+            # Only the offending flights are lost: retry the batch flight by flight
+            self.log(f"   ⚠ Error writing batch starting at {flights[0].flight_id}, retrying one by one: {str(e)}")
+            written = []
+            for flight in flights:
+                try:
+                    self._save([flight], created)
+                except IntegrityError as e:
+                    self.result.errors += 1
+                    self.log(f"   ⚠ Error writing {flight.flight_id}: {str(e)}")
+                else:
+                    written.append(flight)
+            flights = written
+
+        # Later batches see the written flights as existing (same flight_id from another schedule)
+        for flight in flights:
+            self._existing[flight.flight_id] = (flight.pk, False, flight_signature(getattr(flight, field) for field in SIGNATURE_FIELDS))
+
+        if created:
+            self.result.created += len(flights)
+        else:
+            self.result.updated += len(flights)
+        self.log(f"   ✓ Written {self.result.written} flights...")
+
+
+def _copy_text(value):
+    """Escape one value for PostgreSQL COPY text format"""
+    if value is None:
+        return "\\N"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class _CopyStream:
+    """File-like object feeding COPY FROM STDIN from a row iterator, without building the whole payload"""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = ""
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._buffer += "\t".join(_copy_text(value) for value in row) + "\n"
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    readline = read
+
+
+class CopyDailyFlightGenerator(DailyFlightGenerator):
+    """
+    PostgreSQL COPY loader.
+
+    Streams the generated rows through COPY into a temporary staging table and
+    merges them into flight_ops_dailyflight with a single INSERT ... ON CONFLICT
+    (flight_id). Manually modified flights are left alone, unchanged flights are
+    not rewritten. Dry runs fall back to the ORM classification.
+    """
+
+    STAGING_TABLE = "daily_flight_staging"
+    STAGING_COLUMNS = [
+        "flight_id",
+        "schedule_id",
+        "airline_id",
+        "flight_number",
+        "origin_id",
+        "destination_id",
+        "aircraft_type_id",
+        "date_of_operation",
+        "stod",
+        "stoa",
+        "schedule_version",
+        "airline_code",
+        "origin_code",
+        "destination_code",
+        "aircraft_type_code",
+        "direction",
+    ]
+
+    def iter_rows(self, schedules):
+        tz = timezone.get_current_timezone()
+        for schedule, date_of_operation in self.iter_occurrences(schedules):
+            stod, stoa = scheduled_times(date_of_operation, schedule.stod, schedule.stoa, tz)
+            yield (
+                build_flight_id(date_of_operation, schedule.airline.iata_code, schedule.flight_number),
+                schedule.pk,
+                schedule.airline_id,
+                schedule.flight_number,
+                schedule.origin_id,
+                schedule.destination_id,
+                schedule.aircraft_type_id,
+                date_of_operation,
+                stod,
+                stoa,
+                schedule.revision,
+                schedule.airline.iata_code,
+                schedule.origin.iata_code,
+                schedule.destination.iata_code,
+                schedule.aircraft_type.icao_code,
+                movement_direction(schedule.origin.iata_code, schedule.destination.iata_code),
+            )
+
+    def run(self, schedules=None):
+        if self.dry_run:
+            return super().run(schedules)
+        if schedules is None:
+            schedules = list(self.get_schedules())
+        schedules = self.prepare(schedules)
+        if not schedules:
+            return self.result
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            self._create_staging_table(cursor)
+            cursor.copy_expert(
+                f"COPY {self.STAGING_TABLE} ({', '.join(self.STAGING_COLUMNS)}) FROM STDIN",
+                _CopyStream(self.iter_rows(schedules)),
+            )
+            cursor.execute(f"ANALYZE {self.STAGING_TABLE}")
+
+            cursor.execute(f"SELECT COUNT(DISTINCT flight_id) FROM {self.STAGING_TABLE}")
+            staged = cursor.fetchone()[0]
+            cursor.execute(
+                f"SELECT COUNT(DISTINCT flight_id) FROM {self.STAGING_TABLE} s JOIN {DailyFlight._meta.db_table} df USING (flight_id) WHERE df.is_manually_modified"
+            )
+            self.result.skipped_manual = cursor.fetchone()[0]
+
+            cursor.execute(self._merge_sql(), {"now": timezone.now()})
+            inserted, updated = cursor.fetchone()
+            cursor.execute(f"DROP TABLE {self.STAGING_TABLE}")
+
+        self.result.created = inserted
+        self.result.updated = updated
+        if self.incremental:
+            self.result.skipped_existing = staged - inserted - self.result.skipped_manual
+        else:
+            self.result.unchanged = staged - inserted - updated - self.result.skipped_manual
+        self.log(f"   ✓ Merged {staged} staged flights")
+        return self.result
+
+    def _create_staging_table(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.STAGING_TABLE}")
+        cursor.execute(
+            f"""
+            CREATE TEMPORARY TABLE {self.STAGING_TABLE} (
+                seq bigint GENERATED ALWAYS AS IDENTITY,
+                flight_id varchar(20) NOT NULL,
+                schedule_id bigint,
+                airline_id bigint NOT NULL,
+                flight_number varchar(10) NOT NULL,
+                origin_id bigint NOT NULL,
+                destination_id bigint NOT NULL,
+                aircraft_type_id bigint NOT NULL,
+                date_of_operation date NOT NULL,
+                stod timestamptz NOT NULL,
+                stoa timestamptz NOT NULL,
+                schedule_version integer NOT NULL,
+                airline_code varchar(2) NOT NULL,
+                origin_code varchar(3) NOT NULL,
+                destination_code varchar(3) NOT NULL,
+                aircraft_type_code varchar(4) NOT NULL,
+                direction varchar(3) NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+        cursor.execute(f"CREATE INDEX ON {self.STAGING_TABLE} (flight_id)")
+
+    def _merge_sql(self):
+        table = DailyFlight._meta.db_table
+        schedule_columns = [
+            "schedule_id",
+            "airline_id",
+            "flight_number",
+            "origin_id",
+            "destination_id",
+            "aircraft_type_id",
+            "date_of_operation",
+            "stod",
+            "stoa",
+            "schedule_version",
+            "airline_code",
+            "origin_code",
+            "destination_code",
+            "aircraft_type_code",
+            "direction",
+        ]
+
+        if self.incremental:
+            conflict = "DO NOTHING"
+        else:
+            assignments = ",\n                    ".join(f"{column} = EXCLUDED.{column}" for column in schedule_columns)
+            current = ", ".join(f"{table}.{column}" for column in schedule_columns)
+            incoming = ", ".join(f"EXCLUDED.{column}" for column in schedule_columns)
+            conflict = f"""DO UPDATE SET
+                    {assignments},
+                    last_propagated_at = EXCLUDED.last_propagated_at,
+                    updated_at = EXCLUDED.updated_at
+                WHERE NOT {table}.is_manually_modified
+                  AND ({current}) IS DISTINCT FROM ({incoming})"""
+
+        return f"""
+            WITH merged AS (
+                INSERT INTO {table} (
+                    {", ".join(schedule_columns)}, flight_id, status, is_manually_modified, cancelled_by_schedule,
+                    last_propagated_at, registration, public_remark, qr_code_data, created_at, updated_at,
+                    gate_code, stand_code, carousel_code, checkin_codes
+                )
+                SELECT {", ".join(schedule_columns)}, flight_id, 'SCH', false, false,
+                       %(now)s, '', '', '', %(now)s, %(now)s,
+                       '', '', '', ''
+                FROM (
+                    -- Overlapping schedules can stage the same flight_id: the last one wins
+                    SELECT DISTINCT ON (flight_id) * FROM {self.STAGING_TABLE} ORDER BY flight_id, seq DESC
+                ) staged
+                ON CONFLICT (flight_id) {conflict}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted) FROM merged
+        """
+
+
+def advance_watermarks(schedules, start_date, end_date):
+    """
+    Record that `schedules` are generated through the end of [start_date, end_date].
+
+    A watermark only moves forward, and only when the window is contiguous with it,
+    so a run that left a gap never hides the gap from later runs.
+    """
+    current = dict(GenerationWatermark.objects.filter(schedule__in=schedules).values_list("schedule_id", "generated_through"))
+
+    watermarks = []
+    for schedule in schedules:
+        through = min(end_date, schedule.end_date)
+        previous = current.get(schedule.pk)
+        if previous is not None and (through <= previous or start_date > previous + timedelta(days=1)):
+            continue
+        watermarks.append(GenerationWatermark(schedule_id=schedule.pk, generated_through=through))
+
+    GenerationWatermark.objects.bulk_create(
+        watermarks, batch_size=DEFAULT_BATCH_SIZE, update_conflicts=True, unique_fields=["schedule"], update_fields=["generated_through", "updated_at"]
+    )
+    return len(watermarks)
+
+
+def split_window(start_date, end_date, partitions):
+    """Split [start_date, end_date] into at most `partitions` contiguous date ranges"""
+    total_days = (end_date - start_date).days + 1
+    partitions = max(1, min(partitions, total_days))
+    size, remainder = divmod(total_days, partitions)
+
+    ranges = []
+    first = start_date
+    for index in range(partitions):
+        days = size + (1 if index < remainder else 0)
+        last = first + timedelta(days=days - 1)
+        ranges.append((first, last))
+        first = last + timedelta(days=1)
+    return ranges
+
+
+def iter_chunks(start_date, end_date, chunk_days):
+    """Yield consecutive (first, last) date ranges of `chunk_days` days (0 = the whole window)"""
+    if chunk_days <= 0:
+        yield start_date, end_date
+        return
+    first = start_date
+    while first <= end_date:
+        last = min(end_date, first + timedelta(days=chunk_days - 1))
+        yield first, last
+        first = last + timedelta(days=1)
+
+
+class ChunkFailed(Exception):
+    """A chunk of generate_chunked() failed; the chunks before it stay committed"""
+
+    def __init__(self, first, last, error):
+        super().__init__(first, last, error)
+        self.first = first
+        self.last = last
+        self.error = error
+
+    def __str__(self):
+        return f"chunk {self.first} to {self.last}: {self.error}"
+
+
+def generate_chunked(start_date, end_date, chunk_days=0, use_copy=False, checkpoint=None, schedules=None, **kwargs):
+    """
+    Generate [start_date, end_date] committing one transaction per `chunk_days` days.
+
+    Each chunk records its last date in `checkpoint` inside the chunk's transaction,
+    so a resumed run skips exactly the chunks that were committed. A chunk rolled back
+    by a deadlock (concurrent writers of the same EntityUsage rows) is run again; any
+    other failure is raised as ChunkFailed.
+    """
+    generator_class = CopyDailyFlightGenerator if use_copy else DailyFlightGenerator
+    if schedules is None:
+        schedules = list(generator_class(start_date, end_date).get_schedules())
+
+    result = GenerationResult()
+    for first, last in iter_chunks(start_date, end_date, chunk_days):
+        if checkpoint is not None and checkpoint.position and checkpoint.position >= last.isoformat():
+            continue
+        for attempt in range(1, CHUNK_ATTEMPTS + 1):
+            try:
+                with transaction.atomic():
+                    chunk_result = generator_class(first, last, **kwargs).run(schedules)
+                    if checkpoint is not None:
+                        checkpoint.advance(last.isoformat())
+            except OperationalError as e:
+                if getattr(e.__cause__, "pgcode", None) != errorcodes.DEADLOCK_DETECTED or attempt == CHUNK_ATTEMPTS:
+                    raise ChunkFailed(first, last, str(e)) from e
+            except Exception as e:
+                raise ChunkFailed(first, last, str(e)) from e
+            else:
+                result.merge(chunk_result)
+                break
+    return result
+
+
+def _init_worker():
+    django.setup()
+
+
+def generate_partition(start_date, end_date, run_key=None, resume=False, **kwargs):
+    """
+    Process-pool entry point: generate one date partition on its own connection.
+
+    flight_id embeds the date of operation, so date partitions can never collide.
+    Each partition keeps its own checkpoint, keyed by run and partition range.
+    """
+    try:
+        checkpoint = None
+        if run_key is not None:
+            checkpoint = CommandCheckpoint.open("generate_daily_flights", f"{run_key}|{start_date}:{end_date}", resume=resume)
+        result = generate_chunked(start_date, end_date, checkpoint=checkpoint, **kwargs)
+        if checkpoint is not None and not result.errors:
+            checkpoint.finish()
+        return result
+    finally:
+        connections.close_all()
+
+
+def generate_parallel(start_date, end_date, workers, **kwargs):
+    """
+    Generate the window in `workers` date partitions across a process pool.
+
+    Returns (combined GenerationResult, list of (start, end, error) for failed partitions).
+    """
+    partitions = split_window(start_date, end_date, workers)
+
+    # Never share the parent's connection with forked workers
+    connections.close_all()
+
+    combined = GenerationResult()
+    failures = []
+    with ProcessPoolExecutor(max_workers=len(partitions), initializer=_init_worker) as pool:
+        futures = {pool.submit(generate_partition, first, last, **kwargs): (first, last) for first, last in partitions}
+        for future in as_completed(futures):
+            first, last = futures[future]
+            try:
+                combined.merge(future.result())
+            except Exception as e:
+                failures.append((first, last, e))
+
+    return combined, sorted(failures, key=lambda failure: failure[0])
@@ -0,0 +1,86 @@
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from flight_ops.generation import CopyDailyFlightGenerator, DailyFlightGenerator
+from flight_ops.models import DailyFlight
+
+
+class Command(BaseCommand):
+    help = "Benchmark daily flight generation: ORM bulk path vs PostgreSQL COPY loader (all changes are rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=180,
+            help="Window size in days (default: 180, one IATA season)",
+        )
+        parser.add_argument(
+            "--start-date",
+            type=str,
+            default="today",
+            help="Start date (YYYY-MM-DD or 'today')",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Number of timed runs per loader (default: 1)",
+        )
+        parser.add_argument(
+            "--fresh",
+            action="store_true",
+            help="Delete the window's flights before each run (inside the rolled back transaction) to time pure inserts",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The COPY loader requires a PostgreSQL database")
+
+        if options["start_date"] == "today":
+            start_date = timezone.now().date()
+        else:
+            try:
+                start_date = datetime.strptime(options["start_date"], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError(f"Invalid date format: {options['start_date']}. Use YYYY-MM-DD")
+        end_date = start_date + timedelta(days=options["days"] - 1)
+
+        self.stdout.write(self.style.WARNING(f"\n⏱  Benchmarking Daily Flight Generation"))
+        self.stdout.write(f"   Period: {start_date} to {end_date} ({options['days']} days)")
+        self.stdout.write(f"   Mode: {'FRESH INSERT' if options['fresh'] else 'CURRENT STATE'}, {options['repeat']} run(s) per loader\n")
+
+        schedules = list(DailyFlightGenerator(start_date, end_date).get_schedules())
+        if not schedules:
+            self.stdout.write(self.style.ERROR("✗ No active seasonal flights found for this period!"))
+            return
+
+        timings = {}
+        for label, generator_class in (("ORM bulk", DailyFlightGenerator), ("COPY", CopyDailyFlightGenerator)):
+            best = None
+            for _ in range(options["repeat"]):
+                with transaction.atomic():
+                    if options["fresh"]:
+                        DailyFlight.objects.filter(date_of_operation__gte=start_date, date_of_operation__lte=end_date).delete()
+
+                    started = time.perf_counter()
+                    result = generator_class(start_date, end_date).run(schedules)
+                    elapsed = time.perf_counter() - started
+
+                    transaction.set_rollback(True)
+
+                best = elapsed if best is None else min(best, elapsed)
+
+            rows = result.created + result.updated + result.unchanged + result.skipped
+            timings[label] = best
+            self.stdout.write(
+                f"   {label:<10} {best:8.2f}s  {rows:>9} flights  {rows / best if best else 0:>10.0f} flights/s  "
+                f"(created {result.created}, updated {result.updated}, unchanged {result.unchanged})"
+            )
+
+        if timings["COPY"]:
+            self.stdout.write(self.style.SUCCESS(f"\n✓ COPY loader is {timings['ORM bulk'] / timings['COPY']:.1f}x the ORM bulk path\n"))
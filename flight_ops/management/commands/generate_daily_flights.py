@@ -1,11 +1,11 @@
 from datetime import datetime, timedelta
 
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 from django.utils import timezone
 
-from flight_ops.models import DailyFlight
-from schedules.models import SeasonalFlight
+from flight_ops.generation import DEFAULT_BATCH_SIZE, ChunkFailed, DailyFlightGenerator, advance_watermarks, generate_chunked, generate_parallel
+from flight_ops.models import CommandCheckpoint, DailyFlight
 
 
 class Command(BaseCommand):
@@ -34,12 +34,47 @@ class Command(BaseCommand):
             action="store_true",
             help="Show what would be created without actually creating",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Number of flights written per bulk insert/update (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Load through PostgreSQL COPY into a staging table and merge with one INSERT ... ON CONFLICT",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Split the window into date partitions generated in N worker processes (default: 1)",
+        )
+        parser.add_argument(
+            "--chunk-days",
+            type=int,
+            default=7,
+            help="Commit one transaction per N days of the window, 0 = single transaction (default: 7)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted run with the same window and mode after its last committed chunk",
+        )
 
     def handle(self, *args, **options):
         days = options["days"]
         start_date_str = options["start_date"]
         incremental = options["incremental"]
         dry_run = options["dry_run"]
+        use_copy = options["copy"]
+        workers = max(1, options["workers"])
+        chunk_days = options["chunk_days"]
+        resume = options["resume"]
+
+        if use_copy and connection.vendor != "postgresql":
+            raise CommandError("--copy requires a PostgreSQL database")
 
         # Parse start date
         if start_date_str == "today":
@@ -55,120 +90,81 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.WARNING(f"\n✈️  Generating Daily Flights - Rolling Window Strategy"))
         self.stdout.write(f"   Period: {start_date} to {end_date} ({days} days)")
-        self.stdout.write(f"   Mode: {'INCREMENTAL' if incremental else 'FULL'}")
+        self.stdout.write(f"   Mode: {'INCREMENTAL' if incremental else 'FULL'}{' (COPY loader)' if use_copy else ''}")
         if dry_run:
             self.stdout.write(self.style.WARNING("   DRY RUN - No changes will be made\n"))
         else:
             self.stdout.write("")
 
         # Get active seasonal flights
-        seasonal_flights = SeasonalFlight.objects.filter(is_active=True, start_date__lte=end_date, end_date__gte=start_date).select_related(
-            "airline", "origin", "destination", "aircraft_type"
-        )
+        seasonal_flights = list(DailyFlightGenerator(start_date, end_date).get_schedules())
 
-        total_schedules = seasonal_flights.count()
+        total_schedules = len(seasonal_flights)
         if total_schedules == 0:
             self.stdout.write(self.style.ERROR("✗ No active seasonal flights found for this period!"))
             return
 
         self.stdout.write(f"📋 Found {total_schedules} active seasonal schedules")
+        if incremental:
+            self.stdout.write("   Only dates after each schedule's generation watermark are expanded")
+
+        generation_options = {
+            "chunk_days": chunk_days,
+            "use_copy": use_copy,
+            "incremental": incremental,
+            "batch_size": options["batch_size"],
+            "use_watermarks": incremental,
+        }
+        run_key = f"{start_date}:{end_date}:{'incremental' if incremental else 'full'}"
+
+        failures = []
+        if dry_run:
+            result = generate_chunked(start_date, end_date, schedules=seasonal_flights, dry_run=True, log=self.stdout.write, **generation_options)
+        elif workers > 1:
+            # Each partition runs in its own process and connection, committing per chunk
+            self.stdout.write(f"⚙️  Generating in {workers} worker processes (partitioned by date)")
+            result, failures = generate_parallel(start_date, end_date, workers, run_key=run_key, resume=resume, **generation_options)
+            if not failures and not result.errors:
+                advance_watermarks(seasonal_flights, start_date, end_date)
+        else:
+            checkpoint = CommandCheckpoint.open("generate_daily_flights", run_key, resume=resume)
+            if checkpoint.position:
+                self.stdout.write(self.style.WARNING(f"↻ Resuming after {checkpoint.position}"))
 
-        created_count = 0
-        skipped_count = 0
-        error_count = 0
-
-        # Generate flights day by day
-        current_date = start_date
-
-        with transaction.atomic():
-            while current_date <= end_date:
-                # Get day of week (1=Monday, 7=Sunday)
-                day_of_week = current_date.isoweekday()
-
-                # Find seasonal flights operating on this day
-                for schedule in seasonal_flights:
-                    # Check if schedule is valid for this date
-                    if not (schedule.start_date <= current_date <= schedule.end_date):
-                        continue
-
-                    # Check if flight operates on this day of week
-                    if str(day_of_week) not in schedule.days_of_operation:
-                        continue
-
-                    # Generate flight_id
-                    flight_id = f"{current_date.strftime('%Y%m%d')}-{schedule.airline.iata_code}{schedule.flight_number}"
-
-                    # Check if flight already exists
-                    if incremental and DailyFlight.objects.filter(flight_id=flight_id).exists():
-                        skipped_count += 1
-                        continue
-
-                    # Build departure and arrival DateTimes
-                    stod = timezone.make_aware(datetime.combine(current_date, schedule.stod))
-                    stoa = timezone.make_aware(datetime.combine(current_date, schedule.stoa))
-
-                    # Handle flights that arrive next day
-                    if schedule.stoa < schedule.stod:
-                        stoa = timezone.make_aware(datetime.combine(current_date + timedelta(days=1), schedule.stoa))
-
-                    if dry_run:
-                        self.stdout.write(
-                            f"   [DRY RUN] Would create: {flight_id} - "
-                            f"{schedule.origin.iata_code}->{schedule.destination.iata_code} "
-                            f"STD {stod.strftime('%H:%M')}"
-                        )
-                        created_count += 1
-                    else:
-                        try:
-                            daily_flight, created = DailyFlight.objects.update_or_create(
-                                flight_id=flight_id,
-                                defaults={
-                                    "schedule": schedule,
-                                    "airline": schedule.airline,
-                                    "flight_number": schedule.flight_number,
-                                    "origin": schedule.origin,
-                                    "destination": schedule.destination,
-                                    "aircraft_type": schedule.aircraft_type,
-                                    "date_of_operation": current_date,
-                                    "status": "SCH",
-                                    "stod": stod,
-                                    "stoa": stoa,
-                                    "is_manually_modified": False,
-                                    "schedule_version": 1,
-                                    "last_propagated_at": timezone.now(),
-                                },
-                            )
-
-                            if created:
-                                created_count += 1
-                            else:
-                                # Update existing but only if not manually modified
-                                if not daily_flight.is_manually_modified:
-                                    skipped_count += 1
-                                else:
-                                    skipped_count += 1
-
-                            if created_count % 100 == 0:
-                                self.stdout.write(f"   ✓ Created {created_count} flights...")
-
-                        except Exception as e:
-                            error_count += 1
-                            if error_count <= 5:
-                                self.stdout.write(self.style.WARNING(f"   ⚠ Error creating {flight_id}: {str(e)}"))
-
-                current_date += timedelta(days=1)
+            # Expand schedules in memory, write in batches, commit per chunk of days
+            try:
+                result = generate_chunked(start_date, end_date, checkpoint=checkpoint, schedules=seasonal_flights, log=self.stdout.write, **generation_options)
+            except ChunkFailed as e:
+                raise CommandError(f"Generation stopped at {e}. Chunks before it are committed: rerun with --resume to continue") from e
+            # Like the watermarks, a run with failed flights is not complete
+            if not result.errors:
+                with transaction.atomic():
+                    advance_watermarks(seasonal_flights, start_date, end_date)
+                    checkpoint.finish()
 
         # Summary
         self.stdout.write("\n" + "=" * 60)
         if dry_run:
-            self.stdout.write(self.style.SUCCESS(f"✓ DRY RUN: Would create {created_count} daily flights"))
+            self.stdout.write(self.style.SUCCESS(f"✓ DRY RUN: Would create {result.created} daily flights"))
+            if result.updated > 0:
+                self.stdout.write(self.style.SUCCESS(f"✓ DRY RUN: Would update {result.updated} daily flights"))
         else:
-            self.stdout.write(self.style.SUCCESS(f"✓ Created {created_count} daily flights"))
-
-        if skipped_count > 0:
-            self.stdout.write(self.style.WARNING(f"⚠ Skipped {skipped_count} flights (already exist or manually modified)"))
-        if error_count > 0:
-            self.stdout.write(self.style.ERROR(f"✗ Failed {error_count} flights"))
+            self.stdout.write(self.style.SUCCESS(f"✓ Created {result.created} daily flights"))
+            if result.updated > 0:
+                self.stdout.write(self.style.SUCCESS(f"✓ Updated {result.updated} daily flights from schedule"))
+
+        if result.unchanged > 0:
+            self.stdout.write(f"   {result.unchanged} existing flights already match their schedule")
+        if result.skipped_existing > 0:
+            self.stdout.write(self.style.WARNING(f"⚠ Skipped {result.skipped_existing} flights (already exist)"))
+        if result.skipped_manual > 0:
+            self.stdout.write(self.style.WARNING(f"⚠ Skipped {result.skipped_manual} manually modified flights (preserved user changes)"))
+        if result.errors > 0:
+            self.stdout.write(self.style.ERROR(f"✗ Failed {result.errors} flights"))
+        for first, last, error in failures:
+            self.stdout.write(self.style.ERROR(f"✗ Partition {first} to {last} failed: {error}"))
+        if failures:
+            self.stdout.write(self.style.WARNING("   Chunks committed before each failure are kept: rerun with --resume to continue"))
         self.stdout.write("=" * 60 + "\n")
 
         # Statistics
@@ -0,0 +1,95 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from flight_ops.models import PendingPropagation, PropagationJob
+from flight_ops.propagation import QUEUE_BATCH_SIZE, PropagationResult, claim_job, process_queue, run_job
+
+
+class Command(BaseCommand):
+    help = "Propagate seasonal schedules queued by edits and soft-deletes, then run pending admin propagation jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=QUEUE_BATCH_SIZE,
+            help=f"Queued schedules per transaction (default: {QUEUE_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--buffer-hours",
+            type=int,
+            default=48,
+            help="Only propagate to flights more than X hours in future (default: 48)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll the queue instead of exiting once it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=30,
+            help="Seconds between polls of an empty queue with --loop (default: 30)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        buffer_hours = options["buffer_hours"]
+
+        self.stdout.write(self.style.WARNING(f"\n📬 Processing Propagation Queue"))
+        self.stdout.write(f"   Pending schedules: {PendingPropagation.objects.count()}")
+        self.stdout.write(f"   Pending jobs: {PropagationJob.objects.filter(status='PENDING').count()}")
+        self.stdout.write(f"   Buffer: {buffer_hours} hours, batch size: {batch_size}\n")
+
+        while True:
+            processed, result = self.drain(batch_size, buffer_hours)
+            if processed:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"✓ Propagated {processed} schedules: {result.updated} flights updated, "
+                        f"{result.cancelled} cancelled, {result.restored} restored"
+                    )
+                )
+                if result.skipped_manual:
+                    self.stdout.write(self.style.WARNING(f"⚠ Skipped {result.skipped_manual} manually modified flights (preserved user changes)"))
+
+            self.run_jobs()
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+    def drain(self, batch_size, buffer_hours):
+        """Process batches until the queue is empty, returns (schedules processed, PropagationResult)"""
+        total = PropagationResult()
+        processed = 0
+        while True:
+            now = timezone.now()
+            try:
+                count, result = process_queue(now.date(), now + timedelta(hours=buffer_hours), batch_size)
+            except Exception as e:
+                # The batch is rolled back and stays queued for the next poll
+                self.stdout.write(self.style.ERROR(f"✗ Error propagating batch: {str(e)}"))
+                break
+            if not count:
+                break
+            processed += count
+            total.merge(result)
+        return processed, total
+
+    def run_jobs(self):
+        """Run pending admin propagation jobs one after the other"""
+        while True:
+            job = claim_job()
+            if job is None:
+                return
+            try:
+                job = run_job(job)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"✗ Propagation job #{job.pk} failed: {str(e)}"))
+                continue
+            self.stdout.write(self.style.SUCCESS(f"✓ Propagation job #{job.pk}: {job.updated} of {job.total} flights updated"))
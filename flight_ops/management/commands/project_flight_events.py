@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from flight_ops.events import PROJECTION_BATCH_SIZE, project_batch
+
+
+class Command(BaseCommand):
+    help = "Apply recorded flight events (times and statuses) to the daily flights in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PROJECTION_BATCH_SIZE,
+            help=f"Events per transaction (default: {PROJECTION_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll the event log instead of exiting once it is projected",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=5,
+            help="Seconds between polls of a projected log with --loop (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        self.stdout.write(self.style.WARNING(f"\n🛬 Projecting Flight Events"))
+        self.stdout.write(f"   Batch size: {batch_size}\n")
+
+        while True:
+            events, updated = self.drain(batch_size)
+            if events:
+                self.stdout.write(self.style.SUCCESS(f"✓ Projected {events} events: {updated} flight updates"))
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+    def drain(self, batch_size):
+        """Project batches until the log is caught up, returns (events read, flights updated)"""
+        total_events = total_updated = 0
+        while True:
+            try:
+                events, updated = project_batch(batch_size)
+            except Exception as e:
+                # The batch is rolled back and projected again on the next poll
+                self.stdout.write(self.style.ERROR(f"✗ Error projecting batch: {str(e)}"))
+                break
+            if not events:
+                break
+            total_events += events
+            total_updated += updated
+        return total_events, total_updated
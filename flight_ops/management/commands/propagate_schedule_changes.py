@@ -5,7 +5,16 @@ from django.db import transaction
 from django.utils import timezone
 from schedules.models import SeasonalFlight
 
-from flight_ops.models import DailyFlight
+from flight_ops.models import CommandCheckpoint
+from flight_ops.propagation import PropagationResult, propagate_schedules, stale_schedule_ids
+
+
+def iter_chunks(items, chunk_size):
+    """Yield consecutive slices of `items` (0 = everything at once)"""
+    if chunk_size <= 0:
+        chunk_size = max(len(items), 1)
+    for index in range(0, len(items), chunk_size):
+        yield items[index : index + chunk_size]
 
 
 class Command(BaseCommand):
@@ -39,6 +48,17 @@ class Command(BaseCommand):
             action="store_true",
             help="Show what would be updated without actually updating",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Commit one transaction per N schedules, 0 = single transaction (default: 100)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted run with the same arguments after its last committed chunk",
+        )
 
     def handle(self, *args, **options):
         schedule_id = options["schedule_id"]
@@ -46,6 +66,8 @@ class Command(BaseCommand):
         from_date_str = options["from_date"]
         buffer_hours = options["buffer_hours"]
         dry_run = options["dry_run"]
+        chunk_size = options["chunk_size"]
+        resume = options["resume"]
 
         if not schedule_id and not propagate_all:
             self.stdout.write(self.style.ERROR("✗ Please specify --schedule-id or --all"))
@@ -75,98 +97,58 @@ class Command(BaseCommand):
         # Get seasonal flights to propagate
         if schedule_id:
             try:
-                seasonal_flights = [SeasonalFlight.objects.get(pk=schedule_id)]
+                seasonal_flights = [SeasonalFlight.objects.select_related("airline", "origin", "destination", "aircraft_type").get(pk=schedule_id)]
                 self.stdout.write(f"📋 Propagating single schedule: ID {schedule_id}")
             except SeasonalFlight.DoesNotExist:
                 self.stdout.write(self.style.ERROR(f"✗ SeasonalFlight with ID {schedule_id} not found!"))
                 return
         else:
-            seasonal_flights = SeasonalFlight.objects.filter(is_active=True, end_date__gte=from_date)
-            self.stdout.write(f"📋 Propagating {seasonal_flights.count()} active seasonal schedules")
-
-        updated_count = 0
-        skipped_manual_count = 0
-        skipped_buffer_count = 0
-        error_count = 0
-
-        with transaction.atomic():
-            for schedule in seasonal_flights:
-                # Find future daily flights linked to this schedule
-                daily_flights = DailyFlight.objects.filter(schedule=schedule, date_of_operation__gte=from_date, stod__gte=buffer_datetime).select_related(
-                    "airline", "origin", "destination"
-                )
-
-                self.stdout.write(
-                    f"\n   Processing: {schedule.airline.iata_code}{schedule.flight_number} "
-                    f"({schedule.origin.iata_code}->{schedule.destination.iata_code})"
-                )
-                self.stdout.write(f"   Found {daily_flights.count()} future flights")
-
-                for daily_flight in daily_flights:
-                    # Skip manually modified flights
-                    if daily_flight.is_manually_modified:
-                        skipped_manual_count += 1
-                        if not dry_run:
-                            self.stdout.write(f"      ⚠ SKIP {daily_flight.flight_id} on {daily_flight.date_of_operation} (manually modified)")
-                        continue
-
-                    # Calculate new times
-                    new_stod = timezone.make_aware(datetime.combine(daily_flight.date_of_operation, schedule.stod))
-                    new_stoa = timezone.make_aware(datetime.combine(daily_flight.date_of_operation, schedule.stoa))
-
-                    # Handle next-day arrivals
-                    if schedule.stoa < schedule.stod:
-                        new_stoa = timezone.make_aware(datetime.combine(daily_flight.date_of_operation + timedelta(days=1), schedule.stoa))
-
-                    # Check what would change
-                    changes = []
-                    if daily_flight.stod != new_stod:
-                        changes.append(f"STD {daily_flight.stod.strftime('%H:%M')} → {new_stod.strftime('%H:%M')}")
-                    if daily_flight.stoa != new_stoa:
-                        changes.append(f"STA {daily_flight.stoa.strftime('%H:%M')} → {new_stoa.strftime('%H:%M')}")
-                    if daily_flight.aircraft_type != schedule.aircraft_type:
-                        changes.append(f"Aircraft {daily_flight.aircraft_type.icao_code} → {schedule.aircraft_type.icao_code}")
-
-                    if not changes:
-                        continue  # Nothing to update
-
-                    if dry_run:
-                        self.stdout.write(
-                            f"      [DRY RUN] Would update {daily_flight.flight_id} on {daily_flight.date_of_operation}: {', '.join(changes)}"
-                        )
-                        updated_count += 1
-                    else:
-                        try:
-                            # Update the daily flight
-                            daily_flight.stod = new_stod
-                            daily_flight.stoa = new_stoa
-                            daily_flight.aircraft_type = schedule.aircraft_type
-                            daily_flight.airline = schedule.airline
-                            daily_flight.origin = schedule.origin
-                            daily_flight.destination = schedule.destination
-                            daily_flight.flight_number = schedule.flight_number
-                            daily_flight.last_propagated_at = timezone.now()
-                            daily_flight.schedule_version += 1
-                            daily_flight.save()
-
-                            updated_count += 1
-                            self.stdout.write(f"      ✓ Updated {daily_flight.flight_id} on {daily_flight.date_of_operation}: {', '.join(changes)}")
-
-                        except Exception as e:
-                            error_count += 1
-                            self.stdout.write(self.style.ERROR(f"      ✗ Error updating {daily_flight.flight_id}: {str(e)}"))
+            # Only schedules whose revision is ahead of some of their future flights
+            stale_ids = stale_schedule_ids(from_date, buffer_datetime)
+            seasonal_flights = list(
+                SeasonalFlight.objects.filter(pk__in=stale_ids).select_related("airline", "origin", "destination", "aircraft_type").order_by("pk")
+            )
+            self.stdout.write(f"📋 Propagating {len(seasonal_flights)} changed seasonal schedules")
+
+        # Progress is checkpointed per committed chunk of schedules (in primary key order)
+        checkpoint = None
+        if not dry_run:
+            run_key = f"{schedule_id or 'all'}:{from_date}:{buffer_hours}"
+            checkpoint = CommandCheckpoint.open("propagate_schedule_changes", run_key, resume=resume)
+            if checkpoint.position:
+                seasonal_flights = [schedule for schedule in seasonal_flights if schedule.pk > int(checkpoint.position)]
+                self.stdout.write(self.style.WARNING(f"↻ Resuming after schedule ID {checkpoint.position} ({len(seasonal_flights)} left)"))
+
+        # One set-based UPDATE per chunk of schedules
+        result = PropagationResult()
+        for chunk in iter_chunks(seasonal_flights, chunk_size):
+            with transaction.atomic():
+                chunk_result = propagate_schedules([schedule.pk for schedule in chunk], from_date, buffer_datetime, dry_run=dry_run)
+
+                # Commit the chunk together with its progress
+                if checkpoint is not None:
+                    checkpoint.advance(chunk[-1].pk)
+
+            result.merge(chunk_result)
+            for schedule in chunk:
+                count = chunk_result.by_schedule.get(schedule.pk)
+                if count:
+                    prefix = "[DRY RUN] Would update" if dry_run else "✓ Updated"
+                    self.stdout.write(
+                        f"   {prefix} {count} flights of {schedule.airline.iata_code}{schedule.flight_number} "
+                        f"({schedule.origin.iata_code}->{schedule.destination.iata_code})"
+                    )
+
+        if checkpoint is not None:
+            checkpoint.finish()
 
         # Summary
         self.stdout.write("\n" + "=" * 60)
         if dry_run:
-            self.stdout.write(self.style.SUCCESS(f"✓ DRY RUN: Would update {updated_count} daily flights"))
+            self.stdout.write(self.style.SUCCESS(f"✓ DRY RUN: Would update {result.updated} daily flights"))
         else:
-            self.stdout.write(self.style.SUCCESS(f"✓ Updated {updated_count} daily flights"))
-
-        if skipped_manual_count > 0:
-            self.stdout.write(self.style.WARNING(f"⚠ Skipped {skipped_manual_count} manually modified flights (preserved user changes)"))
-        if skipped_buffer_count > 0:
-            self.stdout.write(self.style.WARNING(f"⚠ Skipped {skipped_buffer_count} flights (within {buffer_hours}h buffer)"))
-        if error_count > 0:
-            self.stdout.write(self.style.ERROR(f"✗ Failed {error_count} updates"))
+            self.stdout.write(self.style.SUCCESS(f"✓ Updated {result.updated} daily flights"))
+
+        if result.skipped_manual > 0:
+            self.stdout.write(self.style.WARNING(f"⚠ Skipped {result.skipped_manual} manually modified flights (preserved user changes)"))
         self.stdout.write("=" * 60 + "\n")
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0003_dailyflight_is_manually_modified_and_more'),
+        ('schedules', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('generated_through', models.DateField(help_text='DailyFlights exist for every operating day up to this date')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('schedule', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='generation_watermark', to='schedules.seasonalflight')),
+            ],
+            options={
+                'verbose_name': 'Generation Watermark',
+                'verbose_name_plural': 'Generation Watermarks',
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0004_generationwatermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommandCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('command', models.CharField(help_text='Management command name', max_length=50)),
+                ('run_key', models.CharField(help_text='Arguments identifying the run (e.g. window and mode)', max_length=200)),
+                ('position', models.CharField(blank=True, help_text='Last committed chunk (date or schedule ID)', max_length=50)),
+                ('is_complete', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Command Checkpoint',
+                'verbose_name_plural': 'Command Checkpoints',
+                'unique_together': {('command', 'run_key')},
+            },
+        ),
+    ]
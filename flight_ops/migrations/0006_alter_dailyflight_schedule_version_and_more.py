@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0005_commandcheckpoint'),
+        ('masterdata', '0006_groundhandler_airline_ground_handler'),
+        ('schedules', '0002_seasonalflight_revision'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailyflight',
+            name='schedule_version',
+            field=models.IntegerField(default=1, help_text='SeasonalFlight.revision this flight was generated or last propagated from'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyflight',
+            index=models.Index(fields=['schedule', 'schedule_version'], name='flight_ops__schedul_9c7338_idx'),
+        ),
+        # Old schedule_version values were per-flight counters, not schedule revisions:
+        # mark auto-propagatable flights stale so the next propagation run realigns them once
+        migrations.RunSQL(
+            "UPDATE flight_ops_dailyflight SET schedule_version = 0 WHERE schedule_id IS NOT NULL AND NOT is_manually_modified",
+            migrations.RunSQL.noop,
+        ),
+    ]
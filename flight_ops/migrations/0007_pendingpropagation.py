@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0006_alter_dailyflight_schedule_version_and_more'),
+        ('schedules', '0002_seasonalflight_revision'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingPropagation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('enqueued_at', models.DateTimeField(help_text='Last time the schedule was edited')),
+                ('schedule', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='pending_propagation', to='schedules.seasonalflight')),
+            ],
+            options={
+                'verbose_name': 'Pending Propagation',
+                'verbose_name_plural': 'Pending Propagations',
+                'ordering': ['enqueued_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0008_propagationjob'),
+        ('masterdata', '0006_groundhandler_airline_ground_handler'),
+        ('schedules', '0002_seasonalflight_revision'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailyflight',
+            index=models.Index(fields=['date_of_operation', 'stod', 'airline', 'flight_number'], name='flight_ops__date_of_fc4038_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:52
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0009_dailyflight_flight_ops__date_of_fc4038_idx'),
+        ('masterdata', '0007_trigram_search_indexes'),
+        ('schedules', '0003_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailyflight',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('flight_number'), name='gin_trgm_ops'), name='dailyflight_number_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyflight',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('flight_id'), name='gin_trgm_ops'), name='dailyflight_id_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyflight',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('registration'), name='gin_trgm_ops'), name='dailyflight_reg_trgm'),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:54
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+# change_txid: last transaction that wrote the row, for commit-ordered live-update polls.
+# Not a model field: set by the default on insert and by the trigger on every update.
+# Added without a default first, so the table is not rewritten: rows written before
+# this migration keep NULL, which no poll asks for.
+ADD_CHANGE_TXID = """
+ALTER TABLE flight_ops_dailyflight ADD COLUMN change_txid xid8;
+ALTER TABLE flight_ops_dailyflight ALTER COLUMN change_txid SET DEFAULT pg_current_xact_id();
+
+CREATE FUNCTION flight_ops_dailyflight_change_txid() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.change_txid := pg_current_xact_id();
+    RETURN NEW;
+END
+$$;
+
+CREATE TRIGGER dailyflight_change_txid BEFORE UPDATE ON flight_ops_dailyflight
+    FOR EACH ROW EXECUTE FUNCTION flight_ops_dailyflight_change_txid();
+
+CREATE INDEX dailyflight_change_txid_idx ON flight_ops_dailyflight (date_of_operation, change_txid);
+"""
+
+DROP_CHANGE_TXID = """
+DROP TRIGGER dailyflight_change_txid ON flight_ops_dailyflight;
+DROP FUNCTION flight_ops_dailyflight_change_txid();
+ALTER TABLE flight_ops_dailyflight DROP COLUMN change_txid;
+"""
+
+# Removal markers of deleted flights, polled like the changed rows. Markers older
+# than a day are pruned on the next delete.
+ADD_REMOVAL_MARKERS = """
+ALTER TABLE flight_ops_removeddailyflight ADD COLUMN change_txid xid8 NOT NULL DEFAULT pg_current_xact_id();
+CREATE INDEX removeddailyflight_change_txid_idx ON flight_ops_removeddailyflight (date_of_operation, change_txid);
+
+CREATE FUNCTION flight_ops_dailyflight_removed() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO flight_ops_removeddailyflight (daily_flight_id, date_of_operation)
+    SELECT id, date_of_operation FROM old_rows
+    ON CONFLICT (daily_flight_id) DO NOTHING;
+    DELETE FROM flight_ops_removeddailyflight WHERE removed_at < now() - interval '1 day';
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER dailyflight_removed AFTER DELETE ON flight_ops_dailyflight
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION flight_ops_dailyflight_removed();
+"""
+
+DROP_REMOVAL_MARKERS = """
+DROP TRIGGER dailyflight_removed ON flight_ops_dailyflight;
+DROP FUNCTION flight_ops_dailyflight_removed();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0010_trigram_search_indexes'),
+        ('masterdata', '0007_trigram_search_indexes'),
+        ('schedules', '0003_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RemovedDailyFlight',
+            fields=[
+                ('daily_flight_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date_of_operation', models.DateField()),
+                ('removed_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now())),
+            ],
+            options={
+                'verbose_name': 'Removed Daily Flight',
+                'verbose_name_plural': 'Removed Daily Flights',
+                'indexes': [models.Index(fields=['removed_at'], name='flight_ops__removed_7bccbe_idx')],
+            },
+        ),
+        migrations.RunSQL(ADD_CHANGE_TXID, DROP_CHANGE_TXID),
+        migrations.RunSQL(ADD_REMOVAL_MARKERS, DROP_REMOVAL_MARKERS),
+    ]
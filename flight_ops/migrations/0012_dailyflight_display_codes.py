@@ -0,0 +1,81 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0011_dailyflight_change_txid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyflight',
+            name='aircraft_type_code',
+            field=models.CharField(blank=True, editable=False, max_length=4),
+        ),
+        migrations.AddField(
+            model_name='dailyflight',
+            name='airline_code',
+            field=models.CharField(blank=True, editable=False, max_length=2),
+        ),
+        migrations.AddField(
+            model_name='dailyflight',
+            name='carousel_code',
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='dailyflight',
+            name='checkin_codes',
+            field=models.CharField(blank=True, editable=False, help_text='Check-in counter codes, comma separated', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='dailyflight',
+            name='destination_code',
+            field=models.CharField(blank=True, editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='dailyflight',
+            name='gate_code',
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='dailyflight',
+            name='origin_code',
+            field=models.CharField(blank=True, editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='dailyflight',
+            name='stand_code',
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE flight_ops_dailyflight df SET
+                airline_code = al.iata_code,
+                origin_code = o.iata_code,
+                destination_code = d.iata_code,
+                aircraft_type_code = at.icao_code,
+                gate_code = COALESCE(g.code, ''),
+                stand_code = COALESCE(st.code, ''),
+                carousel_code = COALESCE(c.code, ''),
+                checkin_codes = COALESCE((
+                    SELECT string_agg(cc.code, ',' ORDER BY cc.code)
+                    FROM flight_ops_dailyflight_checkin_counters t
+                    JOIN masterdata_checkincounter cc ON cc.id = t.checkincounter_id
+                    WHERE t.dailyflight_id = df.id
+                ), '')
+            FROM flight_ops_dailyflight f
+            JOIN masterdata_airline al ON al.id = f.airline_id
+            JOIN masterdata_airport o ON o.id = f.origin_id
+            JOIN masterdata_airport d ON d.id = f.destination_id
+            JOIN masterdata_aircrafttype at ON at.id = f.aircraft_type_id
+            LEFT JOIN masterdata_gate g ON g.id = f.gate_id
+            LEFT JOIN masterdata_stand st ON st.id = f.stand_id
+            LEFT JOIN masterdata_baggagecarousel c ON c.id = f.carousel_id
+            WHERE f.id = df.id
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:59
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+
+def backfill_direction(apps, schema_editor):
+    DailyFlight = apps.get_model("flight_ops", "DailyFlight")
+    DailyFlight.objects.update(
+        direction=Case(
+            When(destination_code=settings.HOME_AIRPORT_IATA, then=Value("ARR")),
+            When(origin_code=settings.HOME_AIRPORT_IATA, then=Value("DEP")),
+            default=Value("OTH"),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0012_dailyflight_display_codes'),
+        ('masterdata', '0007_trigram_search_indexes'),
+        ('schedules', '0003_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyflight',
+            name='direction',
+            field=models.CharField(choices=[('ARR', 'Arrival'), ('DEP', 'Departure'), ('OTH', 'Other')], default='OTH', editable=False, help_text='Movement direction at the home airport', max_length=3),
+        ),
+        migrations.RunPython(backfill_direction, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='dailyflight',
+            index=models.Index(condition=models.Q(('direction', 'ARR')), fields=['stoa'], name='dailyflight_arr_stoa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyflight',
+            index=models.Index(condition=models.Q(('direction', 'DEP')), fields=['stod'], name='dailyflight_dep_stod_idx'),
+        ),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:06
+
+from django.db import migrations, models
+
+# (entity_type, column) references counted per DailyFlight row
+REFERENCES = [
+    ("airline", "airline_id"),
+    ("airport", "origin_id"),
+    ("airport", "destination_id"),
+    ("aircraft_type", "aircraft_type_id"),
+]
+
+
+def _refs(table, sign):
+    return " UNION ALL ".join(f"SELECT '{entity}' AS t, {column} AS id, {sign} AS d FROM {table}" for entity, column in REFERENCES)
+
+
+def _apply(refs, changed=""):
+    """
+    Statement adding the summed reference deltas to flight_ops_entityusage: one upsert
+    taking the row locks in (entity_type, entity_id) order, so concurrent writers of
+    the same entities queue instead of deadlocking. Rows down to zero are kept.
+    """
+    return f"""
+        WITH {changed} delta AS (
+            SELECT t, id, SUM(d) AS d FROM ({refs}) refs GROUP BY t, id HAVING SUM(d) <> 0
+        )
+        INSERT INTO flight_ops_entityusage (entity_type, entity_id, ref_count)
+        SELECT t, id, GREATEST(d, 0) FROM delta ORDER BY t, id
+        ON CONFLICT (entity_type, entity_id) DO UPDATE SET ref_count = GREATEST(
+            flight_ops_entityusage.ref_count
+            + (SELECT delta.d FROM delta WHERE delta.t = EXCLUDED.entity_type AND delta.id = EXCLUDED.entity_id),
+            0
+        );
+    """
+
+
+# Updates only count rows whose references changed (most updates are times and statuses)
+_CHANGED = f"""
+    changed AS (
+        SELECT {", ".join(f"n.{column} AS new_{column}, o.{column} AS old_{column}" for _, column in REFERENCES)}
+        FROM new_rows n JOIN old_rows o USING (id)
+        WHERE ({", ".join(f"n.{column}" for _, column in REFERENCES)}) IS DISTINCT FROM ({", ".join(f"o.{column}" for _, column in REFERENCES)})
+    ),
+"""
+_CHANGED_REFS = " UNION ALL ".join(
+    f"SELECT '{entity}' AS t, {prefix}_{column} AS id, {sign} AS d FROM changed" for prefix, sign in (("new", 1), ("old", -1)) for entity, column in REFERENCES
+)
+
+CREATE_TRIGGERS = f"""
+CREATE FUNCTION flight_ops_entityusage_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM flight_ops_entityusage;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        {_apply(_refs("new_rows", 1))}
+    ELSIF TG_OP = 'UPDATE' THEN
+        {_apply(_CHANGED_REFS, _CHANGED)}
+    ELSE
+        {_apply(_refs("old_rows", -1))}
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER dailyflight_usage_insert AFTER INSERT ON flight_ops_dailyflight
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION flight_ops_entityusage_sync();
+CREATE TRIGGER dailyflight_usage_update AFTER UPDATE ON flight_ops_dailyflight
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION flight_ops_entityusage_sync();
+CREATE TRIGGER dailyflight_usage_delete AFTER DELETE ON flight_ops_dailyflight
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION flight_ops_entityusage_sync();
+CREATE TRIGGER dailyflight_usage_truncate AFTER TRUNCATE ON flight_ops_dailyflight
+    FOR EACH STATEMENT EXECUTE FUNCTION flight_ops_entityusage_sync();
+
+INSERT INTO flight_ops_entityusage (entity_type, entity_id, ref_count)
+SELECT t, id, COUNT(*) FROM ({_refs("flight_ops_dailyflight", 1)}) refs GROUP BY t, id;
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER dailyflight_usage_insert ON flight_ops_dailyflight;
+DROP TRIGGER dailyflight_usage_update ON flight_ops_dailyflight;
+DROP TRIGGER dailyflight_usage_delete ON flight_ops_dailyflight;
+DROP TRIGGER dailyflight_usage_truncate ON flight_ops_dailyflight;
+DROP FUNCTION flight_ops_entityusage_sync();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0013_dailyflight_direction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntityUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('airline', 'Airline'), ('airport', 'Airport'), ('aircraft_type', 'Aircraft Type')], max_length=20)),
+                ('entity_id', models.BigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='DailyFlights referencing the entity')),
+            ],
+            options={
+                'verbose_name': 'Entity Usage',
+                'verbose_name_plural': 'Entity Usage',
+                'unique_together': {('entity_type', 'entity_id')},
+            },
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:14
+
+import django.utils.timezone
+from django.db import migrations, models
+
+CREATE_EVENTS = """
+CREATE TABLE flight_ops_flightevent (
+    id bigint GENERATED BY DEFAULT AS IDENTITY,
+    flight_id bigint NOT NULL,
+    milestone varchar(6) NOT NULL,
+    time_value timestamptz NULL,
+    status_value varchar(3) NOT NULL DEFAULT '',
+    source varchar(30) NOT NULL DEFAULT '',
+    event_time timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, event_time)
+);
+CREATE INDEX flightevent_flight_idx ON flight_ops_flightevent (flight_id, milestone, event_time DESC, id DESC);
+"""
+
+# Every inserted event waits in the outbox (PendingFlightEvent) until projected
+CREATE_OUTBOX = """
+CREATE FUNCTION flight_ops_flightevent_pending() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO flight_ops_pendingflightevent (event_id, flight_id, milestone) VALUES (NEW.id, NEW.flight_id, NEW.milestone);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER flightevent_pending AFTER INSERT ON flight_ops_flightevent
+    FOR EACH ROW EXECUTE FUNCTION flight_ops_flightevent_pending();
+"""
+
+DROP_OUTBOX = """
+DROP TRIGGER flightevent_pending ON flight_ops_flightevent;
+DROP FUNCTION flight_ops_flightevent_pending();
+"""
+
+# Chunks older than a week are compressed per flight, newest events first
+CREATE_HYPERTABLE = """
+SELECT create_hypertable('flight_ops_flightevent', 'event_time', chunk_time_interval => INTERVAL '7 days');
+ALTER TABLE flight_ops_flightevent SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'flight_id',
+    timescaledb.compress_orderby = 'milestone, event_time DESC, id DESC'
+);
+SELECT add_compression_policy('flight_ops_flightevent', INTERVAL '7 days');
+"""
+
+
+def has_timescaledb(schema_editor):
+    """TimescaleDB can be enabled: installed and preloaded by the server"""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb') "
+            "AND current_setting('shared_preload_libraries') LIKE '%timescaledb%'"
+        )
+        return cursor.fetchone()[0]
+
+
+def create_hypertable(apps, schema_editor):
+    if has_timescaledb(schema_editor):
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+        schema_editor.execute(CREATE_HYPERTABLE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0014_entityusage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlightEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('milestone', models.CharField(choices=[('etod', 'Estimated Time of Departure'), ('aobt', 'Actual Off-Block Time'), ('atod', 'Actual Time of Departure'), ('etoa', 'Estimated Time of Arrival'), ('atoa', 'Actual Time of Arrival'), ('aibt', 'Actual In-Block Time'), ('status', 'Status')], max_length=6)),
+                ('time_value', models.DateTimeField(blank=True, help_text='New milestone time (None clears it)', null=True)),
+                ('status_value', models.CharField(blank=True, choices=[('SCH', 'Scheduled'), ('OFB', 'Off Block'), ('AIR', 'Airborne'), ('LND', 'Landed'), ('ONB', 'On Block'), ('FIB', 'First Bag'), ('LSB', 'Last Bag'), ('CXX', 'Cancelled'), ('DIV', 'Diverted')], help_text='New status', max_length=3)),
+                ('source', models.CharField(blank=True, help_text='Reporting system or user', max_length=30)),
+                ('event_time', models.DateTimeField(default=django.utils.timezone.now, help_text='When the milestone was reported')),
+            ],
+            options={
+                'verbose_name': 'Flight Event',
+                'verbose_name_plural': 'Flight Events',
+                'db_table': 'flight_ops_flightevent',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PendingFlightEvent',
+            fields=[
+                ('event_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('flight_id', models.BigIntegerField()),
+                ('milestone', models.CharField(choices=[('etod', 'Estimated Time of Departure'), ('aobt', 'Actual Off-Block Time'), ('atod', 'Actual Time of Departure'), ('etoa', 'Estimated Time of Arrival'), ('atoa', 'Actual Time of Arrival'), ('aibt', 'Actual In-Block Time'), ('status', 'Status')], max_length=6)),
+            ],
+            options={
+                'verbose_name': 'Pending Flight Event',
+                'verbose_name_plural': 'Pending Flight Events',
+            },
+        ),
+        migrations.RunSQL(CREATE_EVENTS, "DROP TABLE flight_ops_flightevent;"),
+        migrations.RunSQL(CREATE_OUTBOX, DROP_OUTBOX),
+        migrations.RunPython(create_hypertable, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:26
+
+from django.db import migrations, models
+
+# Flights already cancelled by the soft-delete of a still inactive schedule
+MARK_CANCELLED = """
+    UPDATE flight_ops_dailyflight df SET cancelled_by_schedule = true
+    FROM schedules_seasonalflight sf
+    WHERE df.schedule_id = sf.id AND NOT sf.is_active AND df.status = 'CXX' AND NOT df.is_manually_modified
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flight_ops', '0015_flightevent'),
+        ('schedules', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyflight',
+            name='cancelled_by_schedule',
+            field=models.BooleanField(default=False, editable=False, help_text='Cancelled by the soft-delete of its schedule (restored to SCH when the schedule is reactivated)'),
+        ),
+        migrations.RunSQL(MARK_CANCELLED, migrations.RunSQL.noop),
+    ]
@@ -1,4 +1,72 @@
-from django.db import models
+from django.conf import settings
+from django.db import connection, models
+from django.db.models import BooleanField, Case, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Now
+from django.utils import timezone
+
+from core_app.search import trigram_index
+from masterdata import registry
+
+# Denormalized display codes on DailyFlight: column -> (foreign key, code field of the related model)
+DISPLAY_CODES = {
+    "airline_code": ("airline", "iata_code"),
+    "origin_code": ("origin", "iata_code"),
+    "destination_code": ("destination", "iata_code"),
+    "aircraft_type_code": ("aircraft_type", "icao_code"),
+    "gate_code": ("gate", "code"),
+    "stand_code": ("stand", "code"),
+    "carousel_code": ("carousel", "code"),
+}
+
+
+def movement_direction(origin_code, destination_code):
+    """Direction of a flight at the home airport (settings.HOME_AIRPORT_IATA): ARR, DEP or OTH"""
+    if destination_code == settings.HOME_AIRPORT_IATA:
+        return "ARR"
+    if origin_code == settings.HOME_AIRPORT_IATA:
+        return "DEP"
+    return "OTH"
+
+
+def movement_direction_expression():
+    """movement_direction() as an SQL expression over the origin/destination codes, for set-based updates"""
+    return Case(
+        When(destination_code=settings.HOME_AIRPORT_IATA, then=Value("ARR")),
+        When(origin_code=settings.HOME_AIRPORT_IATA, then=Value("DEP")),
+        default=Value("OTH"),
+    )
+
+
+def change_position():
+    """
+    Current position in the commit order of DailyFlight writes: the oldest running
+    transaction (pg_snapshot_xmin). Every write not yet committed now carries a
+    change_txid at or after it, see DailyFlightQuerySet.changed_since().
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text")
+        return cursor.fetchone()[0]
+
+
+class ChangeQuerySet(models.QuerySet):
+    def changed_since(self, position):
+        """
+        Rows written by transactions that had not committed at `position` (a
+        change_position() value), whenever they commit. Rows committed shortly
+        before `position` may be returned again.
+        """
+        return self.filter(RawSQL(f"{self.model._meta.db_table}.change_txid >= %s::xid8", [position], output_field=BooleanField()))
+
+
+class DailyFlightQuerySet(ChangeQuerySet):
+    def arrivals(self, start, end):
+        """Arrivals at the home airport scheduled in [start, end), by stoa (partial index)"""
+        return self.filter(direction="ARR", stoa__gte=start, stoa__lt=end).order_by("stoa")
+
+    def departures(self, start, end):
+        """Departures from the home airport scheduled in [start, end), by stod (partial index)"""
+        return self.filter(direction="DEP", stod__gte=start, stod__lt=end).order_by("stod")
 
 
 class DailyFlight(models.Model):
@@ -19,6 +87,12 @@ class DailyFlight(models.Model):
         ("DIV", "Diverted"),
     ]
 
+    DIRECTION_CHOICES = [
+        ("ARR", "Arrival"),
+        ("DEP", "Departure"),
+        ("OTH", "Other"),
+    ]
+
     # Link back to the Master Schedule
     schedule = models.ForeignKey(
         "schedules.SeasonalFlight", on_delete=models.SET_NULL, null=True, blank=True, help_text="Source seasonal flight (if applicable)"
@@ -26,8 +100,11 @@ class DailyFlight(models.Model):
 
     # Rolling Window Strategy fields
     is_manually_modified = models.BooleanField(default=False, help_text="True if this flight has been manually edited (prevents auto-propagation)")
-    schedule_version = models.IntegerField(default=1, help_text="Version of the seasonal schedule used to generate this flight")
+    schedule_version = models.IntegerField(default=1, help_text="SeasonalFlight.revision this flight was generated or last propagated from")
     last_propagated_at = models.DateTimeField(null=True, blank=True, help_text="Last time this flight was updated from seasonal schedule")
+    cancelled_by_schedule = models.BooleanField(
+        default=False, editable=False, help_text="Cancelled by the soft-delete of its schedule (restored to SCH when the schedule is reactivated)"
+    )
 
     # Basic Flight Info
     airline = models.ForeignKey("masterdata.Airline", on_delete=models.CASCADE)
@@ -36,6 +113,10 @@ class DailyFlight(models.Model):
     destination = models.ForeignKey("masterdata.Airport", related_name="daily_arrivals", on_delete=models.CASCADE)
     aircraft_type = models.ForeignKey("masterdata.AircraftType", on_delete=models.CASCADE)
 
+    direction = models.CharField(
+        max_length=3, choices=DIRECTION_CHOICES, default="OTH", editable=False, help_text="Movement direction at the home airport"
+    )
+
     date_of_operation = models.DateField(help_text="Date of flight operation")
     flight_id = models.CharField(max_length=20, unique=True, help_text="Unique flight identifier (e.g., YYYYMMDD-XX123)")
 
@@ -69,10 +150,22 @@ class DailyFlight(models.Model):
     # Real-time tracking
     qr_code_data = models.TextField(blank=True, help_text="QR code data for mobile boarding")
 
+    # Denormalized display codes (maintained on save and by masterdata signals, see DISPLAY_CODES)
+    airline_code = models.CharField(max_length=2, blank=True, editable=False)
+    origin_code = models.CharField(max_length=3, blank=True, editable=False)
+    destination_code = models.CharField(max_length=3, blank=True, editable=False)
+    aircraft_type_code = models.CharField(max_length=4, blank=True, editable=False)
+    gate_code = models.CharField(max_length=10, blank=True, editable=False)
+    stand_code = models.CharField(max_length=10, blank=True, editable=False)
+    carousel_code = models.CharField(max_length=10, blank=True, editable=False)
+    checkin_codes = models.CharField(max_length=200, blank=True, editable=False, help_text="Check-in counter codes, comma separated")
+
     # Audit fields
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = DailyFlightQuerySet.as_manager()
+
     class Meta:
         ordering = ["date_of_operation", "stod", "airline", "flight_number"]
         verbose_name = "Daily Flight"
@@ -80,7 +173,281 @@ class DailyFlight(models.Model):
         indexes = [
             models.Index(fields=["date_of_operation", "airline"]),
             models.Index(fields=["status"]),
+            models.Index(fields=["schedule", "schedule_version"]),
+            # Keyset pagination of the daily flight board
+            models.Index(fields=["date_of_operation", "stod", "airline", "flight_number"]),
+            # Search box (core_app.search)
+            trigram_index("flight_number", "dailyflight_number_trgm"),
+            trigram_index("flight_id", "dailyflight_id_trgm"),
+            trigram_index("registration", "dailyflight_reg_trgm"),
+            # Arrival and departure boards, movement counts (DailyFlightQuerySet)
+            models.Index(fields=["stoa"], condition=Q(direction="ARR"), name="dailyflight_arr_stoa_idx"),
+            models.Index(fields=["stod"], condition=Q(direction="DEP"), name="dailyflight_dep_stod_idx"),
         ]
 
     def __str__(self):
-        return f"{self.airline.iata_code}{self.flight_number} on {self.date_of_operation} ({self.origin.iata_code}-{self.destination.iata_code})"
+        return f"{self.airline_code}{self.flight_number} on {self.date_of_operation} ({self.origin_code}-{self.destination_code})"
+
+    def save(self, *args, **kwargs):
+        self.refresh_display_codes()
+        self.direction = movement_direction(self.origin_code, self.destination_code)
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], *DISPLAY_CODES, "direction"}
+        super().save(*args, **kwargs)
+
+    def refresh_display_codes(self):
+        """Copy the codes of the related masterdata from related objects already loaded or the masterdata registry"""
+        for column, (relation, code_field) in DISPLAY_CODES.items():
+            field = self._meta.get_field(relation)
+            related_id = getattr(self, field.attname)
+            if related_id is None:
+                code = ""
+            elif field.is_cached(self):
+                code = getattr(getattr(self, relation), code_field)
+            elif (summary := registry.summary(field.related_model, related_id)) is not None:
+                code = getattr(summary, code_field)
+            else:
+                # Not in the registry yet (created in the current transaction)
+                code = field.related_model.objects.filter(pk=related_id).values_list(code_field, flat=True).first()
+            setattr(self, column, code or "")
+
+
+class RemovedDailyFlight(models.Model):
+    """
+    Removal marker of a deleted DailyFlight, so live-update polls drop it from open
+    boards. Written by a trigger on flight_ops_dailyflight (migration 0011) with the
+    change_txid of the deleting transaction; markers older than a day are pruned by
+    the same trigger.
+    """
+
+    daily_flight_id = models.BigIntegerField(primary_key=True)
+    date_of_operation = models.DateField()
+    removed_at = models.DateTimeField(db_default=Now())
+
+    objects = ChangeQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Removed Daily Flight"
+        verbose_name_plural = "Removed Daily Flights"
+        indexes = [models.Index(fields=["removed_at"])]
+
+    def __str__(self):
+        return f"Flight {self.daily_flight_id} on {self.date_of_operation} removed at {self.removed_at}"
+
+
+class GenerationWatermark(models.Model):
+    """
+    Last date through which a seasonal schedule has been expanded into DailyFlights.
+    Incremental generation only expands dates after the watermark; editing the
+    SeasonalFlight resets it.
+    """
+
+    schedule = models.OneToOneField("schedules.SeasonalFlight", on_delete=models.CASCADE, related_name="generation_watermark")
+    generated_through = models.DateField(help_text="DailyFlights exist for every operating day up to this date")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Generation Watermark"
+        verbose_name_plural = "Generation Watermarks"
+
+    def __str__(self):
+        return f"Schedule {self.schedule_id} generated through {self.generated_through}"
+
+
+class CommandCheckpoint(models.Model):
+    """
+    Progress of a chunked, long-running management command.
+    Each committed chunk advances `position` in the same transaction, so `--resume`
+    continues exactly after the last committed chunk of a crashed run.
+    """
+
+    command = models.CharField(max_length=50, help_text="Management command name")
+    run_key = models.CharField(max_length=200, help_text="Arguments identifying the run (e.g. window and mode)")
+    position = models.CharField(max_length=50, blank=True, help_text="Last committed chunk (date or schedule ID)")
+    is_complete = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("command", "run_key")
+        verbose_name = "Command Checkpoint"
+        verbose_name_plural = "Command Checkpoints"
+
+    def __str__(self):
+        return f"{self.command} [{self.run_key}] at {self.position or 'start'}"
+
+    @classmethod
+    def open(cls, command, run_key, resume=False):
+        """Checkpoint for a run; starts over unless resuming an incomplete run"""
+        checkpoint, created = cls.objects.get_or_create(command=command, run_key=run_key)
+        if not created and (not resume or checkpoint.is_complete):
+            checkpoint.position = ""
+            checkpoint.is_complete = False
+            checkpoint.save(update_fields=["position", "is_complete", "updated_at"])
+        return checkpoint
+
+    def advance(self, position):
+        self.position = str(position)
+        self.save(update_fields=["position", "updated_at"])
+
+    def finish(self):
+        self.is_complete = True
+        self.save(update_fields=["is_complete", "updated_at"])
+
+
+class PendingPropagation(models.Model):
+    """
+    Durable queue of SeasonalFlights edited since their last propagation.
+    One row per schedule: repeated edits only refresh `enqueued_at`, the
+    process_propagation_queue worker drains the rows in batches.
+    """
+
+    schedule = models.OneToOneField("schedules.SeasonalFlight", on_delete=models.CASCADE, related_name="pending_propagation")
+    enqueued_at = models.DateTimeField(help_text="Last time the schedule was edited")
+
+    class Meta:
+        ordering = ["enqueued_at"]
+        verbose_name = "Pending Propagation"
+        verbose_name_plural = "Pending Propagations"
+
+    def __str__(self):
+        return f"Schedule {self.schedule_id} enqueued at {self.enqueued_at}"
+
+    @classmethod
+    def enqueue(cls, schedule_ids):
+        """Add schedules to the queue, coalescing with entries already waiting"""
+        now = timezone.now()
+        cls.objects.bulk_create(
+            [cls(schedule_id=schedule_id, enqueued_at=now) for schedule_id in schedule_ids],
+            update_conflicts=True,
+            unique_fields=["schedule"],
+            update_fields=["enqueued_at"],
+        )
+
+
+class PropagationJob(models.Model):
+    """
+    Background "propagate from schedule" run over a large admin selection of DailyFlights.
+    Processed in committed batches by the process_propagation_queue worker;
+    `processed` is the resume offset into `flight_ids`.
+    """
+
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("DONE", "Done"),
+        ("FAILED", "Failed"),
+    ]
+
+    flight_ids = models.JSONField(help_text="Selected DailyFlight IDs")
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0, help_text="Flights handled so far")
+    updated = models.PositiveIntegerField(default=0, help_text="Flights actually propagated")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PENDING")
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Propagation Job"
+        verbose_name_plural = "Propagation Jobs"
+
+    def __str__(self):
+        return f"Propagation job #{self.pk} ({self.processed}/{self.total})"
+
+    @property
+    def progress(self):
+        """Percentage of flights handled"""
+        return round(100 * self.processed / self.total) if self.total else 100
+
+
+class EntityUsage(models.Model):
+    """
+    Number of DailyFlights referencing each airline, airport and aircraft type.
+    Maintained by statement-level triggers on flight_ops_dailyflight (migration
+    0014) on insert, delete and updates of the four references, so ORM saves,
+    bulk_create/bulk_update, the COPY merge and raw SQL all keep it current.
+    Rows whose count drops to zero are kept for the next flight using the entity.
+    """
+
+    ENTITY_CHOICES = [
+        ("airline", "Airline"),
+        ("airport", "Airport"),
+        ("aircraft_type", "Aircraft Type"),
+    ]
+
+    entity_type = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    entity_id = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0, help_text="DailyFlights referencing the entity")
+
+    class Meta:
+        unique_together = ("entity_type", "entity_id")
+        verbose_name = "Entity Usage"
+        verbose_name_plural = "Entity Usage"
+
+    def __str__(self):
+        return f"{self.entity_type} {self.entity_id}: {self.ref_count} flights"
+
+    @classmethod
+    def used_ids(cls, entity_type):
+        """Subquery of the IDs of `entity_type` used by at least one DailyFlight"""
+        return cls.objects.filter(entity_type=entity_type, ref_count__gt=0).values("entity_id")
+
+
+class FlightEvent(models.Model):
+    """
+    Append-only log of DailyFlight milestones: estimated/actual times and status changes.
+    Recorded with flight_ops.events.record_event and applied to the flights in batches by
+    the `project_flight_events` command (see PendingFlightEvent). A TimescaleDB hypertable
+    on event_time (with compressed chunks) when the extension is available, created by
+    migration 0015.
+    """
+
+    MILESTONE_CHOICES = [
+        ("etod", "Estimated Time of Departure"),
+        ("aobt", "Actual Off-Block Time"),
+        ("atod", "Actual Time of Departure"),
+        ("etoa", "Estimated Time of Arrival"),
+        ("atoa", "Actual Time of Arrival"),
+        ("aibt", "Actual In-Block Time"),
+        ("status", "Status"),
+    ]
+
+    # Events outlive deleted flights: no database constraint
+    flight = models.ForeignKey(DailyFlight, on_delete=models.DO_NOTHING, db_constraint=False, related_name="events")
+    milestone = models.CharField(max_length=6, choices=MILESTONE_CHOICES)
+    time_value = models.DateTimeField(null=True, blank=True, help_text="New milestone time (None clears it)")
+    status_value = models.CharField(max_length=3, blank=True, choices=DailyFlight.STATUS_CHOICES, help_text="New status")
+    source = models.CharField(max_length=30, blank=True, help_text="Reporting system or user")
+    event_time = models.DateTimeField(default=timezone.now, help_text="When the milestone was reported")
+
+    class Meta:
+        managed = False
+        db_table = "flight_ops_flightevent"
+        verbose_name = "Flight Event"
+        verbose_name_plural = "Flight Events"
+
+    def __str__(self):
+        value = self.status_value if self.milestone == "status" else self.time_value
+        return f"{self.flight_id} {self.milestone}={value} at {self.event_time}"
+
+
+class PendingFlightEvent(models.Model):
+    """
+    Outbox of FlightEvents not projected into DailyFlight yet. Filled by a trigger on
+    flight_ops_flightevent (migration 0015) and drained by the project_flight_events
+    worker, so polls read this small, uncompressed table instead of the log.
+    """
+
+    event_id = models.BigIntegerField(primary_key=True)
+    flight_id = models.BigIntegerField()
+    milestone = models.CharField(max_length=6, choices=FlightEvent.MILESTONE_CHOICES)
+
+    class Meta:
+        verbose_name = "Pending Flight Event"
+        verbose_name_plural = "Pending Flight Events"
+
+    def __str__(self):
+        return f"Event {self.event_id}: {self.flight_id} {self.milestone}"
@@ -0,0 +1,301 @@
+"""
+Set-based propagation of seasonal schedule changes (Rolling Window Strategy).
+
+Applies the current SeasonalFlight values to its future DailyFlights with one
+UPDATE ... FROM schedules_seasonalflight per batch of schedules. Scheduled times
+are recomputed in SQL with the same next-day arrival rule as
+schedules.expansion.scheduled_times; manually modified flights and flights
+inside the buffer are not written.
+
+A flight is stale when its schedule_version is below SeasonalFlight.revision,
+which is bumped whenever a propagatable field changes. Stale flights are found
+through the (schedule, schedule_version) index, so a run where nothing changed
+only probes the index once per schedule.
+
+Edited schedules are queued in PendingPropagation by a post_save signal and
+drained by process_queue(): active schedules are propagated, soft-deleted ones
+get their future flights cancelled and marked (cancelled_by_schedule); only
+those marked flights are restored when the schedule is reactivated.
+
+The admin "propagate from schedule" action uses propagate_flights() on the
+selected rows directly, or a PropagationJob run by the same worker for large
+selections.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from schedules.models import SeasonalFlight
+
+from .models import DISPLAY_CODES, DailyFlight, PendingPropagation, PropagationJob
+
+QUEUE_BATCH_SIZE = 100
+
+# Admin selections above this size are handed to a background PropagationJob
+JOB_THRESHOLD = 1000
+JOB_BATCH_SIZE = 1000
+
+# A RUNNING job whose progress has not moved for this long is taken as interrupted
+JOB_STALE_AFTER = timedelta(minutes=15)
+
+# Columns copied verbatim from the seasonal schedule
+COPIED_COLUMNS = ["airline_id", "flight_number", "origin_id", "destination_id", "aircraft_type_id"]
+
+# Denormalized display codes refreshed with the schedule: column -> schedule foreign key
+SCHEDULE_CODE_COLUMNS = {"airline_code": "airline_id", "origin_code": "origin_id", "destination_code": "destination_id", "aircraft_type_code": "aircraft_type_id"}
+
+
+class PropagationResult:
+    """Counters for a propagation run, with per-schedule updated counts"""
+
+    def __init__(self):
+        self.updated = 0
+        self.skipped_manual = 0
+        self.cancelled = 0
+        self.restored = 0
+        self.by_schedule = {}
+
+    def merge(self, other):
+        """Add the counters of another (chunk) result"""
+        for counter in ("updated", "skipped_manual", "cancelled", "restored"):
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+        for schedule_id, count in other.by_schedule.items():
+            self.by_schedule[schedule_id] = self.by_schedule.get(schedule_id, 0) + count
+        return self
+
+
+def _scheduled_times_sql():
+    """New (stod, stoa) of a flight: local date + schedule time, arrivals before departure land on the next day"""
+    stod = "(df.date_of_operation + sf.stod) AT TIME ZONE %(tz)s"
+    stoa = "(df.date_of_operation + sf.stoa + CASE WHEN sf.stoa < sf.stod THEN interval '1 day' ELSE interval '0 days' END) AT TIME ZONE %(tz)s"
+    return stod, stoa
+
+
+def _scope_sql():
+    """Future flights of a schedule outside the buffer"""
+    return """
+        df.schedule_id = sf.id
+        AND df.date_of_operation >= %(from_date)s
+        AND df.stod >= %(not_before)s
+    """
+
+
+def _stale_sql():
+    """True if a flight was built from an older revision of its schedule"""
+    return "df.schedule_version < sf.revision"
+
+
+def stale_schedule_ids(from_date, not_before, schedule_ids=None):
+    """
+    IDs of active schedules with at least one stale, auto-propagatable flight on or
+    after `from_date` departing at or after `not_before`, in primary key order.
+    """
+    flights = DailyFlight._meta.db_table
+    schedules = SeasonalFlight._meta.db_table
+    restrict = "AND sf.id = ANY(%(schedule_ids)s)" if schedule_ids is not None else ""
+    params = {"from_date": from_date, "not_before": not_before, "schedule_ids": list(schedule_ids or [])}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT sf.id FROM {schedules} sf
+            WHERE sf.is_active AND sf.end_date >= %(from_date)s {restrict}
+              AND EXISTS (
+                  SELECT 1 FROM {flights} df
+                  WHERE {_scope_sql()} AND {_stale_sql()} AND NOT df.is_manually_modified
+              )
+            ORDER BY sf.id
+            """,
+            params,
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _update_sql(where):
+    """UPDATE applying the schedule to the flights matching `where`, returning their schedule_id"""
+    stod, stoa = _scheduled_times_sql()
+    assignments = [f"{column} = sf.{column}" for column in COPIED_COLUMNS]
+    for column, foreign_key in SCHEDULE_CODE_COLUMNS.items():
+        relation, code_field = DISPLAY_CODES[column]
+        table = DailyFlight._meta.get_field(relation).related_model._meta.db_table
+        assignments.append(f"{column} = (SELECT {code_field} FROM {table} WHERE id = sf.{foreign_key})")
+    airports = DailyFlight._meta.get_field("origin").related_model._meta.db_table
+    # Same rule as models.movement_direction()
+    assignments.append(
+        f"""direction = CASE
+                WHEN (SELECT iata_code FROM {airports} WHERE id = sf.destination_id) = %(home)s THEN 'ARR'
+                WHEN (SELECT iata_code FROM {airports} WHERE id = sf.origin_id) = %(home)s THEN 'DEP'
+                ELSE 'OTH'
+            END"""
+    )
+    assignments = ",\n            ".join(assignments)
+    return f"""
+        UPDATE {DailyFlight._meta.db_table} df SET
+            {assignments},
+            stod = {stod},
+            stoa = {stoa},
+            schedule_version = sf.revision,
+            last_propagated_at = %(now)s,
+            updated_at = %(now)s
+        FROM {SeasonalFlight._meta.db_table} sf
+        WHERE {where}
+        RETURNING df.schedule_id
+    """
+
+
+def propagate_schedules(schedule_ids, from_date, not_before, dry_run=False):
+    """
+    Propagate the given SeasonalFlights to their DailyFlights on or after `from_date`
+    departing at or after `not_before`.
+
+    Only stale flights are written; they take the schedule's current revision.
+    Returns a PropagationResult; with `dry_run` the stale flights are only counted.
+    """
+    result = PropagationResult()
+    schedule_ids = list(schedule_ids)
+    if not schedule_ids:
+        return result
+
+    flights = DailyFlight._meta.db_table
+    schedules = SeasonalFlight._meta.db_table
+    params = {
+        "schedule_ids": schedule_ids,
+        "from_date": from_date,
+        "not_before": not_before,
+        "tz": timezone.get_current_timezone_name(),
+        "now": timezone.now(),
+        "home": settings.HOME_AIRPORT_IATA,
+    }
+
+    if dry_run:
+        changed = f"""
+            SELECT df.schedule_id FROM {flights} df JOIN {schedules} sf ON {_scope_sql()}
+            WHERE sf.id = ANY(%(schedule_ids)s) AND NOT df.is_manually_modified AND {_stale_sql()}
+        """
+    else:
+        changed = _update_sql(
+            f"""{_scope_sql()}
+              AND sf.id = ANY(%(schedule_ids)s)
+              AND NOT df.is_manually_modified
+              AND {_stale_sql()}"""
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"WITH changed AS ({changed}) SELECT schedule_id, COUNT(*) FROM changed GROUP BY schedule_id", params)
+        result.by_schedule = dict(cursor.fetchall())
+        result.updated = sum(result.by_schedule.values())
+
+        cursor.execute(
+            f"""
+            SELECT COUNT(*) FROM {flights} df JOIN {schedules} sf ON {_scope_sql()}
+            WHERE sf.id = ANY(%(schedule_ids)s) AND df.is_manually_modified AND {_stale_sql()}
+            """,
+            params,
+        )
+        result.skipped_manual = cursor.fetchone()[0]
+
+    return result
+
+
+def _future_flights(schedule_ids, from_date, not_before):
+    return DailyFlight.objects.filter(schedule_id__in=schedule_ids, date_of_operation__gte=from_date, stod__gte=not_before, is_manually_modified=False)
+
+
+def cancel_flights(schedule_ids, from_date, not_before):
+    """Cancel the scheduled auto-propagatable future flights of soft-deleted schedules, returns the row count"""
+    now = timezone.now()
+    return _future_flights(schedule_ids, from_date, not_before).filter(status="SCH").update(
+        status="CXX", cancelled_by_schedule=True, last_propagated_at=now, updated_at=now
+    )
+
+
+def restore_flights(schedule_ids, from_date, not_before):
+    """
+    Put back to SCH the future flights cancelled by cancel_flights(), returns the row
+    count. Flights cancelled any other way (operations, the event log) stay cancelled.
+    """
+    now = timezone.now()
+    return _future_flights(schedule_ids, from_date, not_before).filter(status="CXX", cancelled_by_schedule=True).update(
+        status="SCH", cancelled_by_schedule=False, last_propagated_at=now, updated_at=now
+    )
+
+
+def process_queue(from_date, not_before, batch_size=QUEUE_BATCH_SIZE):
+    """
+    Drain one batch of PendingPropagation entries in a single transaction.
+
+    Entries locked by another worker are skipped. Active schedules are propagated
+    and have the flights cancelled by their soft-delete restored; inactive ones
+    get their future flights cancelled. Returns (processed count, PropagationResult).
+    """
+    result = PropagationResult()
+    with transaction.atomic():
+        entries = list(
+            PendingPropagation.objects.select_for_update(skip_locked=True, of=("self",)).select_related("schedule").order_by("enqueued_at")[:batch_size]
+        )
+        if not entries:
+            return 0, result
+
+        active = [entry.schedule_id for entry in entries if entry.schedule.is_active]
+        inactive = [entry.schedule_id for entry in entries if not entry.schedule.is_active]
+
+        result.merge(propagate_schedules(active, from_date, not_before))
+        result.restored = restore_flights(active, from_date, not_before)
+        result.cancelled = cancel_flights(inactive, from_date, not_before)
+
+        PendingPropagation.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+
+    return len(entries), result
+
+
+def propagate_flights(flight_ids):
+    """
+    Apply their current schedule to the given DailyFlights, whatever their revision
+    and departure time (explicit admin selection). Manually modified flights and
+    flights without a schedule are skipped. Returns the number of updated flights.
+    """
+    flight_ids = list(flight_ids)
+    if not flight_ids:
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _update_sql("df.schedule_id = sf.id AND df.id = ANY(%(flight_ids)s) AND NOT df.is_manually_modified"),
+            {"flight_ids": flight_ids, "tz": timezone.get_current_timezone_name(), "now": timezone.now(), "home": settings.HOME_AIRPORT_IATA},
+        )
+        return cursor.rowcount
+
+
+def claim_job():
+    """Mark the oldest pending PropagationJob as running and return it (None if there is none)"""
+    with transaction.atomic():
+        job = PropagationJob.objects.select_for_update(skip_locked=True).filter(status="PENDING").order_by("created_at").first()
+        if job is not None:
+            job.status = "RUNNING"
+            job.save(update_fields=["status", "updated_at"])
+    return job
+
+
+def run_job(job, batch_size=JOB_BATCH_SIZE):
+    """
+    Propagate the flights of a job in committed batches, recording progress after each
+    one; a job requeued after a crash continues at `processed`.
+    """
+    try:
+        for offset in range(job.processed, job.total, batch_size):
+            batch = job.flight_ids[offset : offset + batch_size]
+            with transaction.atomic():
+                updated = propagate_flights(batch)
+                PropagationJob.objects.filter(pk=job.pk).update(
+                    processed=F("processed") + len(batch), updated=F("updated") + updated, updated_at=timezone.now()
+                )
+        PropagationJob.objects.filter(pk=job.pk).update(status="DONE", updated_at=timezone.now())
+    except Exception as e:
+        PropagationJob.objects.filter(pk=job.pk).update(status="FAILED", error=str(e), updated_at=timezone.now())
+        raise
+    job.refresh_from_db()
+    return job
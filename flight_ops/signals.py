@@ -0,0 +1,87 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core_app import dashboard
+from masterdata.models import AircraftType, Airline, Airport, BaggageCarousel, CheckInCounter, Gate, Stand
+from schedules.models import SeasonalFlight
+
+from .caching import bump_board
+from .display_codes import stored_codes, sync_checkin_codes, sync_display_codes
+from .models import DailyFlight, GenerationWatermark, PendingPropagation
+
+
+@receiver(post_save, sender=SeasonalFlight)
+def reset_generation_watermark(sender, instance, created, **kwargs):
+    """An edited schedule may operate on new dates - expand its whole window again on the next run"""
+    if not created:
+        GenerationWatermark.objects.filter(schedule=instance).delete()
+
+
+@receiver(post_save, sender=SeasonalFlight)
+def enqueue_propagation(sender, instance, created, **kwargs):
+    """Edits and soft-deletes reach the daily flights through the propagation queue worker"""
+    if not created:
+        transaction.on_commit(lambda: PendingPropagation.enqueue([instance.pk]))
+
+
+@receiver(post_save, sender=DailyFlight)
+@receiver(post_delete, sender=DailyFlight)
+def invalidate_board(sender, instance, **kwargs):
+    """Cached board pages of the flight's date are outdated"""
+    bump_board(instance.date_of_operation)
+
+
+@receiver(post_save, sender=DailyFlight)
+@receiver(post_delete, sender=DailyFlight)
+def invalidate_dashboard_figures(sender, instance, **kwargs):
+    """Flight counts and resource occupancy may have changed"""
+    transaction.on_commit(dashboard.invalidate)
+
+
+@receiver(m2m_changed, sender=DailyFlight.checkin_counters.through)
+def sync_flight_checkin_codes(sender, instance, action, reverse, pk_set, **kwargs):
+    """Counter changes don't save the flight: rebuild its packed codes, which also moves updated_at"""
+    if reverse and action == "pre_clear":
+        # pk_set is None on clear: remember the counter's flights before they are detached
+        instance._cleared_flight_ids = list(instance.dailyflight_set.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        flight_ids = instance.__dict__.pop("_cleared_flight_ids", []) if action == "post_clear" else list(pk_set)
+    else:
+        flight_ids = [instance.pk]
+    for date_of_operation in set(DailyFlight.objects.filter(pk__in=flight_ids).values_list("date_of_operation", flat=True)):
+        bump_board(date_of_operation)
+    sync_checkin_codes(flight_ids=flight_ids)
+
+
+@receiver(pre_save, sender=Airline)
+@receiver(pre_save, sender=Airport)
+@receiver(pre_save, sender=AircraftType)
+@receiver(pre_save, sender=Gate)
+@receiver(pre_save, sender=Stand)
+@receiver(pre_save, sender=BaggageCarousel)
+def remember_masterdata_codes(sender, instance, **kwargs):
+    """Codes before the save: edits that keep them don't touch any flight"""
+    instance._stored_codes = stored_codes(instance)
+
+
+@receiver(post_save, sender=Airline)
+@receiver(post_save, sender=Airport)
+@receiver(post_save, sender=AircraftType)
+@receiver(post_save, sender=Gate)
+@receiver(post_save, sender=Stand)
+@receiver(post_save, sender=BaggageCarousel)
+def sync_masterdata_codes(sender, instance, created, **kwargs):
+    """A renamed code is rewritten on every flight showing it"""
+    previous = instance.__dict__.pop("_stored_codes", None)
+    if not created:
+        sync_display_codes(instance, previous)
+
+
+@receiver(post_save, sender=CheckInCounter)
+def sync_counter_codes(sender, instance, created, **kwargs):
+    if not created:
+        sync_checkin_codes(counter_id=instance.pk)
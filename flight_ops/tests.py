@@ -1,3 +1,442 @@
-from django.test import TestCase
+import re
+import threading
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from masterdata.models import AircraftType, Airline, Airport
+from schedules.expansion import scheduled_times
+from schedules.models import SeasonalFlight
+
+from . import events
+from .generation import CopyDailyFlightGenerator, DailyFlightGenerator, generate_chunked
+from .models import CommandCheckpoint, DailyFlight, EntityUsage, GenerationWatermark, PendingPropagation, change_position
+from .propagation import cancel_flights, process_queue, propagate_schedules, restore_flights
+
+START = date(2026, 6, 1)
+END = date(2026, 6, 7)
+
+
+def create_masterdata():
+    """Home airport BKK, one other airport, an airline and an aircraft type"""
+    return {
+        "airline": Airline.objects.create(iata_code="TG", icao_code="THA", name="Thai Airways", country="Thailand"),
+        "bkk": Airport.objects.create(iata_code="BKK", icao_code="VTBS", name="Suvarnabhumi", city="Bangkok", country="Thailand"),
+        "nrt": Airport.objects.create(iata_code="NRT", icao_code="RJAA", name="Narita", city="Tokyo", country="Japan"),
+        "aircraft": AircraftType.objects.create(
+            icao_code="A359", manufacturer="Airbus", model="A350-900", wingspan_meters=64, length_meters=66, max_takeoff_weight_kg=280000, typical_capacity=321
+        ),
+    }
+
+
+def create_schedule(data, flight_number="640", **fields):
+    """Daily BKK-NRT schedule over June 2026, departing 23:00 and arriving the next day"""
+    values = {
+        "airline": data["airline"],
+        "flight_number": flight_number,
+        "origin": data["bkk"],
+        "destination": data["nrt"],
+        "aircraft_type": data["aircraft"],
+        "stod": time(23, 0),
+        "stoa": time(7, 0),
+        "start_date": date(2026, 6, 1),
+        "end_date": date(2026, 6, 30),
+        "days_of_operation": "1234567",
+        **fields,
+    }
+    return SeasonalFlight.objects.create(**values)
+
+
+def schedules():
+    return list(SeasonalFlight.objects.select_related("airline", "origin", "destination", "aircraft_type"))
+
+
+class GenerationTests(TestCase):
+    """Bulk and COPY generation merge schedules into DailyFlight"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_masterdata()
+        cls.schedule = create_schedule(cls.data)
+
+    def generate(self, generator_class):
+        return generator_class(START, END).run(schedules())
+
+    def test_generation_creates_one_flight_per_operating_day(self):
+        for generator_class in (DailyFlightGenerator, CopyDailyFlightGenerator):
+            with self.subTest(generator_class.__name__):
+                DailyFlight.objects.all().delete()
+                result = self.generate(generator_class)
+
+                self.assertEqual(result.created, 7)
+                flight = DailyFlight.objects.get(flight_id="20260601-TG640")
+                self.assertEqual(flight.stod, datetime(2026, 6, 1, 23, 0, tzinfo=ZoneInfo("UTC")))
+                self.assertEqual(flight.stoa, datetime(2026, 6, 2, 7, 0, tzinfo=ZoneInfo("UTC")))
+                self.assertEqual((flight.direction, flight.airline_code, flight.destination_code), ("DEP", "TG", "NRT"))
+                self.assertEqual(flight.schedule_version, self.schedule.revision)
+
+    def test_rerun_leaves_unchanged_flights_alone(self):
+        for generator_class in (DailyFlightGenerator, CopyDailyFlightGenerator):
+            with self.subTest(generator_class.__name__):
+                DailyFlight.objects.all().delete()
+                self.generate(generator_class)
+                written = dict(DailyFlight.objects.values_list("pk", "updated_at"))
+
+                result = self.generate(generator_class)
+
+                self.assertEqual((result.created, result.updated, result.unchanged), (0, 0, 7))
+                self.assertEqual(dict(DailyFlight.objects.values_list("pk", "updated_at")), written)
+
+    def test_schedule_change_skips_manual_flights_and_keeps_statuses(self):
+        for generator_class in (DailyFlightGenerator, CopyDailyFlightGenerator):
+            with self.subTest(generator_class.__name__):
+                DailyFlight.objects.all().delete()
+                SeasonalFlight.objects.filter(pk=self.schedule.pk).update(stod=time(23, 0))
+                self.generate(generator_class)
+                manual = DailyFlight.objects.get(flight_id="20260602-TG640")
+                DailyFlight.objects.filter(pk=manual.pk).update(is_manually_modified=True, stod=manual.stod + timedelta(hours=1))
+                DailyFlight.objects.filter(flight_id="20260603-TG640").update(status="OFB")
+
+                SeasonalFlight.objects.filter(pk=self.schedule.pk).update(stod=time(22, 30))
+                result = self.generate(generator_class)
+
+                self.assertEqual((result.updated, result.skipped_manual), (6, 1))
+                self.assertEqual(DailyFlight.objects.get(pk=manual.pk).stod, manual.stod + timedelta(hours=1))
+                changed = DailyFlight.objects.get(flight_id="20260603-TG640")
+                self.assertEqual(changed.stod, datetime(2026, 6, 3, 22, 30, tzinfo=ZoneInfo("UTC")))
+                self.assertEqual(changed.status, "OFB")
+
+    def test_incremental_run_only_adds_missing_flights(self):
+        self.generate(DailyFlightGenerator)
+        DailyFlight.objects.filter(flight_id="20260604-TG640").delete()
+
+        result = CopyDailyFlightGenerator(START, END, incremental=True).run(schedules())
+
+        self.assertEqual((result.created, result.skipped_existing), (1, 6))
+        self.assertTrue(DailyFlight.objects.filter(flight_id="20260604-TG640").exists())
+
+
+class WatermarkCheckpointTests(TestCase):
+    """Watermarks and checkpoints only move forward over committed, error-free work"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_masterdata()
+        cls.schedule = create_schedule(cls.data)
+
+    def test_incremental_command_advances_watermark(self):
+        call_command("generate_daily_flights", start_date="2026-06-01", days=7, incremental=True, stdout=mock.Mock())
+        self.assertEqual(GenerationWatermark.objects.get(schedule=self.schedule).generated_through, END)
+
+        # The next incremental run only expands dates after the watermark
+        call_command("generate_daily_flights", start_date="2026-06-01", days=10, incremental=True, stdout=mock.Mock())
+        self.assertEqual(DailyFlight.objects.count(), 10)
+        self.assertEqual(GenerationWatermark.objects.get(schedule=self.schedule).generated_through, date(2026, 6, 10))
+
+    def test_editing_the_schedule_resets_its_watermark(self):
+        GenerationWatermark.objects.create(schedule=self.schedule, generated_through=END)
+        self.schedule.days_of_operation = "135"
+        self.schedule.save()
+        self.assertFalse(GenerationWatermark.objects.filter(schedule=self.schedule).exists())
+
+    def test_resume_skips_committed_chunks(self):
+        checkpoint = CommandCheckpoint.open("generate_daily_flights", "test", resume=True)
+        checkpoint.advance("2026-06-02")
+
+        generate_chunked(START, END, chunk_days=2, checkpoint=CommandCheckpoint.open("generate_daily_flights", "test", resume=True), schedules=schedules())
+
+        dates = set(DailyFlight.objects.values_list("date_of_operation", flat=True))
+        self.assertEqual(min(dates), date(2026, 6, 3))
+        self.assertEqual(CommandCheckpoint.objects.get(run_key="test").position, END.isoformat())
+
+    def test_failed_flights_keep_checkpoint_and_watermark(self):
+        save = DailyFlightGenerator._save
+
+        def failing_save(generator, flights, created):
+            if any(flight.flight_id == "20260603-TG640" for flight in flights):
+                raise IntegrityError("rejected")
+            return save(generator, flights, created)
+
+        with mock.patch.object(DailyFlightGenerator, "_save", failing_save):
+            call_command("generate_daily_flights", start_date="2026-06-01", days=7, incremental=True, stdout=mock.Mock())
+
+        self.assertEqual(DailyFlight.objects.count(), 6)
+        self.assertFalse(CommandCheckpoint.objects.get(command="generate_daily_flights").is_complete)
+        self.assertFalse(GenerationWatermark.objects.exists())
+
+    def test_failed_chunk_is_reported_with_resume_hint(self):
+        run = DailyFlightGenerator.run
+
+        def failing_run(generator, schedules=None):
+            if generator.start_date == date(2026, 6, 3):
+                raise RuntimeError("boom")
+            return run(generator, schedules)
+
+        with mock.patch.object(DailyFlightGenerator, "run", failing_run):
+            with self.assertRaisesMessage(CommandError, "chunk 2026-06-03 to 2026-06-04: boom"):
+                call_command("generate_daily_flights", start_date="2026-06-01", days=7, chunk_days=2, stdout=mock.Mock())
+
+        # The chunk before the failure is committed and recorded for --resume
+        self.assertEqual(DailyFlight.objects.count(), 2)
+        self.assertEqual(CommandCheckpoint.objects.get(command="generate_daily_flights").position, "2026-06-02")
+
+
+class PropagationTests(TestCase):
+    """Set-based propagation of schedule edits, cancellations and restores"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_masterdata()
+        cls.schedule = create_schedule(cls.data)
+
+    def setUp(self):
+        self.now = datetime(2026, 5, 1, tzinfo=ZoneInfo("UTC"))
+
+    def test_propagation_recomputes_times_in_the_current_timezone(self):
+        tz = ZoneInfo("Asia/Bangkok")
+        with timezone.override(tz):
+            DailyFlightGenerator(START, END).run(schedules())
+            manual = DailyFlight.objects.get(flight_id="20260605-TG640")
+            DailyFlight.objects.filter(pk=manual.pk).update(is_manually_modified=True)
+
+            schedule = SeasonalFlight.objects.get(pk=self.schedule.pk)
+            schedule.stod, schedule.stoa = time(9, 15), time(8, 0)
+            schedule.save()
+            result = propagate_schedules([schedule.pk], START, self.now)
+
+        self.assertEqual((result.updated, result.skipped_manual), (6, 1))
+        flight = DailyFlight.objects.get(flight_id="20260601-TG640")
+        # Arrival before departure: next day, both local to the current timezone
+        self.assertEqual((flight.stod, flight.stoa), scheduled_times(date(2026, 6, 1), time(9, 15), time(8, 0), tz))
+        self.assertEqual(flight.stoa - flight.stod, timedelta(hours=22, minutes=45))
+        self.assertEqual(flight.schedule_version, schedule.revision)
+        self.assertEqual(DailyFlight.objects.get(pk=manual.pk).stod, manual.stod)
+
+        # Nothing is stale any more
+        self.assertEqual(propagate_schedules([schedule.pk], START, self.now).updated, 0)
+
+    def test_buffer_and_past_flights_are_not_written(self):
+        DailyFlightGenerator(START, END).run(schedules())
+        schedule = SeasonalFlight.objects.get(pk=self.schedule.pk)
+        schedule.flight_number = "641"
+        schedule.save()
+
+        result = propagate_schedules([schedule.pk], date(2026, 6, 3), datetime(2026, 6, 4, 0, 0, tzinfo=ZoneInfo("UTC")))
+
+        self.assertEqual(result.updated, 4)
+        self.assertEqual(set(DailyFlight.objects.filter(flight_number="641").values_list("date_of_operation", flat=True)), {START + timedelta(days=n) for n in range(3, 7)})
+
+    def test_reactivation_only_restores_flights_cancelled_by_the_schedule(self):
+        DailyFlightGenerator(START, END).run(schedules())
+        cancelled_by_operations = DailyFlight.objects.get(flight_id="20260602-TG640")
+        DailyFlight.objects.filter(pk=cancelled_by_operations.pk).update(status="CXX")
+
+        self.assertEqual(cancel_flights([self.schedule.pk], START, self.now), 6)
+        self.assertEqual(DailyFlight.objects.filter(status="CXX", cancelled_by_schedule=True).count(), 6)
+
+        self.assertEqual(restore_flights([self.schedule.pk], START, self.now), 6)
+        self.assertEqual(DailyFlight.objects.get(pk=cancelled_by_operations.pk).status, "CXX")
+        self.assertEqual(DailyFlight.objects.filter(status="SCH", cancelled_by_schedule=False).count(), 6)
+
+    def test_soft_delete_and_reactivation_go_through_the_queue(self):
+        DailyFlightGenerator(START, END).run(schedules())
+        schedule = SeasonalFlight.objects.get(pk=self.schedule.pk)
+
+        schedule.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule.save()
+        processed, result = process_queue(START, self.now)
+        self.assertEqual((processed, result.cancelled), (1, 7))
+        self.assertFalse(PendingPropagation.objects.exists())
+
+        schedule.is_active = True
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule.save()
+        processed, result = process_queue(START, self.now)
+        self.assertEqual((processed, result.restored), (1, 7))
+        self.assertEqual(DailyFlight.objects.filter(status="SCH").count(), 7)
+
+
+class PropagationQueueTests(TransactionTestCase):
+    """Queue workers skip the entries another worker has locked"""
+
+    def setUp(self):
+        data = create_masterdata()
+        self.first = create_schedule(data, "640")
+        self.second = create_schedule(data, "642")
+        PendingPropagation.enqueue([self.first.pk])
+        PendingPropagation.enqueue([self.second.pk])
+
+    def test_locked_entries_are_skipped(self):
+        locked = threading.Event()
+        release = threading.Event()
+
+        def other_worker():
+            try:
+                with transaction.atomic():
+                    list(PendingPropagation.objects.select_for_update().filter(schedule=self.first))
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connections.close_all()
+
+        worker = threading.Thread(target=other_worker)
+        worker.start()
+        try:
+            locked.wait(10)
+            processed, _ = process_queue(START, timezone.now())
+            self.assertEqual(processed, 1)
+            self.assertEqual(list(PendingPropagation.objects.values_list("schedule_id", flat=True)), [self.first.pk])
+        finally:
+            release.set()
+            worker.join()
+
+        processed, _ = process_queue(START, timezone.now())
+        self.assertEqual(processed, 1)
+        self.assertFalse(PendingPropagation.objects.exists())
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class DailyFlightBoardTests(TestCase):
+    """Keyset pages and live-update polls of the daily flight board"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_masterdata()
+        # Same departure time: the keyset falls back to airline, flight number and pk
+        for number in range(640, 650):
+            create_schedule(cls.data, str(number))
+        DailyFlightGenerator(START, START).run(schedules())
+        cls.user = User.objects.create_user("ops", password="ops")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def board(self, **params):
+        return self.client.get("/flight-ops/daily-flights/", {"date": "2026-06-01", **params})
+
+    def test_keyset_pages_cover_the_board_once(self):
+        seen = []
+        after = ""
+        with mock.patch("flight_ops.views.daily_flights.PAGE_SIZE", 3):
+            while True:
+                response = self.board(after=after) if after else self.board()
+                seen += [re.search(r'id="flight-(\d+)"', row).group(1) for row in response.context["rows"]]
+                after = response.context["next_cursor"]
+                if not after:
+                    break
+
+        expected = DailyFlight.objects.filter(date_of_operation=START).order_by("stod", "airline_id", "flight_number", "pk")
+        self.assertEqual(seen, [str(pk) for pk in expected.values_list("pk", flat=True)])
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class DailyFlightChangesTests(TransactionTestCase):
+    """Live-update polls return the flights written by transactions after the position"""
+
+    def setUp(self):
+        data = create_masterdata()
+        create_schedule(data, "640")
+        create_schedule(data, "642")
+        create_schedule(data, "644")
+        DailyFlightGenerator(START, START).run(schedules())
+        self.client.force_login(User.objects.create_user("ops", password="ops"))
+
+    def changes(self, position):
+        return self.client.get("/flight-ops/daily-flights/changes/", {"date": "2026-06-01", "since": position}).content.decode()
+
+    def test_changes_return_updated_and_deleted_flights(self):
+        position = change_position()
+        updated, deleted, untouched = DailyFlight.objects.order_by("flight_number")
+        updated.registration = "HS-THA"
+        updated.save()
+        deleted_pk = deleted.pk
+        deleted.delete()
+
+        html = self.changes(position)
+        self.assertIn("HS-THA", html)
+        self.assertIn(f'<tr id="flight-{deleted_pk}" hx-swap-oob="delete">', html)
+        self.assertNotIn(f'id="flight-{untouched.pk}"', html)
+
+
+class EntityUsageTests(TestCase):
+    """Reference counts follow inserts, reference updates and deletes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_masterdata()
+        create_schedule(cls.data)
+
+    def counts(self):
+        return dict(((usage.entity_type, usage.entity_id), usage.ref_count) for usage in EntityUsage.objects.all())
+
+    def test_counts_follow_flight_writes(self):
+        data = self.data
+        DailyFlightGenerator(START, END).run(schedules())
+        self.assertEqual(self.counts()[("airline", data["airline"].pk)], 7)
+        self.assertEqual(self.counts()[("airport", data["bkk"].pk)], 7)
+
+        other = Airline.objects.create(iata_code="PG", icao_code="BKP", name="Bangkok Airways", country="Thailand")
+        DailyFlight.objects.filter(flight_id="20260601-TG640").update(airline=other)
+        DailyFlight.objects.update(registration="HS-THA")
+        self.assertEqual(self.counts()[("airline", data["airline"].pk)], 6)
+        self.assertEqual(self.counts()[("airline", other.pk)], 1)
+
+        DailyFlight.objects.filter(airline=other).delete()
+        self.assertEqual(self.counts()[("airline", other.pk)], 0)
+        self.assertNotIn(other.pk, set(EntityUsage.used_ids("airline").values_list("entity_id", flat=True)))
+        self.assertIn(data["airline"].pk, set(EntityUsage.used_ids("airline").values_list("entity_id", flat=True)))
+
+
+class FlightEventProjectionTests(TestCase):
+    """Events are projected from the outbox, latest event_time first"""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedule(create_masterdata())
+        DailyFlightGenerator(START, START).run(schedules())
+        cls.flight = DailyFlight.objects.get()
+
+    def test_latest_event_wins(self):
+        now = timezone.now()
+        events.record_events(
+            [
+                (self.flight, "etod", now + timedelta(minutes=20), now),
+                (self.flight, "etod", now + timedelta(minutes=10), now - timedelta(minutes=5)),
+                (self.flight, "status", "OFB"),
+            ],
+            source="test",
+        )
+
+        self.assertEqual(events.project_events(), (3, 1))
+
+        flight = DailyFlight.objects.get(pk=self.flight.pk)
+        self.assertEqual((flight.etod, flight.status), (now + timedelta(minutes=20), "OFB"))
+        self.assertEqual(events.project_events(), (0, 0))
+
+    def test_unchanged_values_are_not_written(self):
+        events.record_event(self.flight, "status", "SCH")
+        self.assertEqual(events.project_events(), (1, 0))
+
+    def test_projected_status_clears_the_schedule_cancellation(self):
+        DailyFlight.objects.filter(pk=self.flight.pk).update(status="CXX", cancelled_by_schedule=True)
+        events.record_event(self.flight, "status", "CXX", source="ops")
+
+        events.project_events()
+
+        self.assertFalse(DailyFlight.objects.get(pk=self.flight.pk).cancelled_by_schedule)
+
+    def test_unknown_values_are_rejected(self):
+        with self.assertRaises(ValueError):
+            events.record_event(self.flight, "status", "XXX")
+        with self.assertRaises(ValueError):
+            events.record_event(self.flight, "boarding", timezone.now())
@@ -1,5 +1,6 @@
 from .daily_flights import (
     add_daily_flight,
+    daily_flight_changes,
     daily_flight_list,
     delete_daily_flight,
     edit_daily_flight,
@@ -7,6 +8,7 @@ from .daily_flights import (
 
 __all__ = [
     "daily_flight_list",
+    "daily_flight_changes",
     "add_daily_flight",
     "edit_daily_flight",
     "delete_daily_flight",
@@ -1,83 +1,228 @@
+import hashlib
 import logging
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime, timedelta
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.views.decorators.http import require_http_methods
 
+from core_app.search import search
+
+from ..events import MILESTONES, record_events
+from ..caching import PAGE_TIMEOUT, board_version, get_page, render_rows, set_page
 from ..forms import DailyFlightForm
-from ..models import DailyFlight
+from ..models import DailyFlight, RemovedDailyFlight, change_position
 
 logger = logging.getLogger(__name__)
 
+PAGE_SIZE = 100
+STREAM_CHUNK_SIZE = 200
 
-@login_required
-def daily_flight_list(request):
-    """Display list of all daily flights with search"""
-    from datetime import date, timedelta
+# Keyset of the board; pk breaks ties so the order is total
+BOARD_ORDERING = ("stod", "airline_id", "flight_number", "pk")
 
-    search_query = request.GET.get("search", "")
-    status_filter = request.GET.get("status", "")
-    date_filter = request.GET.get("date", "")
+STREAM_MARKER = "<!-- daily-flight-rows -->"
+
+POLL_SECONDS = 15
 
-    # Parse date filter (default to today)
+SEARCH_FIELDS = ["airline_code", "airline__name", "flight_number", "flight_id", "registration"]
+
+
+def _selected_date(request):
+    """Date of the board from the `date` parameter (default to today)"""
+    date_filter = request.GET.get("date", "")
     if date_filter:
         try:
-            from datetime import datetime
-
-            selected_date = datetime.strptime(date_filter, "%Y-%m-%d").date()
+            return datetime.strptime(date_filter, "%Y-%m-%d").date()
         except ValueError:
-            selected_date = date.today()
-    else:
-        selected_date = date.today()
-
-    daily_flights = DailyFlight.objects.select_related(
-        "airline",
-        "origin",
-        "destination",
-        "aircraft_type",
-        "gate",
-        "stand",
-        "carousel",
-        "schedule",
-    ).prefetch_related("checkin_counters")
-
-    # Filter by selected date
-    daily_flights = daily_flights.filter(date_of_operation=selected_date)
-
-    # Apply search filter if provided
-    if search_query:
-        daily_flights = daily_flights.filter(
-            Q(airline__iata_code__icontains=search_query)
-            | Q(airline__name__icontains=search_query)
-            | Q(flight_number__icontains=search_query)
-            | Q(flight_id__icontains=search_query)
-            | Q(registration__icontains=search_query)
-        )
+            pass
+    return date.today()
+
+
+def _board_flights(selected_date, search_query, status_filter):
+    """Flights of the board for one date, with search and status filters applied"""
+    # The board only reads the denormalized display codes: no joins
+    daily_flights = DailyFlight.objects.filter(date_of_operation=selected_date)
+
+    # Apply search filter if provided (the board keeps its chronological keyset order)
+    daily_flights = search(daily_flights, search_query, SEARCH_FIELDS)
 
     # Apply status filter if provided
     if status_filter:
         daily_flights = daily_flights.filter(status=status_filter)
 
-    daily_flights = daily_flights.order_by("stod", "airline", "flight_number")
+    return daily_flights
+
+
+def _encode_cursor(flight):
+    """Opaque keyset cursor for the position after `flight`"""
+    raw = "|".join([flight.stod.isoformat(), str(flight.airline_id), flight.flight_number, str(flight.pk)])
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(value):
+    """(stod, airline_id, flight_number, pk) from a cursor, None if missing or malformed"""
+    try:
+        stod, airline_id, flight_number, pk = urlsafe_b64decode(value.encode()).decode().split("|")
+        return datetime.fromisoformat(stod), int(airline_id), flight_number, int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _after_cursor(cursor):
+    """Rows strictly after the cursor in BOARD_ORDERING"""
+    stod, airline_id, flight_number, pk = cursor
+    return (
+        Q(stod__gt=stod)
+        | Q(stod=stod, airline_id__gt=airline_id)
+        | Q(stod=stod, airline_id=airline_id, flight_number__gt=flight_number)
+        | Q(stod=stod, airline_id=airline_id, flight_number=flight_number, pk__gt=pk)
+    )
+
+
+def _board_count(daily_flights, selected_date, version, search_query, status_filter):
+    """Number of flights on the board, counted once per filter set and board version"""
+    filters = f"{selected_date}|{version}|{search_query}|{status_filter}"
+    key = f"daily_flight_count:{hashlib.md5(filters.encode()).hexdigest()}"
+    count = cache.get(key)
+    if count is None:
+        count = daily_flights.count()
+        cache.set(key, count, PAGE_TIMEOUT)
+    return count
+
+
+def _stream_board(request, context, daily_flights):
+    """Send the page shell at once, then the rows in chunks read through iterator()"""
+    page = render_to_string("flight_ops/daily_flight_list.html", {**context, "streaming": True, "stream_marker": STREAM_MARKER}, request=request)
+    head, tail = page.split(STREAM_MARKER, 1)
+
+    def rows():
+        yield head
+        chunk = []
+        for flight in daily_flights.iterator(chunk_size=STREAM_CHUNK_SIZE):
+            chunk.append(flight)
+            if len(chunk) == STREAM_CHUNK_SIZE:
+                yield "".join(render_rows(chunk))
+                chunk = []
+        if chunk:
+            yield "".join(render_rows(chunk))
+        yield tail
+
+    return StreamingHttpResponse(rows(), content_type="text/html; charset=utf-8")
 
-    # Calculate prev/next dates
-    prev_date = selected_date - timedelta(days=1)
-    next_date = selected_date + timedelta(days=1)
 
-    logger.info(f"Daily flight list view loaded: {daily_flights.count()} flights for {selected_date}")
+@login_required
+def daily_flight_list(request):
+    """
+    Display the daily flight board for one date with search.
+
+    Rows are keyset-paginated on (stod, airline, flight_number) with PAGE_SIZE rows per
+    page ("Load more" fetches the next page through HTMX); `stream=1` streams every row.
+    """
+    search_query = request.GET.get("search", "")
+    status_filter = request.GET.get("status", "")
+    after = request.GET.get("after", "")
+    selected_date = _selected_date(request)
+
+    # Rows written by transactions still running now are picked up by the live-update poll
+    since = change_position()
+
+    daily_flights = _board_flights(selected_date, search_query, status_filter).order_by(*BOARD_ORDERING)
+    version = board_version(selected_date)
+    total_count = _board_count(daily_flights, selected_date, version, search_query, status_filter)
+
+    context = {
+        "search_query": search_query,
+        "status_filter": status_filter,
+        "selected_date": selected_date,
+        "prev_date": selected_date - timedelta(days=1),
+        "next_date": selected_date + timedelta(days=1),
+        "status_choices": DailyFlight.STATUS_CHOICES,
+        "total_count": total_count,
+        "since": since,
+        "poll_seconds": POLL_SECONDS,
+    }
+
+    if request.GET.get("stream") and total_count:
+        logger.info(f"Daily flight list view streaming {total_count} flights for {selected_date}")
+        return _stream_board(request, context, daily_flights)
+
+    cursor = _decode_cursor(after) if after else None
+
+    # Unchanged boards are served from the page cache, changed ones mostly from cached rows
+    page_params = [search_query, status_filter, after if cursor is not None else ""]
+    cached_page = get_page(selected_date, version, page_params)
+    if cached_page is not None:
+        rows, next_cursor = cached_page
+    else:
+        if cursor is not None:
+            daily_flights = daily_flights.filter(_after_cursor(cursor))
+
+        # One extra row tells whether there is a next page
+        page = list(daily_flights[: PAGE_SIZE + 1])
+        next_cursor = _encode_cursor(page[PAGE_SIZE - 1]) if len(page) > PAGE_SIZE else ""
+        rows = render_rows(page[:PAGE_SIZE])
+        set_page(selected_date, version, page_params, rows, next_cursor)
+
+    context.update({"rows": rows, "next_cursor": next_cursor, "after": cursor is not None})
+
+    logger.info(f"Daily flight list view loaded: {total_count} flights for {selected_date}")
+
+    # "Load more" only needs the next rows
+    if request.headers.get("HX-Request") and cursor is not None:
+        return render(request, "flight_ops/partials/daily_flight_rows.html", context)
+
+    return render(request, "flight_ops/daily_flight_list.html", context)
+
+
+@login_required
+def daily_flight_changes(request):
+    """
+    Live-update poll of the daily flight board (HTMX).
+
+    Returns the rows of the date written since the `since` position as out-of-band
+    swaps: rows still matching the filters replace their current version, the others
+    and the flights deleted since (RemovedDailyFlight) are removed. The response body is the poller itself, carrying the next `since`.
+
+    Positions follow the commit order (change_position()), not updated_at: a write
+    committing long after its updated_at was taken is still picked up.
+    """
+    search_query = request.GET.get("search", "")
+    status_filter = request.GET.get("status", "")
+    selected_date = _selected_date(request)
+    position = change_position()
+
+    since = request.GET.get("since", "")
+    if not since.isdigit():
+        since = position
+
+    changed = DailyFlight.objects.filter(date_of_operation=selected_date).changed_since(since)
+    changed_ids = list(changed.values_list("pk", flat=True))
+    flights = []
+    removed_ids = []
+    if changed_ids:
+        flights = list(_board_flights(selected_date, search_query, status_filter).filter(pk__in=changed_ids).order_by(*BOARD_ORDERING))
+        kept = {flight.pk for flight in flights}
+        removed_ids = [pk for pk in changed_ids if pk not in kept]
+    removed_ids += RemovedDailyFlight.objects.filter(date_of_operation=selected_date).changed_since(since).values_list("daily_flight_id", flat=True)
 
     return render(
         request,
-        "flight_ops/daily_flight_list.html",
+        "flight_ops/partials/daily_flight_changes.html",
         {
-            "daily_flights": daily_flights,
+            "daily_flights": flights,
+            "removed_ids": removed_ids,
+            "selected_date": selected_date,
             "search_query": search_query,
             "status_filter": status_filter,
-            "selected_date": selected_date,
-            "prev_date": prev_date,
-            "next_date": next_date,
-            "status_choices": DailyFlight.STATUS_CHOICES,
+            "since": position,
+            "poll_seconds": POLL_SECONDS,
         },
     )
 
@@ -92,9 +237,9 @@ def add_daily_flight(request):
             daily_flight = form.save()
             messages.success(
                 request,
-                f"Daily Flight '{daily_flight.airline.iata_code}{daily_flight.flight_number}' created successfully.",
+                f"Daily Flight '{daily_flight.airline_code}{daily_flight.flight_number}' created successfully.",
             )
-            logger.info(f"Daily flight created: {daily_flight.airline.iata_code}{daily_flight.flight_number} by {request.user}")
+            logger.info(f"Daily flight created: {daily_flight.airline_code}{daily_flight.flight_number} by {request.user}")
             return redirect("flight_ops:daily_flight_list")
     else:
         form = DailyFlightForm()
@@ -127,17 +272,22 @@ def edit_daily_flight(request, pk):
             daily_flight.is_manually_modified = True
             daily_flight.save()
             form.save_m2m()  # Save many-to-many relationships
+            # Keep the flight timeline complete: edited milestones go to the event log too
+            record_events(
+                [(daily_flight, milestone, getattr(daily_flight, milestone)) for milestone in MILESTONES if milestone in form.changed_data],
+                source=request.user.get_username(),
+            )
 
             messages.success(
                 request,
-                f"Daily Flight '{daily_flight.airline.iata_code}{daily_flight.flight_number}' updated successfully.",
+                f"Daily Flight '{daily_flight.airline_code}{daily_flight.flight_number}' updated successfully.",
             )
-            logger.info(f"Daily flight updated: {daily_flight.airline.iata_code}{daily_flight.flight_number} (pk={pk}) by {request.user}")
+            logger.info(f"Daily flight updated: {daily_flight.airline_code}{daily_flight.flight_number} (pk={pk}) by {request.user}")
             return redirect("flight_ops:daily_flight_list")
     else:
         form = DailyFlightForm(instance=daily_flight)
 
-    logger.info(f"Edit daily flight form loaded: {daily_flight.airline.iata_code}{daily_flight.flight_number} (pk={pk}) for user {request.user}")
+    logger.info(f"Edit daily flight form loaded: {daily_flight.airline_code}{daily_flight.flight_number} (pk={pk}) for user {request.user}")
 
     return render(
         request,
@@ -156,7 +306,7 @@ def edit_daily_flight(request, pk):
 def delete_daily_flight(request, pk):
     """Hard delete a daily flight"""
     daily_flight = get_object_or_404(DailyFlight, pk=pk)
-    flight_name = f"{daily_flight.airline.iata_code}{daily_flight.flight_number}"
+    flight_name = f"{daily_flight.airline_code}{daily_flight.flight_number}"
     daily_flight.delete()
 
     messages.success(request, f"Daily Flight '{flight_name}' deleted successfully.")
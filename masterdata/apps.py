@@ -5,3 +5,6 @@ class MasterdataConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "masterdata"
     verbose_name = "Master Data"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,131 @@
+"""
+In-memory prefix index for airport, airline and aircraft type autocomplete.
+
+Built from the masterdata registry snapshots (active rows only) and rebuilt
+whenever the registry reloads a model, so edits show up on the next keystroke
+without any query per search. Each index has one sorted key list per tier:
+
+- tier 0: codes (IATA/ICAO);
+- tier 1: city (airports) or manufacturer (aircraft types), whole and per word;
+- tier 2: name (airports, airlines) or model (aircraft types), whole and per word.
+
+A search bisects to the query's prefix range tier by tier and stops once it has
+`limit` distinct rows, so results are ranked by tier, then alphabetically by
+the matching key (an exact code match sorts first), in O(log n + limit). A search
+restricted to `allowed` IDs intersects each tier with them from the smaller side:
+it walks the prefix range only when that is shorter than the allowed set, else it
+checks the keys of the allowed rows.
+"""
+
+import re
+from bisect import bisect_left
+
+from django.urls import reverse_lazy
+from django.utils.text import format_lazy
+from django_select2 import forms as s2forms
+
+from . import registry
+from .models import AircraftType, Airline, Airport
+
+MAX_RESULTS = 20
+
+_WORD = re.compile(r"[^\W_]+")
+
+# Sorts after every key starting with the same prefix
+_LAST_CHAR = chr(0x10FFFF)
+
+# kind -> (model, fields of each tier, label)
+KINDS = {
+    "airports": (
+        Airport,
+        [["iata_code", "icao_code"], ["city"], ["name"]],
+        lambda row: f"{row.iata_code} - {row.city} ({row.name})",
+    ),
+    "airlines": (
+        Airline,
+        [["iata_code", "icao_code"], [], ["name"]],
+        lambda row: f"{row.iata_code} - {row.name}",
+    ),
+    "aircraft": (
+        AircraftType,
+        [["icao_code", "iata_code"], ["manufacturer"], ["model"]],
+        lambda row: f"{row.icao_code} - {row.manufacturer} {row.model}",
+    ),
+}
+
+_indexes = {}
+
+
+def _keys(value, whole_only):
+    """Lowercased search keys of a field value: the value itself, then each word"""
+    value = (value or "").lower().strip()
+    if not value:
+        return set()
+    keys = {value}
+    if not whole_only:
+        keys.update(_WORD.findall(value))
+    return keys
+
+
+class PrefixIndex:
+    """Sorted (key, id) arrays per tier over one registry snapshot, and the keys of each row per tier"""
+
+    def __init__(self, table, tiers, label):
+        self.table = table
+        self.tiers = []
+        self.labels = {}
+        rows = [row for row in table.by_id.values() if row.is_active]
+        for tier, fields in enumerate(tiers):
+            entries = sorted({(key, row.id) for row in rows for field in fields for key in _keys(getattr(row, field), tier == 0)})
+            keys_by_id = {}
+            for key, pk in entries:
+                keys_by_id.setdefault(pk, []).append(key)
+            self.tiers.append(([key for key, _ in entries], [pk for _, pk in entries], keys_by_id))
+        for row in rows:
+            self.labels[row.id] = label(row)
+
+    def search(self, term, limit=MAX_RESULTS, allowed=None):
+        """[(id, label)] of up to `limit` rows matching `term`, best first; `allowed` restricts the IDs"""
+        term = term.lower().strip()
+        found = {}
+        for keys, ids, keys_by_id in self.tiers:
+            start = bisect_left(keys, term)
+            end = bisect_left(keys, term + _LAST_CHAR, start)
+            if allowed is None or end - start <= len(allowed):
+                matches = (ids[position] for position in range(start, end))
+            else:
+                # (key, id) order like the prefix range, over the allowed rows only
+                matches = (pk for _, pk in sorted((key, pk) for pk in allowed for key in keys_by_id.get(pk, ()) if key.startswith(term)))
+
+            for pk in matches:
+                if pk not in found and (allowed is None or pk in allowed):
+                    found[pk] = self.labels[pk]
+                    if len(found) >= limit:
+                        return list(found.items())
+        return list(found.items())
+
+
+def index(kind):
+    """Prefix index of `kind`, rebuilt if the registry snapshot of its model changed"""
+    model, tiers, label = KINDS[kind]
+    table = registry.table(model)
+    current = _indexes.get(kind)
+    if current is None or current.table is not table:
+        current = _indexes[kind] = PrefixIndex(table, tiers, label)
+    return current
+
+
+class AutocompleteWidget(s2forms.ModelSelect2Widget):
+    """
+    Select2 widget searching through the masterdata autocomplete endpoint.
+    Only the selected option is rendered (one query), results come from the prefix index.
+    """
+
+    def __init__(self, kind, scope="", **kwargs):
+        url = reverse_lazy("masterdata:autocomplete", args=[kind])
+        kwargs.setdefault("data_url", format_lazy("{}?scope={}", url, scope) if scope else url)
+        super().__init__(**kwargs)
+
+    def set_to_cache(self):
+        # The endpoint does not need the widget: nothing to register
+        pass
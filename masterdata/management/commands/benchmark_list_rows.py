@@ -0,0 +1,69 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from core_app.projection import lean_rows
+from masterdata.models import Airport, Route
+from masterdata.views.airports import LIST_FIELDS as AIRPORT_FIELDS
+from masterdata.views.routes import LIST_FIELDS as ROUTE_FIELDS
+
+
+class Command(BaseCommand):
+    help = "Compare latency and memory of list pages built from model instances vs lean rows (routes and airports)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed runs per mode, the best one is reported (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING(f"\n⏱  Benchmarking List Rows"))
+        self.stdout.write(f"   {options['repeat']} run(s) per mode, best time and peak allocated memory\n")
+
+        tables = [
+            (
+                "Routes",
+                lambda: Route.objects.filter(is_active=True).select_related("airline", "origin", "destination"),
+                lambda: lean_rows(Route.objects.filter(is_active=True), ROUTE_FIELDS),
+            ),
+            (
+                "Airports",
+                lambda: Airport.objects.filter(is_active=True),
+                lambda: lean_rows(Airport.objects.filter(is_active=True), AIRPORT_FIELDS),
+            ),
+        ]
+
+        for label, instances, rows in tables:
+            self.stdout.write(f"   {label}")
+            results = {}
+            for mode, build in (("Instances", instances), ("Lean rows", rows)):
+                count, best, peak = self.measure(build, options["repeat"])
+                results[mode] = (best, peak)
+                self.stdout.write(f"      {mode:<10} {count:>7} rows  {best * 1000:9.1f} ms  {peak / 1024:10.1f} KiB")
+
+            (instance_time, instance_peak), (row_time, row_peak) = results["Instances"], results["Lean rows"]
+            if row_time and row_peak:
+                self.stdout.write(
+                    self.style.SUCCESS(f"      ✓ Lean rows: {instance_time / row_time:.1f}x faster, {instance_peak / row_peak:.1f}x less memory\n")
+                )
+
+    def measure(self, build, repeat):
+        """(row count, best elapsed seconds, peak traced bytes) of fully evaluating `build()`"""
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count = len(list(build()))
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        # Memory is traced in a separate run, tracing slows the timed ones down
+        tracemalloc.start()
+        objects = list(build())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del objects
+        return count, best, peak
@@ -7,6 +7,7 @@ import requests
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
+from masterdata import registry
 from masterdata.models import AircraftType, Airline, Airport, Route
 from os_ams import settings
 
@@ -166,15 +167,9 @@ class Command(BaseCommand):
         content = response.content.decode("utf-8")
         csv_reader = csv.reader(io.StringIO(content), delimiter=",")
 
-        # Cache lookups to speed up processing (Critical for 60k+ routes)
-        # We map IATA/ICAO codes to database IDs
-        airlines_map = {a.iata_code: a.id for a in Airline.objects.all() if a.iata_code}
-        # Also map ICAO for airlines just in case
-        airlines_map.update({a.icao_code: a.id for a in Airline.objects.all() if a.icao_code})
-
-        # For airports, we map both IATA and ICAO to IDs
-        airports_map = {a.iata_code: a.id for a in Airport.objects.all() if a.iata_code}
-        airports_map.update({a.icao_code: a.id for a in Airport.objects.all() if a.icao_code})
+        # Registry snapshots map both IATA and ICAO codes to database IDs (Critical for 60k+ routes)
+        airlines_map = registry.table(Airline).by_code
+        airports_map = registry.table(Airport).by_code
 
         routes_to_create = []
         count = 0
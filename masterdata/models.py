@@ -1,6 +1,8 @@
 from django.db import models
 from django.core.validators import RegexValidator
 
+from core_app.search import trigram_index
+
 
 class Airline(models.Model):
     """Airlines/Carriers operating at the airport"""
@@ -20,6 +22,10 @@ class Airline(models.Model):
         ordering = ["iata_code"]
         verbose_name = "Airline"
         verbose_name_plural = "Airlines"
+        indexes = [
+            trigram_index("iata_code", "airline_iata_trgm"),
+            trigram_index("name", "airline_name_trgm"),
+        ]
 
     def __str__(self):
         return f"{self.iata_code} - {self.name}"
@@ -47,6 +53,13 @@ class Airport(models.Model):
         ordering = ["iata_code"]
         verbose_name = "Airport"
         verbose_name_plural = "Airports"
+        indexes = [
+            trigram_index("iata_code", "airport_iata_trgm"),
+            trigram_index("icao_code", "airport_icao_trgm"),
+            trigram_index("name", "airport_name_trgm"),
+            trigram_index("city", "airport_city_trgm"),
+            trigram_index("country", "airport_country_trgm"),
+        ]
 
     def __str__(self):
         return f"{self.iata_code} - {self.city} ({self.name})"
@@ -0,0 +1,139 @@
+"""
+Process-local registry of masterdata codes.
+
+Airlines, airports, aircraft types and the airport resources change rarely but are
+looked up everywhere (importers, forms, display codes, allocation). Each process
+keeps one immutable snapshot per model:
+
+- `by_code`: code -> id, for every code field of the model (IATA and ICAO codes
+  share one map, they never collide in length);
+- `by_id`: id -> summary, a small named tuple of the fields listed in REGISTRY.
+
+Saves and deletes bump a per-model version counter in the shared cache (see
+masterdata.signals, after commit); a process notices the new version on its next
+lookup and reloads that model with one query. With a shared cache (REDIS_URL) this
+invalidates every gunicorn worker; with the default local memory cache only the
+writing process sees the bump. So that other processes and commands never keep
+stale codes, a snapshot older than RECHECK_SECONDS is also compared with its table
+(row count and latest updated_at, one aggregate query) and reloaded if it changed.
+
+    from masterdata import registry
+    airline_id = registry.id_for(Airline, "TG")
+    airport = registry.summary(Airport, airport_id)   # .iata_code, .city, ...
+
+Rows created in a transaction that has not committed yet are not in the registry:
+callers needing them fall back to a query when a lookup returns None.
+"""
+
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import AircraftType, Airline, Airport, BaggageCarousel, CheckInCounter, Gate, Stand
+
+# model -> (code fields, summary fields)
+REGISTRY = {
+    Airline: (["iata_code", "icao_code"], ["iata_code", "icao_code", "name", "is_active"]),
+    Airport: (["iata_code", "icao_code"], ["iata_code", "icao_code", "name", "city", "country", "is_active"]),
+    AircraftType: (["icao_code", "iata_code"], ["icao_code", "iata_code", "manufacturer", "model", "is_active"]),
+    Gate: (["code"], ["code", "terminal_id", "gate_type", "is_active", "is_available"]),
+    Stand: (["code"], ["code", "size_code", "is_active", "is_available"]),
+    CheckInCounter: (["code"], ["code", "terminal_id", "is_active", "is_available"]),
+    BaggageCarousel: (["code"], ["code", "terminal_id", "is_active", "is_available"]),
+}
+
+RECHECK_SECONDS = 10
+
+_SUMMARY_TYPES = {model: namedtuple(f"{model.__name__}Summary", ["id", *fields]) for model, (_, fields) in REGISTRY.items()}
+
+_tables = {}
+
+
+class RegistryTable:
+    """Immutable snapshot of one model at one registry version"""
+
+    __slots__ = ("version", "fingerprint", "checked_at", "by_code", "by_id")
+
+    def __init__(self, version, fingerprint, by_code, by_id):
+        self.version = version
+        self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+        self.by_code = MappingProxyType(by_code)
+        self.by_id = MappingProxyType(by_id)
+
+    def id_for(self, code):
+        return self.by_code.get(code)
+
+    def summary(self, pk):
+        return self.by_id.get(pk)
+
+
+def _version_key(model):
+    return f"masterdata_registry:version:{model._meta.label_lower}"
+
+
+def bump(model):
+    """Invalidate the snapshots of `model` in every process"""
+    key = _version_key(model)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:  # evicted between add() and incr()
+            cache.set(key, 1, timeout=None)
+
+
+def _fingerprint(model):
+    """(row count, latest updated_at) of the model's table: changes with every save and delete"""
+    values = model.objects.aggregate(rows=Count("pk"), latest=Max("updated_at"))
+    return values["rows"], values["latest"]
+
+
+def _load(model, version):
+    fingerprint = _fingerprint(model)
+    code_fields, summary_fields = REGISTRY[model]
+    summary_type = _SUMMARY_TYPES[model]
+    by_code, by_id = {}, {}
+    # Inactive rows first, so an active row wins a reused code
+    for values in model.objects.order_by("is_active", "pk").values_list("pk", *summary_fields):
+        summary = summary_type(*values)
+        by_id[summary.id] = summary
+        for field in code_fields:
+            code = getattr(summary, field)
+            if code:
+                by_code[code] = summary.id
+    return RegistryTable(version, fingerprint, by_code, by_id)
+
+
+def table(model):
+    """
+    Current snapshot of `model`, reloaded if another process bumped its version or,
+    after RECHECK_SECONDS, if its table changed
+    """
+    version = cache.get(_version_key(model), 0)
+    current = _tables.get(model)
+    if current is None or current.version != version:
+        current = _tables[model] = _load(model, version)
+    elif time.monotonic() - current.checked_at > RECHECK_SECONDS:
+        if _fingerprint(model) != current.fingerprint:
+            current = _tables[model] = _load(model, version)
+        else:
+            current.checked_at = time.monotonic()
+    return current
+
+
+def id_for(model, code):
+    """ID of the `model` row with IATA/ICAO code or resource code `code`, None if unknown"""
+    return table(model).id_for(code)
+
+
+def summary(model, pk):
+    """Summary named tuple of the `model` row `pk`, None if unknown"""
+    return table(model).summary(pk)
+
+
+def clear():
+    """Drop this process's snapshots (tests, long-running commands after bulk imports)"""
+    _tables.clear()
@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import registry
+
+
+def invalidate_registry(sender, **kwargs):
+    """Processes reload the model's registry snapshot on their next lookup"""
+    transaction.on_commit(lambda: registry.bump(sender))
+
+
+for model in registry.REGISTRY:
+    post_save.connect(invalidate_registry, sender=model, dispatch_uid=f"registry_{model._meta.label_lower}_save")
+    post_delete.connect(invalidate_registry, sender=model, dispatch_uid=f"registry_{model._meta.label_lower}_delete")
@@ -1,3 +1,94 @@
-from django.test import TestCase
+import random
+from datetime import date
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from flight_ops.generation import DailyFlightGenerator
+from flight_ops.tests import create_masterdata, create_schedule, schedules
+
+from . import registry
+from .autocomplete import index
+from .models import Airport
+
+
+class PrefixIndexTests(TestCase):
+    """Autocomplete ranks code matches first and honours `limit` and `allowed`"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_masterdata()
+        cls.nan = Airport.objects.create(iata_code="NAN", icao_code="NFFN", name="Nadi International", city="Nadi", country="Fiji")
+        cls.nrt = cls.data["nrt"]
+        for n in range(40):
+            Airport.objects.create(iata_code=f"Z{n:02d}", icao_code=f"ZZ{n:02d}", name=f"Zone {n}", city=f"Zed {n}", country="Nowhere")
+
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+
+    def ids(self, term, **kwargs):
+        return [pk for pk, _ in index("airports").search(term, **kwargs)]
+
+    def test_codes_rank_before_cities_and_names(self):
+        # NAN by its code, then Nadi by city ... and Narita only by its name
+        self.assertEqual(self.ids("na")[0], self.nan.pk)
+        self.assertEqual(self.ids("na")[-1], self.nrt.pk)
+        self.assertEqual(self.ids("narita"), [self.nrt.pk])
+        self.assertEqual(self.ids("rjaa"), [self.nrt.pk])
+
+    def test_limit(self):
+        self.assertEqual(len(self.ids("z", limit=5)), 5)
+        self.assertEqual(len(self.ids("z")), 20)
+
+    def test_inactive_rows_are_not_found(self):
+        Airport.objects.filter(pk=self.nan.pk).update(is_active=False)
+        registry.bump(Airport)
+        self.assertNotIn(self.nan.pk, self.ids("na"))
+
+    def test_allowed_matches_filtering_the_full_results(self):
+        rng = random.Random(7)
+        pks = list(Airport.objects.values_list("pk", flat=True))
+        for term in ["", "z", "z1", "zed", "zone 3", "n", "b", "x"]:
+            full = self.ids(term, limit=1000)
+            for size in [1, 3, 10, 30]:
+                allowed = set(rng.sample(pks, size))
+                with self.subTest(term=term, size=size):
+                    self.assertEqual(self.ids(term, limit=5, allowed=allowed), [pk for pk in full if pk in allowed][:5])
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class ScopedAutocompleteTests(TestCase):
+    """`scope=used` searches return used rows and revalidate when usage changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_masterdata()
+        cls.hkg = Airport.objects.create(iata_code="HKG", icao_code="VHHH", name="Hong Kong International", city="Hong Kong", country="China")
+        create_schedule(cls.data)
+        DailyFlightGenerator(date(2026, 6, 1), date(2026, 6, 2)).run(schedules())
+        cls.user = User.objects.create_user("ops", password="ops")
+
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.client.force_login(self.user)
+
+    def get(self, **headers):
+        return self.client.get("/masterdata/autocomplete/airports/", {"scope": "used", "term": ""}, headers=headers)
+
+    def test_results_are_restricted_to_used_rows(self):
+        ids = {result["id"] for result in self.get().json()["results"]}
+        self.assertEqual(ids, {self.data["bkk"].pk, self.data["nrt"].pk})
+
+    def test_etag_changes_with_usage(self):
+        etag = self.get()["ETag"]
+        self.assertEqual(self.get(if_none_match=etag).status_code, 304)
+
+        create_schedule(self.data, "600", destination=self.hkg)
+        DailyFlightGenerator(date(2026, 6, 1), date(2026, 6, 1)).run(schedules())
+
+        response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.hkg.pk, {result["id"] for result in response.json()["results"]})
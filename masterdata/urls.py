@@ -55,6 +55,8 @@ from .views import (
     add_runway,
     edit_runway,
     delete_runway,
+    # Autocomplete
+    autocomplete,
 )
 
 app_name = "masterdata"
@@ -115,4 +117,6 @@ urlpatterns = [
     path("runways/add/", add_runway, name="add_runway"),
     path("runways/<int:pk>/edit/", edit_runway, name="edit_runway"),
     path("runways/<int:pk>/delete/", delete_runway, name="delete_runway"),
+    # Autocomplete (Select2 JSON from the in-memory prefix index)
+    path("autocomplete/<str:kind>/", autocomplete, name="autocomplete"),
 ]
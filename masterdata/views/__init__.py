@@ -10,6 +10,7 @@ from .carousels import carousel_list, add_carousel, edit_carousel, delete_carous
 from .groundhandlers import groundhandler_list, add_groundhandler, edit_groundhandler, delete_groundhandler
 from .routes import route_list, add_route, edit_route, delete_route
 from .runways import runway_list, add_runway, edit_runway, delete_runway
+from .autocomplete import autocomplete
 
 __all__ = [
     # Airlines
@@ -67,4 +68,6 @@ __all__ = [
     "add_runway",
     "edit_runway",
     "delete_runway",
+    # Autocomplete
+    "autocomplete",
 ]
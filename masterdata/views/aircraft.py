@@ -4,10 +4,16 @@ from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 
+from core_app.pagination import paginated_list
+
 from ..models import AircraftType
 from ..forms import AircraftTypeForm
 
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "icao_code", "iata_code", "manufacturer", "model", "size_category", "wake_turbulence", "typical_capacity"]
+
+
 @login_required
 def aircraft_list(request):
     """Display list of all active aircraft types with search"""
@@ -26,7 +32,7 @@ def aircraft_list(request):
 
     aircraft = aircraft.order_by("icao_code")
 
-    return render(request, "masterdata/aircraft_list.html", {"aircraft": aircraft, "search_query": search_query})
+    return paginated_list(request, "masterdata/aircraft_list.html", aircraft, LIST_FIELDS, "aircraft")
 
 
 @login_required
@@ -4,10 +4,16 @@ from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 
+from core_app.pagination import paginated_list
+
 from ..models import Airline
 from ..forms import AirlineForm
 
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "iata_code", "icao_code", "name", "country", "contact_email"]
+
+
 @login_required
 def airline_list(request):
     """Display list of all active airlines with search"""
@@ -26,7 +32,7 @@ def airline_list(request):
 
     airlines = airlines.order_by("iata_code")
 
-    return render(request, "masterdata/airline_list.html", {"airlines": airlines, "search_query": search_query})
+    return paginated_list(request, "masterdata/airline_list.html", airlines, LIST_FIELDS, "airlines")
 
 
 @login_required
@@ -2,12 +2,18 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods
-from django.core.paginator import Paginator
-from django.db.models import Q
+
+from core_app.pagination import paginated_list
+from core_app.search import search
 
 from ..models import Airport
 from ..forms import AirportForm
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "iata_code", "icao_code", "name", "city", "country", "latitude", "longitude"]
+
+SEARCH_FIELDS = ["iata_code", "icao_code", "name", "city", "country"]
+
 
 @login_required
 def airport_list(request):
@@ -16,24 +22,12 @@ def airport_list(request):
 
     airports = Airport.objects.filter(is_active=True)
 
-    # Apply search filter if provided
-    if search_query:
-        airports = airports.filter(
-            Q(iata_code__icontains=search_query)
-            | Q(icao_code__icontains=search_query)
-            | Q(name__icontains=search_query)
-            | Q(city__icontains=search_query)
-            | Q(country__icontains=search_query)
-        )
-
     airports = airports.order_by("iata_code")
 
-    # Pagination - 50 items per page
-    paginator = Paginator(airports, 50)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    # Apply search filter if provided, best matches first
+    airports = search(airports, search_query, SEARCH_FIELDS, rank=True)
 
-    return render(request, "masterdata/airport_list.html", {"page_obj": page_obj, "search_query": search_query, "total_count": airports.count()})
+    return paginated_list(request, "masterdata/airport_list.html", airports, LIST_FIELDS, "airports")
 
 
 @login_required
@@ -0,0 +1,58 @@
+import hashlib
+
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+
+from ..autocomplete import KINDS, MAX_RESULTS, index
+
+# Browsers may reuse a response this long; edits change the ETag
+AUTOCOMPLETE_MAX_AGE = 60
+
+
+# kind -> EntityUsage.entity_type of `scope=used` searches
+USAGE_TYPES = {"airports": "airport", "airlines": "airline", "aircraft": "aircraft_type"}
+
+
+def _allowed_ids(request, kind):
+    """IDs a scoped search is restricted to (read once per request), None for all active rows"""
+    if request.GET.get("scope") != "used":
+        return None
+    if not hasattr(request, "autocomplete_allowed_ids"):
+        from flight_ops.models import EntityUsage
+
+        # One small indexed read of the usage counts maintained by triggers on DailyFlight
+        request.autocomplete_allowed_ids = set(EntityUsage.used_ids(USAGE_TYPES[kind]).values_list("entity_id", flat=True))
+    return request.autocomplete_allowed_ids
+
+
+def _etag(request, kind):
+    """Registry version of the model and the search term; scoped searches add a version of the used IDs"""
+    if kind not in KINDS:
+        return None
+    term = hashlib.md5(request.GET.get("term", "").encode()).hexdigest()
+    allowed = _allowed_ids(request, kind)
+    if allowed is None:
+        return f'"{kind}-{index(kind).table.version}-{term}"'
+    usage = hashlib.md5(",".join(map(str, sorted(allowed))).encode()).hexdigest()
+    return f'"{kind}-{index(kind).table.version}-{term}-{usage}"'
+
+
+@login_required
+@require_GET
+@cache_control(private=True, max_age=AUTOCOMPLETE_MAX_AGE)
+@condition(etag_func=_etag)
+def autocomplete(request, kind):
+    """
+    Select2 JSON results for airports, airlines or aircraft types from the in-memory
+    prefix index: {"results": [{"id", "text"}], "more": false}.
+
+    `scope=used` restricts the results to rows used by daily flights.
+    """
+    if kind not in KINDS:
+        raise Http404(f"Unknown autocomplete kind: {kind}")
+
+    allowed = _allowed_ids(request, kind)
+    results = index(kind).search(request.GET.get("term", ""), MAX_RESULTS, allowed)
+    return JsonResponse({"results": [{"id": pk, "text": label} for pk, label in results], "more": False})
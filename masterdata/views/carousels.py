@@ -4,16 +4,22 @@ from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 
+from core_app.pagination import paginated_list
+
 from ..models import BaggageCarousel
 from ..forms import BaggageCarouselForm
 
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "code", "terminal__name", "is_available"]
+
+
 @login_required
 def carousel_list(request):
     """Display list of all active baggage carousels with search"""
     search_query = request.GET.get("search", "")
 
-    carousels = BaggageCarousel.objects.filter(is_active=True).select_related("terminal")
+    carousels = BaggageCarousel.objects.filter(is_active=True)
 
     # Apply search filter if provided
     if search_query:
@@ -21,7 +27,7 @@ def carousel_list(request):
 
     carousels = carousels.order_by("code")
 
-    return render(request, "masterdata/carousel_list.html", {"carousels": carousels, "search_query": search_query})
+    return paginated_list(request, "masterdata/carousel_list.html", carousels, LIST_FIELDS, "carousels")
 
 
 @login_required
@@ -4,16 +4,22 @@ from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 
+from core_app.pagination import paginated_list
+
 from ..models import CheckInCounter
 from ..forms import CheckInCounterForm
 
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "code", "terminal__name", "counter_group", "is_available"]
+
+
 @login_required
 def checkin_list(request):
     """Display list of all active check-in counters with search"""
     search_query = request.GET.get("search", "")
 
-    counters = CheckInCounter.objects.filter(is_active=True).select_related("terminal")
+    counters = CheckInCounter.objects.filter(is_active=True)
 
     # Apply search filter if provided
     if search_query:
@@ -21,7 +27,7 @@ def checkin_list(request):
 
     counters = counters.order_by("code")
 
-    return render(request, "masterdata/checkin_list.html", {"counters": counters, "search_query": search_query})
+    return paginated_list(request, "masterdata/checkin_list.html", counters, LIST_FIELDS, "counters")
 
 
 @login_required
@@ -4,16 +4,22 @@ from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 
+from core_app.pagination import paginated_list
+
 from ..models import Gate
 from ..forms import GateForm
 
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "code", "terminal__name", "gate_type", "is_available"]
+
+
 @login_required
 def gate_list(request):
     """Display list of all active gates with search"""
     search_query = request.GET.get("search", "")
 
-    gates = Gate.objects.filter(is_active=True).select_related("terminal")
+    gates = Gate.objects.filter(is_active=True)
 
     # Apply search filter if provided
     if search_query:
@@ -21,7 +27,7 @@ def gate_list(request):
 
     gates = gates.order_by("code")
 
-    return render(request, "masterdata/gate_list.html", {"gates": gates, "search_query": search_query})
+    return paginated_list(request, "masterdata/gate_list.html", gates, LIST_FIELDS, "gates")
 
 
 @login_required
@@ -4,10 +4,16 @@ from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 
+from core_app.pagination import paginated_list
+
 from ..models import GroundHandler
 from ..forms import GroundHandlerForm
 
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "code", "name", "contact_email", "provides_passenger", "provides_ramp", "provides_cargo"]
+
+
 @login_required
 def groundhandler_list(request):
     """Display list of all active ground handlers with search"""
@@ -21,7 +27,7 @@ def groundhandler_list(request):
 
     handlers = handlers.order_by("code")
 
-    return render(request, "masterdata/groundhandler_list.html", {"handlers": handlers, "search_query": search_query})
+    return paginated_list(request, "masterdata/groundhandler_list.html", handlers, LIST_FIELDS, "handlers")
 
 
 @login_required
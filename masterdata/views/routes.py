@@ -2,33 +2,32 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods
-from django.db.models import Q
+
+from core_app.pagination import paginated_list
+from core_app.search import search
 
 from ..models import Route
 from ..forms import RouteForm
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "airline__iata_code", "airline__name", "origin__iata_code", "origin__city", "destination__iata_code", "destination__city", "stops", "equipment", "codeshare"]
+
+SEARCH_FIELDS = ["airline__iata_code", "airline__name", "origin__iata_code", "origin__city", "destination__iata_code", "destination__city"]
+
 
 @login_required
 def route_list(request):
     """Display list of all active routes with search"""
     search_query = request.GET.get("search", "")
 
-    routes = Route.objects.filter(is_active=True).select_related("airline", "origin", "destination")
-
-    # Apply search filter if provided
-    if search_query:
-        routes = routes.filter(
-            Q(airline__iata_code__icontains=search_query)
-            | Q(airline__name__icontains=search_query)
-            | Q(origin__iata_code__icontains=search_query)
-            | Q(origin__city__icontains=search_query)
-            | Q(destination__iata_code__icontains=search_query)
-            | Q(destination__city__icontains=search_query)
-        )
+    routes = Route.objects.filter(is_active=True)
 
     routes = routes.order_by("airline__iata_code", "origin__iata_code", "destination__iata_code")
 
-    return render(request, "masterdata/route_list.html", {"routes": routes, "search_query": search_query})
+    # Apply search filter if provided, best matches first
+    routes = search(routes, search_query, SEARCH_FIELDS, rank=True)
+
+    return paginated_list(request, "masterdata/route_list.html", routes, LIST_FIELDS, "routes")
 
 
 @login_required
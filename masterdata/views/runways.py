@@ -4,10 +4,16 @@ from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 
+from core_app.pagination import paginated_list
+
 from ..models import Runway
 from ..forms import RunwayForm
 
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "name", "length_meters", "width_meters", "surface", "is_active"]
+
+
 @login_required
 def runway_list(request):
     """Display list of all active runways with search"""
@@ -21,7 +27,7 @@ def runway_list(request):
 
     runways = runways.order_by("name")
 
-    return render(request, "masterdata/runway_list.html", {"runways": runways, "search_query": search_query})
+    return paginated_list(request, "masterdata/runway_list.html", runways, LIST_FIELDS, "runways")
 
 
 @login_required
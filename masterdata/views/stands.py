@@ -4,10 +4,16 @@ from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 
+from core_app.pagination import paginated_list
+
 from ..models import Stand
 from ..forms import StandForm
 
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "code", "size_code", "max_wingspan_meters", "has_pushback", "is_available"]
+
+
 @login_required
 def stand_list(request):
     """Display list of all active stands with search"""
@@ -21,7 +27,7 @@ def stand_list(request):
 
     stands = stands.order_by("code")
 
-    return render(request, "masterdata/stand_list.html", {"stands": stands, "search_query": search_query})
+    return paginated_list(request, "masterdata/stand_list.html", stands, LIST_FIELDS, "stands")
 
 
 @login_required
@@ -2,12 +2,18 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods
-from django.db.models import Q
+from django.db.models import Count, Q
+
+from core_app.pagination import paginated_list
 
 from ..models import Terminal
 from ..forms import TerminalForm
 
 
+# Columns shown by the list template
+LIST_FIELDS = ["pk", "code", "name", "gate_count"]
+
+
 @login_required
 def terminal_list(request):
     """Display list of all active terminals with search"""
@@ -19,9 +25,9 @@ def terminal_list(request):
     if search_query:
         terminals = terminals.filter(Q(code__icontains=search_query) | Q(name__icontains=search_query))
 
-    terminals = terminals.order_by("code")
+    terminals = terminals.annotate(gate_count=Count("gates")).order_by("code")
 
-    return render(request, "masterdata/terminal_list.html", {"terminals": terminals, "search_query": search_query})
+    return paginated_list(request, "masterdata/terminal_list.html", terminals, LIST_FIELDS, "terminals")
 
 
 @login_required
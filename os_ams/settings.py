@@ -51,11 +51,13 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "django_select2",  # For AJAX autocomplete widgets
     "core_app",
     "masterdata",
     "flight_ops",
     "schedules",
+    "analytics",
 ]
 
 MIDDLEWARE = [
@@ -103,6 +105,26 @@ DATABASES = {
 }
 
 
+# Cache
+# A shared Redis cache lets every worker see the same invalidation counters
+# (masterdata registry, list counts, flight board); without REDIS_URL each
+# process keeps its own local memory cache.
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 if DEBUG:
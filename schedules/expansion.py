@@ -0,0 +1,117 @@
+"""
+Schedule expansion kernel for SeasonalFlight.
+
+Turns `days_of_operation` ("1357") into a 7-bit weekday mask and expands
+schedules into concrete (date, schedule) occurrences by stepping through each
+operating weekday in strides of 7 days. The work is proportional to the number
+of occurrences, not to days x schedules.
+
+Shared by generate_daily_flights, propagate_schedule_changes and capacity reports.
+"""
+
+from datetime import datetime, timedelta
+
+ALL_DAYS_MASK = 0b1111111
+
+
+def days_mask(days_of_operation):
+    """'1357' -> bit 0 = Monday ... bit 6 = Sunday"""
+    mask = 0
+    for day in days_of_operation or "":
+        if "1" <= day <= "7":
+            mask |= 1 << (int(day) - 1)
+    return mask
+
+
+def operates_on(mask, day):
+    """True if the weekday of `day` is set in `mask`"""
+    return bool(mask & (1 << (day.isoweekday() - 1)))
+
+
+def _clip(schedule, window_start, window_end, not_before=None):
+    """Intersection of the schedule validity with the window (and an optional lower bound), or None"""
+    first = max(window_start, schedule.start_date)
+    if not_before is not None:
+        first = max(first, not_before)
+    last = min(window_end, schedule.end_date)
+    return (first, last) if first <= last else None
+
+
+def operating_dates(first, last, mask):
+    """Sorted list of dates in [first, last] whose weekday is set in `mask`"""
+    total_days = (last - first).days + 1
+    offsets = []
+    for offset in range(min(7, total_days)):
+        if operates_on(mask, first + timedelta(days=offset)):
+            offsets.extend(range(offset, total_days, 7))
+    offsets.sort()
+    return [first + timedelta(days=offset) for offset in offsets]
+
+
+def count_operating_days(first, last, mask):
+    """Number of operating days in [first, last] without materialising the dates"""
+    total_days = (last - first).days + 1
+    if total_days <= 0:
+        return 0
+    full_weeks, remainder = divmod(total_days, 7)
+    count = full_weeks * bin(mask & ALL_DAYS_MASK).count("1")
+    for offset in range(remainder):
+        if operates_on(mask, first + timedelta(days=full_weeks * 7 + offset)):
+            count += 1
+    return count
+
+
+def expand_by_date(schedules, window_start, window_end, first_dates=None):
+    """
+    Bucket schedules by operating date.
+
+    Returns a list indexed by day offset from window_start; entry i holds the
+    schedules operating on window_start + i days, in input order.
+    `first_dates` optionally maps schedule pk -> first date to expand (e.g. a watermark).
+    """
+    first_dates = first_dates or {}
+    total_days = (window_end - window_start).days + 1
+    buckets = [[] for _ in range(max(total_days, 0))]
+
+    for schedule in schedules:
+        clipped = _clip(schedule, window_start, window_end, first_dates.get(schedule.pk))
+        if clipped is None:
+            continue
+        first, last = clipped
+        mask = days_mask(schedule.days_of_operation)
+        first_offset = (first - window_start).days
+        last_offset = (last - window_start).days
+
+        for weekday_offset in range(7):
+            offset = first_offset + weekday_offset
+            if offset > last_offset:
+                break
+            if not operates_on(mask, window_start + timedelta(days=offset)):
+                continue
+            for day_offset in range(offset, last_offset + 1, 7):
+                buckets[day_offset].append(schedule)
+
+    return buckets
+
+
+def expand(schedules, window_start, window_end, first_dates=None):
+    """Yield (date, schedule) for every occurrence in the window, in date order"""
+    for offset, day_schedules in enumerate(expand_by_date(schedules, window_start, window_end, first_dates)):
+        if not day_schedules:
+            continue
+        day = window_start + timedelta(days=offset)
+        for schedule in day_schedules:
+            yield day, schedule
+
+
+def scheduled_times(date_of_operation, stod, stoa, tz):
+    """
+    Build the aware departure/arrival datetimes of one occurrence.
+
+    Arrivals earlier than the departure time land on the next day.
+    """
+    departure = datetime.combine(date_of_operation, stod, tzinfo=tz)
+    arrival = datetime.combine(date_of_operation, stoa, tzinfo=tz)
+    if stoa < stod:
+        arrival += timedelta(days=1)
+    return departure, arrival
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seasonalflight',
+            name='revision',
+            field=models.PositiveIntegerField(default=1, help_text='Bumped whenever a propagatable field changes (DailyFlight.schedule_version)'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:52
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0007_trigram_search_indexes'),
+        ('schedules', '0002_seasonalflight_revision'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seasonalflight',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('flight_number'), name='gin_trgm_ops'), name='seasonalflight_number_trgm'),
+        ),
+    ]
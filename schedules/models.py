@@ -1,5 +1,7 @@
 from django.db import models
 
+from core_app.search import trigram_index
+
 
 class SeasonalFlight(models.Model):
     """
@@ -28,6 +30,7 @@ class SeasonalFlight(models.Model):
     days_of_operation = models.CharField(max_length=7, help_text="Days: 1=Mon, 2=Tue... 7=Sun (e.g., 1357 for Mon/Wed/Fri/Sun)")
 
     is_active = models.BooleanField(default=True)
+    revision = models.PositiveIntegerField(default=1, help_text="Bumped whenever a propagatable field changes (DailyFlight.schedule_version)")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -36,6 +39,35 @@ class SeasonalFlight(models.Model):
         ordering = ["airline", "flight_number", "start_date"]
         verbose_name = "Seasonal Flight"
         verbose_name_plural = "Seasonal Flights"
+        indexes = [trigram_index("flight_number", "seasonalflight_number_trgm")]
+
+    # Fields copied onto the generated DailyFlights; changing one of them bumps `revision`
+    PROPAGATED_FIELDS = ["airline_id", "flight_number", "origin_id", "destination_id", "aircraft_type_id", "stod", "stoa"]
 
     def __str__(self):
         return f"{self.airline.iata_code}{self.flight_number} ({self.origin.iata_code}-{self.destination.iata_code})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_fingerprint = instance.propagation_fingerprint()
+        return instance
+
+    def propagation_fingerprint(self):
+        """Values of the propagatable fields (None if one of them was deferred)"""
+        if self.get_deferred_fields().intersection(self.PROPAGATED_FIELDS):
+            return None
+        return tuple(getattr(self, field) for field in self.PROPAGATED_FIELDS)
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, "_loaded_fingerprint", None)
+        bumped = self.pk and loaded is not None and loaded != self.propagation_fingerprint()
+        if bumped:
+            # Incremented in the UPDATE itself, so concurrent edits each get their own revision
+            self.revision = models.F("revision") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "revision"}
+        super().save(*args, **kwargs)
+        if bumped:
+            self.refresh_from_db(fields=["revision"])
+        self._loaded_fingerprint = self.propagation_fingerprint()
@@ -1,3 +1,65 @@
-from django.test import TestCase
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from flight_ops.models import PendingPropagation
+from flight_ops.tests import create_masterdata, create_schedule
+
+from .expansion import count_operating_days, days_mask, expand, operating_dates, scheduled_times
+from .models import SeasonalFlight
+
+
+class ExpansionTests(SimpleTestCase):
+    """Weekday masks and their expansion into operating dates"""
+
+    def test_days_mask(self):
+        self.assertEqual(days_mask("1357"), 0b1010101)
+        self.assertEqual(days_mask("7"), 0b1000000)
+        self.assertEqual(days_mask(""), 0)
+
+    def test_operating_dates_follow_the_mask(self):
+        # 2026-06-01 is a Monday
+        dates = operating_dates(date(2026, 6, 1), date(2026, 6, 14), days_mask("15"))
+        self.assertEqual(dates, [date(2026, 6, 1), date(2026, 6, 5), date(2026, 6, 8), date(2026, 6, 12)])
+        self.assertEqual(count_operating_days(date(2026, 6, 1), date(2026, 6, 14), days_mask("15")), 4)
+
+    def test_expand_clips_to_the_season_and_window(self):
+        schedule = SeasonalFlight(pk=1, start_date=date(2026, 6, 3), end_date=date(2026, 6, 30), days_of_operation="1234567")
+        days = [day for day, _ in expand([schedule], date(2026, 6, 1), date(2026, 6, 5), first_dates={1: date(2026, 6, 4)})]
+        self.assertEqual(days, [date(2026, 6, 4), date(2026, 6, 5)])
+
+    def test_arrival_before_departure_is_next_day(self):
+        tz = ZoneInfo("Asia/Bangkok")
+        departure, arrival = scheduled_times(date(2026, 6, 30), time(23, 30), time(6, 15), tz)
+        self.assertEqual(departure, datetime(2026, 6, 30, 23, 30, tzinfo=tz))
+        self.assertEqual(arrival, datetime(2026, 7, 1, 6, 15, tzinfo=tz))
+
+
+class SeasonalFlightRevisionTests(TestCase):
+    """Only edits of propagated fields bump the revision, every edit is queued"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_masterdata()
+
+    def setUp(self):
+        self.schedule = SeasonalFlight.objects.get(pk=create_schedule(self.data).pk)
+
+    def test_propagated_field_bumps_revision(self):
+        self.schedule.stod = time(22, 0)
+        self.schedule.save()
+        self.assertEqual(SeasonalFlight.objects.get(pk=self.schedule.pk).revision, 2)
+        self.assertEqual(self.schedule.revision, 2)
+
+    def test_other_fields_keep_revision(self):
+        self.schedule.days_of_operation = "135"
+        self.schedule.service_type = "F"
+        self.schedule.save()
+        self.assertEqual(SeasonalFlight.objects.get(pk=self.schedule.pk).revision, 1)
+
+    def test_edit_is_queued_after_commit(self):
+        self.schedule.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.schedule.save()
+        self.assertTrue(PendingPropagation.objects.filter(schedule=self.schedule).exists())
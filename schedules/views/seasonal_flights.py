@@ -1,37 +1,45 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods
 
+from core_app.pagination import paginated_list
+from core_app.search import search
+
 from ..forms import SeasonalFlightForm
 from ..models import SeasonalFlight
 
+# Columns shown by the list template
+LIST_FIELDS = [
+    "pk",
+    "airline__iata_code",
+    "flight_number",
+    "origin__iata_code",
+    "destination__iata_code",
+    "aircraft_type__icao_code",
+    "stod",
+    "stoa",
+    "days_of_operation",
+    "start_date",
+    "end_date",
+]
+
+SEARCH_FIELDS = ["airline__iata_code", "airline__name", "flight_number", "origin__iata_code", "destination__iata_code"]
+
 
 @login_required
 def seasonal_flight_list(request):
     """Display list of all active seasonal flights with search"""
     search_query = request.GET.get("search", "")
 
-    seasonal_flights = SeasonalFlight.objects.filter(is_active=True).select_related("airline", "origin", "destination", "aircraft_type")
-
-    # Apply search filter if provided
-    if search_query:
-        seasonal_flights = seasonal_flights.filter(
-            Q(airline__iata_code__icontains=search_query)
-            | Q(airline__name__icontains=search_query)
-            | Q(flight_number__icontains=search_query)
-            | Q(origin__iata_code__icontains=search_query)
-            | Q(destination__iata_code__icontains=search_query)
-        )
+    seasonal_flights = SeasonalFlight.objects.filter(is_active=True)
 
     seasonal_flights = seasonal_flights.order_by("airline", "flight_number")
 
-    return render(
-        request,
-        "schedules/seasonal_flight_list.html",
-        {"seasonal_flights": seasonal_flights, "search_query": search_query},
-    )
+    # Apply search filter if provided, best matches first
+    seasonal_flights = search(seasonal_flights, search_query, SEARCH_FIELDS, rank=True)
+
+    return paginated_list(request, "schedules/seasonal_flight_list.html", seasonal_flights, LIST_FIELDS, "seasonal_flights")
 
 
 @login_required